@@ -0,0 +1,171 @@
+"""
+Benchmark: concurrent clients on the async endpoints, WSGI against ASGI.
+
+Seeds a temporary SQLite database with seed_petrescue, then starts Gunicorn with
+gunicorn.conf.py once per deployment:
+
+    wsgi  GUNICORN_WORKER_CLASS=gthread (petrescue/wsgi.py, GUNICORN_THREADS threads)
+    asgi  GUNICORN_WORKER_CLASS=uvicorn (petrescue/asgi.py; needs the uvicorn package)
+
+Both run --workers worker processes (one by default, to show what a single
+worker can hold). For each level in --concurrency, that many client threads
+request each async endpoint (health_check, validate_email,
+api_admin_unread_count, api_request_history) for --duration seconds, one new
+connection per request:
+
+    python -m benchmarks.async_views
+    python -m benchmarks.async_views --concurrency 16 256 1024
+    python -m benchmarks.async_views --deployments asgi --workers 2
+
+The report lists requests per second, latency percentiles and errors (5xx,
+4xx or failed connections) per deployment, concurrency level and endpoint.
+"""
+
+import argparse
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+from benchmarks.common import percentile, print_table, run_server, save_results, timed_get
+from benchmarks.endpoints import setup_django
+
+DEPLOYMENTS = {
+    'wsgi': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'asgi': {'GUNICORN_WORKER_CLASS': 'uvicorn'},
+}
+
+# (name, url name, url kwargs, query string, user); 'owned_pet' is replaced by a pet of the reporter
+ENDPOINTS = [
+    ('health_check', 'health_check', {}, '', None),
+    ('validate_email', 'validate_email', {}, 'email=someone@example.com', None),
+    ('api_admin_unread_count', 'api_admin_unread_count', {}, '', 'admin'),
+    ('api_request_history', 'api_request_history', {'pet_id': 'owned_pet'}, '', 'reporter'),
+]
+
+
+def prepare_requests():
+    """Return {name: (path, session cookie or None)} for each endpoint."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from main.models import Pet
+
+    User = get_user_model()
+    admin = User.objects.create_superuser('benchmark_admin', 'benchmark_admin@example.com', 'benchmark-pass')
+    owned_pet = Pet.objects.order_by('id').first()
+    if owned_pet is None:
+        raise RuntimeError('The database needs pets; run seed_petrescue first')
+
+    sessions = {}
+    for username, user in (('admin', admin), ('reporter', owned_pet.owner)):
+        client = Client()
+        client.force_login(user)
+        sessions[username] = client.cookies['sessionid'].value
+
+    requests = {}
+    for name, url_name, kwargs, query, username in ENDPOINTS:
+        kwargs = {key: owned_pet.id if value == 'owned_pet' else value for key, value in kwargs.items()}
+        path = reverse(url_name, kwargs=kwargs) + (f'?{query}' if query else '')
+        requests[name] = (path, sessions.get(username))
+    return requests
+
+
+def load(url, session, concurrency, duration):
+    """Keep `concurrency` threads requesting url for `duration` seconds; return throughput and latency."""
+    headers = {'Cookie': f'sessionid={session}'} if session else {}
+    samples, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        thread_samples, thread_errors = [], 0
+        while time.perf_counter() < deadline:
+            try:
+                status, elapsed = timed_get(url, headers)
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                thread_errors += 1
+                continue
+            if status >= 400:
+                thread_errors += 1
+            thread_samples.append(elapsed)
+        with lock:
+            samples.extend(thread_samples)
+            errors.append(thread_errors)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'req_per_s': len(samples) / elapsed,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'errors': sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--deployments', nargs='+', choices=list(DEPLOYMENTS), default=list(DEPLOYMENTS))
+    parser.add_argument('--workers', type=int, default=1, help='Gunicorn worker processes per deployment')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64, 256],
+                        help='Client threads sending requests; each level is measured in turn')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per deployment and endpoint')
+    parser.add_argument('--pets', type=int, default=2000, help='Pets to seed (see seed_petrescue)')
+    parser.add_argument('--users', type=int, default=100, help='Users to seed')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the data')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # The sessions are created here and read by the server, so both need the same key
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        call_command('seed_petrescue', users=args.users, pets=args.pets, seed=args.seed, stdout=io.StringIO())
+        requests = prepare_requests()
+
+        for deployment in args.deployments:
+            if deployment == 'asgi' and importlib.util.find_spec('uvicorn') is None:
+                print('Skipping asgi: the uvicorn package is not installed (pip install uvicorn)', file=sys.stderr)
+                continue
+            env = {
+                'STATIC_MANIFEST': 'False',
+                'SQLITE_TUNING': 'True',
+                'GUNICORN_WORKERS': str(args.workers),
+                **DEPLOYMENTS[deployment],
+            }
+            with run_server(env=env, workers=None, threads=None, worker_class=None, app=None) as base_url:
+                for concurrency in args.concurrency:
+                    for name, (path, session) in requests.items():
+                        results[f'{deployment}/{concurrency}/{name}'] = {
+                            'deployment': deployment,
+                            'concurrency': concurrency,
+                            'endpoint': name,
+                            **load(f'{base_url}{path}', session, concurrency, args.duration),
+                        }
+
+    print_table(
+        list(results.values()),
+        ['deployment', 'concurrency', 'endpoint', 'req_per_s', 'p50_ms', 'p99_ms', 'errors'],
+    )
+    if args.save:
+        save_results(args.save, results)
+        print(f'Saved results to {args.save}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Shared helpers for the PetRescue benchmark scripts.
+
+The scripts start the application in a subprocess (normally Gunicorn) with a
+given set of environment variables, send it real HTTP requests and report
+latency percentiles. They are run by hand and are not part of the test suite.
+"""
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port():
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url, timeout=30):
+    """Poll the health check endpoint until the server answers."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'{base_url}/health/', timeout=2):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f'Server at {base_url} did not start within {timeout}s')
+
+
+@contextmanager
+def run_server(env=None, workers=1, threads=1, worker_class='sync', app='petrescue.wsgi:application'):
+    """
+    Start Gunicorn on a free port with extra environment variables and yield its base URL.
+    Gunicorn also reads gunicorn.conf.py; pass None for workers, threads, worker_class
+    or app to leave that setting to the configuration file (and its GUNICORN_* variables).
+    """
+    port = free_port()
+    server_env = os.environ.copy()
+    server_env.setdefault('DEBUG', 'False')
+    server_env.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    server_env.setdefault('ALLOWED_HOSTS', '127.0.0.1,localhost')
+    server_env.update(env or {})
+
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    for option, value in (('--workers', workers), ('--threads', threads), ('--worker-class', worker_class)):
+        if value is not None:
+            command += [option, str(value)]
+    if app is not None:
+        command.append(app)
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=server_env)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_for_server(base_url)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def timed_get(url, headers=None):
+    """Send a GET request and return (status, elapsed seconds)."""
+    request = urllib.request.Request(url, headers=headers or {})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        error.read()
+        status = error.code
+    return status, time.perf_counter() - start
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile (0-100) of samples using nearest-rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Return latency statistics in milliseconds for a list of durations in seconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as a fixed-width table."""
+    widths = {
+        column: max(len(column), *(len(format_cell(row.get(column))) for row in rows))
+        for column in columns
+    }
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(format_cell(row.get(column)).ljust(widths[column]) for column in columns))
+
+
+def format_cell(value):
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return '' if value is None else str(value)
+
+
+def save_results(path, results):
+    """Write benchmark results to a JSON file, e.g. to use as a baseline."""
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+        results_file.write('\n')
+
+
+def compare_to_baseline(results, baseline_path, metric='p50_ms', threshold=1.2):
+    """
+    Compare results with a saved baseline and return a list of regressions.
+
+    Both are dicts of {name: {metric: value}}. A regression is any entry whose
+    metric grew by more than ``threshold`` times its baseline value.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = []
+    for name, stats in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = stats[metric] / previous[metric]
+        if ratio > threshold:
+            regressions.append(f'{name}: {metric} {previous[metric]:.2f} -> {stats[metric]:.2f} ({ratio:.2f}x)')
+    return regressions
@@ -0,0 +1,71 @@
+"""
+Benchmark: per-request cost of opening database connections.
+
+Starts Gunicorn once per connection mode and times sequential requests to an
+endpoint that runs a single query (/validate-email/ by default):
+
+    fresh       DB_CONN_MAX_AGE=0   a new connection for every request
+    persistent  DB_CONN_MAX_AGE=60  Django keeps the connection between requests
+    pool        DB_POOL=True        connections are borrowed from the process-local pool (MySQL only)
+
+Run against the database configured in the environment, e.g.:
+
+    DB_ENGINE=django.db.backends.mysql DB_NAME=petrescue_db DB_USER=... DB_PASSWORD=... \\
+        python -m benchmarks.db_connections --requests 500
+
+The pool mode is skipped unless DB_ENGINE is the MySQL backend.
+"""
+
+import argparse
+import os
+
+from benchmarks.common import print_table, run_server, summarize, timed_get
+
+MODES = {
+    'fresh': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'False'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_POOL': 'False'},
+    'pool': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'True'},
+}
+
+
+def run_mode(env, path, requests, warmup):
+    # With the dummy cache every request reaches the database and none is throttled
+    with run_server(env={**env, 'CACHE_BACKEND': 'dummy'}, workers=1) as base_url:
+        url = f'{base_url}{path}'
+        for _ in range(warmup):
+            timed_get(url)
+        samples = []
+        for _ in range(requests):
+            status, elapsed = timed_get(url)
+            if status != 200:
+                raise RuntimeError(f'{url} returned HTTP {status}')
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help='Timed requests per mode')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per mode')
+    parser.add_argument('--path', default='/validate-email/?email=benchmark@example.com')
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated modes to run')
+    args = parser.parse_args()
+
+    is_mysql = os.environ.get('DB_ENGINE') == 'django.db.backends.mysql'
+    rows = []
+    for mode in args.modes.split(','):
+        if mode == 'pool' and not is_mysql:
+            print('Skipping pool mode: DB_POOL requires DB_ENGINE=django.db.backends.mysql')
+            continue
+        stats = run_mode(MODES[mode], args.path, args.requests, args.warmup)
+        rows.append({'mode': mode, **stats})
+
+    baseline = next((row for row in rows if row['mode'] == 'fresh'), None)
+    for row in rows:
+        if baseline:
+            row['saved_ms'] = baseline['mean_ms'] - row['mean_ms']
+    print_table(rows, ['mode', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'saved_ms'])
+
+
+if __name__ == '__main__':
+    main()
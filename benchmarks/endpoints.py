@@ -0,0 +1,246 @@
+"""
+Benchmark: latency and query count of the main pages and every /api/ endpoint.
+
+Seeds a temporary SQLite database with seed_petrescue, then sends each endpoint
+repeatedly through the Django test client and records the latency percentiles
+and the number of SQL queries per request. The cache backend is the dummy one,
+so every request runs the full view.
+
+    python -m benchmarks.endpoints --pets 5000 --iterations 50
+    python -m benchmarks.endpoints --save benchmarks/endpoints_baseline.json
+    python -m benchmarks.endpoints --compare benchmarks/endpoints_baseline.json
+    python -m benchmarks.endpoints --compare benchmarks/endpoints_baseline.json --queries-only
+    python -m benchmarks.endpoints --existing-db --only all_pets
+
+With --compare the script exits with status 1 when an endpoint's p50 latency grew
+by more than --threshold times its baseline, or when it runs more queries per
+request than the baseline did. Baselines are only comparable when taken with the
+same --pets, --users and --seed; latencies also need the same machine.
+
+benchmarks/endpoints_baseline.json is committed, taken with the defaults on a
+1 vCPU machine. Its query counts hold anywhere (--queries-only); save your own
+baseline before comparing latencies.
+
+--existing-db benchmarks the database configured in the environment (DB_ENGINE,
+DB_NAME, ...) instead of seeding one. It skips the endpoints that write.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import BASE_DIR, compare_to_baseline, print_table, save_results, summarize
+
+# (name, method, url name, url kwargs, query parameters or body, user, writes)
+# Kwarg values are keys of the targets built by find_targets(); 'new_pet' is a
+# throwaway pet created before each request (outside the timing).
+ENDPOINTS = [
+    ('home', 'get', 'home', {}, {}, None, False),
+    ('all_pets', 'get', 'all_pets', {}, {}, None, False),
+    ('all_pets_type', 'get', 'all_pets', {}, {'pet_type': 'dog'}, None, False),
+    ('all_pets_breed', 'get', 'all_pets', {}, {'breed': 'retriever'}, None, False),
+    ('all_pets_location', 'get', 'all_pets', {}, {'location': 'Riverside', 'radius': '8'}, None, False),
+    ('all_pets_status_sort', 'get', 'all_pets', {}, {'status': 'found', 'sort': 'oldest'}, None, False),
+    ('all_pets_dates', 'get', 'all_pets', {}, {'start_date': 'month_ago', 'end_date': 'today'}, None, False),
+    ('all_pets_page_5', 'get', 'all_pets', {}, {'page': '5'}, None, False),
+    ('find_pets', 'get', 'find_pets', {}, {}, 'reporter', False),
+    ('find_pets_search', 'get', 'find_pets', {}, {'pet_type': 'cat', 'breed': 'Siamese'}, 'reporter', False),
+    ('pet_detail', 'get', 'pet_detail', {'pet_id': 'public_pet'}, {}, None, False),
+    ('admin_dashboard', 'get', 'admin_dashboard', {}, {}, 'admin', False),
+    ('admin_pending_requests', 'get', 'admin_pending_requests', {}, {}, 'admin', False),
+    ('admin_pending_filtered', 'get', 'admin_pending_requests', {}, {'pet_type': 'dog', 'sort_by': 'date'}, 'admin', False),
+    ('admin_accepted_requests', 'get', 'admin_accepted_requests', {}, {}, 'admin', False),
+    ('admin_rejected_requests', 'get', 'admin_rejected_requests', {}, {}, 'admin', False),
+    ('admin_notifications', 'get', 'admin_notifications', {}, {}, 'admin', False),
+    ('admin_contact_submissions', 'get', 'admin_contact_submissions', {}, {}, 'admin', False),
+    ('admin_contact_filtered', 'get', 'admin_contact_submissions', {}, {'status': 'pending', 'search': 'sighting'}, 'admin', False),
+    ('api_user_requests', 'get', 'api_user_requests', {}, {}, 'reporter', False),
+    ('api_request_history', 'get', 'api_request_history', {'pet_id': 'reporter_pet'}, {}, 'reporter', False),
+    ('api_personalization', 'get', 'api_personalization', {}, {'slots': 'nav_items', 'pet': 'public_pet'}, 'reporter', False),
+    ('api_edit_request', 'put', 'api_edit_request', {'pet_id': 'reporter_pet'}, {'color': 'Brown'}, 'reporter', True),
+    ('api_delete_request', 'delete', 'api_delete_request', {'pet_id': 'new_pet'}, {}, 'reporter', True),
+    ('api_admin_notifications', 'get', 'api_admin_notifications', {}, {}, 'admin', False),
+    ('api_admin_unread_count', 'get', 'api_admin_unread_count', {}, {}, 'admin', False),
+    ('api_admin_mark_read', 'post', 'api_admin_mark_read', {'notification_id': 'notification'}, {}, 'admin', True),
+    ('api_admin_mark_all_read', 'post', 'api_admin_mark_all_read', {}, {}, 'admin', True),
+]
+
+
+def setup_django(db_name=None):
+    if db_name:
+        os.environ.update({
+            'DB_ENGINE': 'django.db.backends.sqlite3',
+            'DB_NAME': db_name,
+        })
+    os.environ['CACHE_BACKEND'] = 'dummy'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petrescue.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def find_targets():
+    """Pick the users and objects the endpoints act on from the seeded data."""
+    from datetime import timedelta
+
+    from django.db.models import Count
+    from django.utils import timezone
+
+    from main.models import Notification, Pet, User
+
+    admin, _ = User.objects.get_or_create(username='benchmark_admin', defaults={
+        'email': 'benchmark_admin@example.com', 'is_staff': True, 'is_superuser': True,
+    })
+    # The user with the most reports, and one of their pending reports (the only editable kind)
+    reporter = (
+        User.objects.filter(is_superuser=False)
+        .annotate(pet_count=Count('pet'))
+        .order_by('-pet_count', 'id')
+        .first()
+    )
+    reporter_pet = Pet.objects.filter(owner=reporter, request__status='pending').order_by('id').first()
+    public_pet = Pet.objects.filter(request__status='accepted').order_by('id').first()
+    notification = Notification.objects.order_by('id').first()
+    if not (reporter_pet and public_pet and notification):
+        raise RuntimeError(
+            'The database needs pending and accepted reports and notifications; run seed_petrescue first'
+        )
+    today = timezone.now().date()
+    return {
+        'users': {'admin': admin, 'reporter': reporter},
+        'reporter_pet': reporter_pet.id,
+        'public_pet': public_pet.id,
+        'notification': notification.id,
+        'today': today.isoformat(),
+        'month_ago': (today - timedelta(days=30)).isoformat(),
+    }
+
+
+def create_throwaway_pet(reporter):
+    from main.models import Pet, Request
+
+    pet = Pet.objects.create(owner=reporter, pet_type='dog', breed='Benchmark', color='Grey', location='Nowhere')
+    Request.objects.create(user=reporter, pet=pet, request_type='lost', phone_number='5550000000')
+    return pet.id
+
+
+def run_endpoint(client, endpoint, targets, iterations, warmup):
+    """Request one endpoint warmup + iterations times; return its latency and query stats."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    name, method, url_name, kwargs, data, username, _ = endpoint
+    data = {key: targets.get(value, value) for key, value in data.items()}
+    samples, query_counts = [], []
+    for index in range(warmup + iterations):
+        url_kwargs = {
+            key: create_throwaway_pet(targets['users']['reporter']) if value == 'new_pet' else targets[value]
+            for key, value in kwargs.items()
+        }
+        url = reverse(url_name, kwargs=url_kwargs)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            if method in ('put', 'delete'):
+                response = getattr(client, method)(url, data, content_type='application/json')
+            else:
+                response = getattr(client, method)(url, data)
+            duration = time.perf_counter() - start
+        if response.status_code >= 400:
+            raise RuntimeError(f'{name} returned HTTP {response.status_code}')
+        if index >= warmup:
+            samples.append(duration)
+            query_counts.append(len(queries))
+    stats = summarize(samples)
+    stats['queries'] = max(query_counts)
+    return stats
+
+
+def compare_queries(results, baseline_path):
+    """Return endpoints whose query count per request grew since the baseline."""
+    import json
+
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = []
+    for name, stats in sorted(results.items()):
+        previous = baseline.get(name, {}).get('queries')
+        if previous is not None and stats['queries'] > previous:
+            regressions.append(f'{name}: queries {previous} -> {stats["queries"]}')
+    return regressions
+
+
+def run(args):
+    from django.test import Client
+
+    targets = find_targets()
+    clients = {None: Client()}
+    for username, user in targets['users'].items():
+        clients[username] = Client()
+        clients[username].force_login(user)
+
+    results = {}
+    for endpoint in ENDPOINTS:
+        name, writes = endpoint[0], endpoint[6]
+        if args.only and name not in args.only:
+            continue
+        if writes and args.existing_db:
+            continue
+        results[name] = run_endpoint(clients[endpoint[5]], endpoint, targets, args.iterations, args.warmup)
+        if args.verbose:
+            print(f'{name}: p50 {results[name]["p50_ms"]:.2f} ms, {results[name]["queries"]} queries', file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30, help='Timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--pets', type=int, default=5000, help='Pets to seed (see seed_petrescue)')
+    parser.add_argument('--users', type=int, default=200, help='Users to seed')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the data')
+    parser.add_argument('--existing-db', action='store_true',
+                        help='Use the configured database instead of seeding one (read-only endpoints)')
+    parser.add_argument('--only', nargs='+', help='Benchmark only these endpoint names')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare results with this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Allowed p50 slowdown factor with --compare')
+    parser.add_argument('--queries-only', action='store_true',
+                        help='With --compare, only report query count growth (for baselines from another machine)')
+    parser.add_argument('--verbose', action='store_true', help='Print each endpoint as it finishes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(None if args.existing_db else str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        if not args.existing_db:
+            call_command('migrate', verbosity=0)
+            call_command('seed_petrescue', users=args.users, pets=args.pets, seed=args.seed, stdout=io.StringIO())
+        results = run(args)
+
+    print_table(
+        [{'endpoint': name, **stats} for name, stats in results.items()],
+        ['endpoint', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'queries'],
+    )
+
+    if args.save:
+        save_results(args.save, results)
+        print(f'Saved baseline to {args.save}')
+    if args.compare:
+        regressions = [] if args.queries_only else compare_to_baseline(results, args.compare, threshold=args.threshold)
+        regressions += compare_queries(results, args.compare)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: peak memory of the list views and APIs at a large data size.
+
+Seeds a temporary SQLite database with seed_petrescue (100,000 pets by default),
+then requests each list view and API through the Django test client under
+tracemalloc and records the peak memory each request allocated. The cache
+backend is the dummy one, so every request runs the full view.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --pets 20000 --max-mb 16
+    python -m benchmarks.memory --save benchmarks/memory_baseline.json
+    python -m benchmarks.memory --compare benchmarks/memory_baseline.json
+
+The script exits with status 1 when a view's peak exceeds --max-mb. A view that
+loads a whole table into Python lists or dicts grows with the data and fails
+the bound, while one that paginates or limits in the database stays flat. With
+--compare it also fails when a peak grew by more than --threshold times its
+baseline.
+
+--existing-db measures the database configured in the environment (DB_ENGINE,
+DB_NAME, ...) instead of seeding one.
+"""
+
+import argparse
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import print_table, save_results
+from benchmarks.endpoints import find_targets, setup_django
+
+# (name, url name, query parameters, user); values that are keys of the
+# targets built by find_targets() are replaced by the target
+VIEWS = [
+    ('all_pets', 'all_pets', {}, None),
+    ('all_pets_last_page', 'all_pets', {'page': 'last'}, None),
+    ('all_pets_location', 'all_pets', {'location': 'Riverside'}, None),
+    ('all_pets_radius', 'all_pets', {'location': 'Riverside', 'radius': '50'}, None),
+    ('find_pets', 'find_pets', {}, 'reporter'),
+    ('find_pets_search', 'find_pets', {'pet_type': 'dog'}, 'reporter'),
+    ('admin_pending_requests', 'admin_pending_requests', {}, 'admin'),
+    ('admin_contact_submissions', 'admin_contact_submissions', {}, 'admin'),
+    ('api_user_requests', 'api_user_requests', {}, 'reporter'),
+    ('api_admin_notifications', 'api_admin_notifications', {}, 'admin'),
+    ('api_admin_notifications_unread', 'api_admin_notifications', {'unread': '1', 'limit': '200'}, 'admin'),
+]
+
+
+def measure(client, url, data, repeat):
+    """Return the largest peak memory (bytes) of `repeat` requests to url."""
+    from main.instrumentation import memory_peak, start_memory_trace
+
+    peaks = []
+    for _ in range(repeat):
+        baseline = start_memory_trace()
+        response = client.get(url, data)
+        peaks.append(memory_peak(baseline))
+        if response.status_code >= 400:
+            raise RuntimeError(f'{url} returned HTTP {response.status_code}')
+    return max(peaks)
+
+
+def run(args):
+    import tracemalloc
+
+    from django.test import Client
+    from django.urls import reverse
+
+    targets = find_targets()
+    clients = {None: Client()}
+    for username, user in targets['users'].items():
+        clients[username] = Client()
+        clients[username].force_login(user)
+
+    results = {}
+    try:
+        for name, url_name, data, username in VIEWS:
+            if args.only and name not in args.only:
+                continue
+            # Warm up outside tracing: imports, template loading and URL resolution are one-off costs
+            clients[username].get(reverse(url_name), data)
+            peak = measure(clients[username], reverse(url_name), data, args.repeat)
+            results[name] = {'peak_mb': round(peak / 1048576, 2)}
+            if args.verbose:
+                print(f'{name}: {results[name]["peak_mb"]:.2f} MB', file=sys.stderr)
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def compare_peaks(results, baseline_path, threshold):
+    """Return views whose peak memory grew by more than threshold times the baseline."""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = []
+    for name, stats in sorted(results.items()):
+        previous = baseline.get(name, {}).get('peak_mb')
+        if previous and stats['peak_mb'] > previous * threshold:
+            regressions.append(f'{name}: peak {previous:.2f} MB -> {stats["peak_mb"]:.2f} MB')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pets', type=int, default=100000, help='Pets to seed (see seed_petrescue)')
+    parser.add_argument('--users', type=int, default=500, help='Users to seed')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the data')
+    parser.add_argument('--repeat', type=int, default=3, help='Measured requests per view (the largest peak is kept)')
+    parser.add_argument('--max-mb', type=float, default=16.0, help='Fail when a view peaks above this many MB')
+    parser.add_argument('--existing-db', action='store_true', help='Use the configured database instead of seeding one')
+    parser.add_argument('--only', nargs='+', help='Measure only these view names')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare results with this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.5, help='Allowed peak growth factor with --compare')
+    parser.add_argument('--verbose', action='store_true', help='Print each view as it finishes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(None if args.existing_db else str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        if not args.existing_db:
+            call_command('migrate', verbosity=0)
+            call_command('seed_petrescue', users=args.users, pets=args.pets, seed=args.seed, stdout=io.StringIO())
+        results = run(args)
+
+    print_table(
+        [{'view': name, **stats} for name, stats in results.items()],
+        ['view', 'peak_mb'],
+    )
+
+    failures = [
+        f'{name}: peak {stats["peak_mb"]:.2f} MB exceeds {args.max_mb:.2f} MB'
+        for name, stats in results.items() if stats['peak_mb'] > args.max_mb
+    ]
+    if args.save:
+        save_results(args.save, results)
+        print(f'Saved baseline to {args.save}')
+    if args.compare:
+        failures += [f'REGRESSION {regression}' for regression in compare_peaks(results, args.compare, args.threshold)]
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
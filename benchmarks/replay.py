@@ -0,0 +1,156 @@
+"""
+Load generator: replay captured traffic against a server.
+
+Reads a JSONL file written by the traffic capture middleware (TRAFFIC_CAPTURE=True,
+see main/traffic.py) and sends every GET request in it to a server. The time gaps
+between the captured requests are kept, divided by --speedup. A pool of worker
+threads sends the requests, so slow responses do not delay the ones after them.
+
+    python -m benchmarks.replay traffic.jsonl --base-url http://127.0.0.1:8000 --speedup 10
+    python -m benchmarks.replay traffic.jsonl --speedup 0 --workers 32
+    python -m benchmarks.replay traffic.jsonl --session user=<sessionid> --session admin=<sessionid>
+
+Without --base-url the script starts Gunicorn on the configured database with
+--server-workers workers. --speedup 0 sends the requests as fast as the workers
+allow. Requests captured for logged-in roles are sent with the session cookie given
+by --session for that role, and anonymously when there is none. Other methods are
+skipped, because request bodies are never captured.
+
+The report lists latency percentiles per URL name, the error count, and the
+schedule lag. The lag is how late requests left compared with the captured
+timing. A growing lag means the load generator, not the server, is the
+bottleneck: add --workers. --save and --compare work as in the other benchmarks.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from benchmarks.common import (
+    compare_to_baseline, percentile, print_table, run_server, save_results, summarize, timed_get,
+)
+
+
+def load_records(path, limit=None):
+    """Return the GET records of a capture file sorted by time, and the number skipped."""
+    records, skipped = [], 0
+    with open(path) as capture_file:
+        for line in capture_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record['method'] != 'GET':
+                skipped += 1
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record['ts'])
+    return records[:limit] if limit else records, skipped
+
+
+def replay(base_url, records, speedup, workers, sessions):
+    """Send the records on their (scaled) schedule and return one result dict per request."""
+    results = []
+    results_lock = threading.Lock()
+
+    def send(record, due):
+        lag = max(0.0, time.perf_counter() - due)
+        url = f'{base_url}{record["path"]}'
+        if record.get('query'):
+            url = f'{url}?{record["query"]}'
+        session = sessions.get(record.get('role'))
+        headers = {'Cookie': f'sessionid={session}'} if session else {}
+        status, elapsed = timed_get(url, headers=headers)
+        with results_lock:
+            results.append({'view': record.get('view') or 'unmatched', 'status': status, 'elapsed': elapsed, 'lag': lag})
+
+    first_ts = records[0]['ts']
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for record in records:
+            due = start + ((record['ts'] - first_ts) / speedup if speedup else 0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, record, due)
+    return results, time.perf_counter() - start
+
+
+def summarize_results(results):
+    by_view = {}
+    for result in results:
+        by_view.setdefault(result['view'], []).append(result)
+    summary = {}
+    for view, view_results in sorted(by_view.items()):
+        summary[view] = {
+            **summarize([result['elapsed'] for result in view_results]),
+            'errors': sum(1 for result in view_results if result['status'] >= 500),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('capture', nargs='?', default='traffic.jsonl', help='Capture file (default: traffic.jsonl)')
+    parser.add_argument('--base-url', help='Server to replay against (default: start Gunicorn)')
+    parser.add_argument('--server-workers', type=int, default=2, help='Gunicorn workers when starting a server')
+    parser.add_argument('--speedup', type=float, default=1.0,
+                        help='Divide the captured gaps by this factor; 0 replays as fast as possible')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent replay threads')
+    parser.add_argument('--session', action='append', default=[], metavar='ROLE=SESSIONID',
+                        help='Session cookie for a captured role (user, staff or admin)')
+    parser.add_argument('--limit', type=int, help='Replay only the first N requests')
+    parser.add_argument('--save', help='Write per-view results to this JSON file')
+    parser.add_argument('--compare', help='Compare per-view results with this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Allowed p50 slowdown factor with --compare')
+    args = parser.parse_args()
+
+    if args.speedup < 0:
+        parser.error('--speedup must not be negative')
+    sessions = {}
+    for item in args.session:
+        role, separator, session = item.partition('=')
+        if not separator:
+            parser.error(f'--session expects ROLE=SESSIONID, got "{item}"')
+        sessions[role] = session
+
+    records, skipped = load_records(args.capture, args.limit)
+    if not records:
+        sys.exit(f'No GET requests in {args.capture}')
+    roles_without_session = sorted({record['role'] for record in records} - set(sessions) - {'anonymous'})
+    if roles_without_session:
+        print(f'No --session for {", ".join(roles_without_session)}; sending those requests anonymously')
+    captured_span = records[-1]['ts'] - records[0]['ts']
+
+    server = nullcontext(args.base_url) if args.base_url else run_server(workers=args.server_workers)
+    with server as base_url:
+        results, elapsed = replay(base_url, records, args.speedup, args.workers, sessions)
+
+    summary = summarize_results(results)
+    print_table(
+        [{'view': view, **stats} for view, stats in summary.items()],
+        ['view', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'errors'],
+    )
+    lags = [result['lag'] for result in results]
+    print()
+    print(f'Replayed {len(results)} requests in {elapsed:.1f}s ({len(results) / max(elapsed, 0.001):.1f} req/s); '
+          f'captured over {captured_span:.1f}s; skipped {skipped} non-GET requests')
+    print(f'Schedule lag: p50 {percentile(lags, 50) * 1000:.1f} ms, p95 {percentile(lags, 95) * 1000:.1f} ms, '
+          f'max {max(lags) * 1000:.1f} ms')
+
+    if args.save:
+        save_results(args.save, summary)
+        print(f'Saved baseline to {args.save}')
+    if args.compare:
+        regressions = compare_to_baseline(summary, args.compare, threshold=args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
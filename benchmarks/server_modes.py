@@ -0,0 +1,149 @@
+"""
+Benchmark: throughput of each Gunicorn worker mode on the main endpoints.
+
+Seeds a temporary SQLite database with seed_petrescue, then starts Gunicorn
+with gunicorn.conf.py once per mode and keeps --concurrency client threads
+sending requests to each endpoint for --duration seconds:
+
+    default  a single sync worker (Gunicorn's own defaults, before gunicorn.conf.py)
+    sync     GUNICORN_WORKER_CLASS=sync with the configured worker count
+    gthread  GUNICORN_WORKER_CLASS=gthread with the configured workers and threads
+    uvicorn  GUNICORN_WORKER_CLASS=uvicorn serving petrescue/asgi.py (skipped
+             unless the uvicorn package is installed)
+
+    python -m benchmarks.server_modes
+    python -m benchmarks.server_modes --concurrency 32 --duration 20 --modes sync gthread
+    GUNICORN_WORKERS=8 GUNICORN_THREADS=8 python -m benchmarks.server_modes --modes gthread
+
+GUNICORN_* variables set in the environment apply to every mode except
+default. The cache backend is the dummy one, so every request runs the full
+view. The report lists requests per second, latency percentiles and 5xx or
+connection errors per mode and endpoint.
+"""
+
+import argparse
+import importlib.util
+import io
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+from benchmarks.common import percentile, print_table, run_server, save_results, timed_get
+from benchmarks.endpoints import setup_django
+
+MODES = {
+    'default': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_WORKERS': '1', 'GUNICORN_PRELOAD': 'False'},
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'uvicorn': {'GUNICORN_WORKER_CLASS': 'uvicorn'},
+}
+
+# (name, url name, url kwargs, query string); 'public_pet' is replaced by an accepted pet's id
+ENDPOINTS = [
+    ('health_check', 'health_check', {}, ''),
+    ('home', 'home', {}, ''),
+    ('all_pets', 'all_pets', {}, ''),
+    ('all_pets_breed', 'all_pets', {}, 'breed=retriever'),
+    ('pet_detail', 'pet_detail', {'pet_id': 'public_pet'}, ''),
+]
+
+
+def endpoint_paths():
+    from django.urls import reverse
+
+    from main.models import Pet
+
+    public_pet = Pet.objects.filter(request__status='accepted').order_by('id').first()
+    if public_pet is None:
+        raise RuntimeError('The database needs accepted reports; run seed_petrescue first')
+    paths = {}
+    for name, url_name, kwargs, query in ENDPOINTS:
+        kwargs = {key: public_pet.id if value == 'public_pet' else value for key, value in kwargs.items()}
+        paths[name] = reverse(url_name, kwargs=kwargs) + (f'?{query}' if query else '')
+    return paths
+
+
+def load(url, concurrency, duration):
+    """Keep `concurrency` threads requesting url for `duration` seconds; return throughput and latency."""
+    samples, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        thread_samples, thread_errors = [], 0
+        while time.perf_counter() < deadline:
+            try:
+                status, elapsed = timed_get(url)
+            except (urllib.error.URLError, ConnectionError):
+                thread_errors += 1
+                continue
+            if status >= 500:
+                thread_errors += 1
+            thread_samples.append(elapsed)
+        with lock:
+            samples.extend(thread_samples)
+            errors.append(thread_errors)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'req_per_s': len(samples) / elapsed,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'errors': sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--concurrency', type=int, default=16, help='Client threads sending requests')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode and endpoint')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per endpoint')
+    parser.add_argument('--pets', type=int, default=5000, help='Pets to seed (see seed_petrescue)')
+    parser.add_argument('--users', type=int, default=200, help='Users to seed')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the data')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        call_command('seed_petrescue', users=args.users, pets=args.pets, seed=args.seed, stdout=io.StringIO())
+        paths = endpoint_paths()
+
+        for mode in args.modes:
+            if MODES[mode]['GUNICORN_WORKER_CLASS'] == 'uvicorn' and importlib.util.find_spec('uvicorn') is None:
+                print(f'Skipping {mode}: the uvicorn package is not installed (pip install uvicorn)', file=sys.stderr)
+                continue
+            env = {'STATIC_MANIFEST': 'False', 'SQLITE_TUNING': 'True', **MODES[mode]}
+            with run_server(env=env, workers=None, threads=None, worker_class=None, app=None) as base_url:
+                for name, path in paths.items():
+                    for _ in range(args.warmup):
+                        timed_get(f'{base_url}{path}')
+                    results[f'{mode}/{name}'] = {
+                        'mode': mode,
+                        'endpoint': name,
+                        **load(f'{base_url}{path}', args.concurrency, args.duration),
+                    }
+
+    print_table(list(results.values()), ['mode', 'endpoint', 'req_per_s', 'p50_ms', 'p95_ms', 'p99_ms', 'errors'])
+    if args.save:
+        save_results(args.save, results)
+        print(f'Saved results to {args.save}')
+
+
+if __name__ == '__main__':
+    main()
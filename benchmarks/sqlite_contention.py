@@ -0,0 +1,145 @@
+"""
+Benchmark: SQLite write contention with and without SQLITE_TUNING.
+
+Creates a fresh SQLite database for each mode, then runs writer and reader
+processes against it for a fixed duration:
+
+    writers  file a found pet report the way report_found_pet does
+             (Pet, Request, ActivityLog and Notification inserts)
+    readers  load the all pets listing query
+
+Each mode reports completed reports and reads per second and how many
+operations failed with "database is locked".
+
+    python -m benchmarks.sqlite_contention --writers 4 --readers 4 --duration 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import BASE_DIR, print_table
+
+MODES = {
+    'default': {'SQLITE_TUNING': 'False'},
+    'tuned': {'SQLITE_TUNING': 'True'},
+}
+
+
+def setup_django(env):
+    os.environ.update(env)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petrescue.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def prepare_database(env):
+    """Migrate a new database file and create the reporting user."""
+    subprocess.run(
+        [sys.executable, 'manage.py', 'migrate', '--verbosity', '0'],
+        cwd=BASE_DIR, env={**os.environ, **env}, check=True,
+    )
+    setup_django(env)
+    from django.contrib.auth import get_user_model
+    get_user_model().objects.create_user('benchmark', 'benchmark@example.com', 'benchmark-pass')
+
+
+def writer(env, duration, results):
+    setup_django(env)
+    from django.db import OperationalError
+    from main.models import ActivityLog, Notification, Pet, Request, User
+
+    user = User.objects.get(username='benchmark')
+    done = errors = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        try:
+            pet = Pet.objects.create(
+                owner=user, pet_type='dog', breed='Mixed', color='Brown',
+                location='Benchmark Park', status='found',
+            )
+            request_obj = Request.objects.create(
+                user=user, pet=pet, request_type='found', phone_number='',
+                message='Found pet report',
+            )
+            ActivityLog.objects.create(pet=pet, activity_type='created', actor='user-benchmark')
+            Notification.objects.create(
+                request=request_obj, message='New found pet report', notification_type='found_report',
+            )
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(('write', done, errors))
+
+
+def reader(env, duration, results):
+    setup_django(env)
+    from django.db import OperationalError
+    from main.models import Pet
+
+    done = errors = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        try:
+            list(Pet.objects.select_related('owner').order_by('-created_at')[:50])
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(('read', done, errors))
+
+
+def run_mode(mode_env, writers, readers, duration):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {
+            **mode_env,
+            'DB_ENGINE': 'django.db.backends.sqlite3',
+            'DB_NAME': str(Path(tmp_dir) / 'benchmark.sqlite3'),
+            'CACHE_BACKEND': 'dummy',
+        }
+        context = multiprocessing.get_context('spawn')
+        setup = context.Process(target=prepare_database, args=(env,))
+        setup.start()
+        setup.join()
+
+        results = context.Queue()
+        processes = [context.Process(target=writer, args=(env, duration, results)) for _ in range(writers)]
+        processes += [context.Process(target=reader, args=(env, duration, results)) for _ in range(readers)]
+        for process in processes:
+            process.start()
+        totals = {'write': [0, 0], 'read': [0, 0]}
+        for _ in processes:
+            kind, done, errors = results.get()
+            totals[kind][0] += done
+            totals[kind][1] += errors
+        for process in processes:
+            process.join()
+
+    return {
+        'reports_per_s': totals['write'][0] / duration,
+        'reads_per_s': totals['read'][0] / duration,
+        'write_errors': totals['write'][1],
+        'read_errors': totals['read'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode')
+    args = parser.parse_args()
+
+    rows = []
+    for mode, mode_env in MODES.items():
+        rows.append({'mode': mode, **run_mode(mode_env, args.writers, args.readers, args.duration)})
+    print_table(rows, ['mode', 'reports_per_s', 'reads_per_s', 'write_errors', 'read_errors'])
+
+
+if __name__ == '__main__':
+    main()
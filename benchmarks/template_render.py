@@ -0,0 +1,186 @@
+"""
+Benchmark: template rendering time for the main pages.
+
+Builds a temporary SQLite database with realistic data (enough accepted pets
+for a full 12-card all pets page), requests each page once with the test
+client to capture the exact context its view builds, then renders the page
+template repeatedly with that context. Querysets in the captured context are
+already evaluated, so the timings measure template work only.
+
+Each template is measured with the cached loader (the default) and with
+TEMPLATE_CACHE=False, where every render reads and compiles the template again.
+Fragment caching is disabled so the cached card grids are rendered every time.
+
+    python -m benchmarks.template_render --iterations 200
+    python -m benchmarks.template_render --save benchmarks/template_baseline.json
+    python -m benchmarks.template_render --compare benchmarks/template_baseline.json
+
+With --compare the script exits with status 1 when a template's p50 render time
+grew by more than --threshold times its baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import BASE_DIR, compare_to_baseline, print_table, save_results, summarize
+
+PETS = 30
+
+# (name, url name, url args, user) for every page that is measured
+PAGES = [
+    ('home', 'home', [], None),
+    ('all_pets', 'all_pets', [], None),
+    ('pet_detail', 'pet_detail', ['first_pet'], None),
+    ('find_pets', 'find_pets', [], 'reporter'),
+    ('report_lost_pet', 'report_lost_pet', [], 'reporter'),
+    ('register', 'register', [], None),
+    ('user_requests', 'user_requests', [], 'reporter'),
+    ('admin_dashboard', 'admin_dashboard', [], 'admin'),
+]
+
+
+def setup_django(db_name):
+    os.environ.update({
+        'DB_ENGINE': 'django.db.backends.sqlite3',
+        'DB_NAME': db_name,
+        'CACHE_BACKEND': 'dummy',
+    })
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petrescue.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def seed_data():
+    """Create a reporter with PETS accepted reports and an admin user."""
+    from main.models import ActivityLog, Pet, Request, User
+
+    reporter = User.objects.create_user('reporter', 'reporter@example.com', 'reporter-pass', phone_number='5550001111')
+    User.objects.create_superuser('admin', 'admin@example.com', 'admin-pass')
+    pet_types = ['dog', 'cat', 'bird', 'rabbit', 'other']
+    for index in range(PETS):
+        pet = Pet.objects.create(
+            owner=reporter,
+            pet_type=pet_types[index % len(pet_types)],
+            breed=f'Breed {index}',
+            color='Brown',
+            location=f'{index} Main Street, Springfield',
+            description='Friendly, wearing a red collar. ' * 5,
+            status='lost' if index % 2 else 'found',
+        )
+        Request.objects.create(
+            user=reporter,
+            pet=pet,
+            request_type=pet.status,
+            phone_number=reporter.phone_number,
+            message='Last seen near the park.',
+            status='accepted' if index % 3 else 'pending',
+        )
+        ActivityLog.objects.create(pet=pet, activity_type='created', actor='user-reporter')
+    return Pet.objects.order_by('id').first()
+
+
+def capture_contexts():
+    """Request each page once and return {name: (template name, context dict, request)}."""
+    from django.test import Client
+    from django.urls import reverse
+
+    first_pet = seed_data()
+    passwords = {'reporter': 'reporter-pass', 'admin': 'admin-pass'}
+    captured = {}
+    for name, url_name, url_args, username in PAGES:
+        client = Client()
+        if username:
+            client.login(username=username, password=passwords[username])
+        args = [first_pet.id if arg == 'first_pet' else arg for arg in url_args]
+        response = client.get(reverse(url_name, args=args))
+        if response.status_code != 200:
+            raise RuntimeError(f'{name} returned HTTP {response.status_code}')
+        context = response.context[0] if isinstance(response.context, list) else response.context
+        captured[name] = (response.templates[0].name, context.flatten(), response.wsgi_request)
+    return captured
+
+
+def time_renders(captured, iterations, warmup):
+    from django.template.loader import render_to_string
+
+    results = {}
+    for name, (template_name, context, request) in captured.items():
+        for _ in range(warmup):
+            render_to_string(template_name, context, request=request)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            render_to_string(template_name, context, request=request)
+            samples.append(time.perf_counter() - start)
+        results[name] = {'template': template_name, **summarize(samples)}
+    return results
+
+
+def loader_settings(cached):
+    from django.conf import settings
+
+    loaders = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    templates = [dict(settings.TEMPLATES[0])]
+    templates[0]['OPTIONS'] = {**templates[0]['OPTIONS'], 'loaders': loaders}
+    return templates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100, help='Timed renders per template and mode')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--save', help='Write cached-loader results to this JSON file')
+    parser.add_argument('--compare', help='Compare cached-loader results with this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Allowed p50 slowdown factor with --compare')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+        from django.test.utils import override_settings, setup_test_environment
+
+        setup_test_environment()
+        call_command('migrate', verbosity=0)
+        captured = capture_contexts()
+
+        results = {}
+        for mode, cached in [('cached', True), ('uncached', False)]:
+            with override_settings(TEMPLATES=loader_settings(cached)):
+                results[mode] = time_renders(captured, args.iterations, args.warmup)
+
+    rows = []
+    for name in results['cached']:
+        cached, uncached = results['cached'][name], results['uncached'][name]
+        rows.append({
+            'page': name,
+            'template': cached['template'],
+            'cached_p50_ms': cached['p50_ms'],
+            'cached_p95_ms': cached['p95_ms'],
+            'uncached_p50_ms': uncached['p50_ms'],
+            'saved_ms': uncached['p50_ms'] - cached['p50_ms'],
+        })
+    print_table(rows, ['page', 'template', 'cached_p50_ms', 'cached_p95_ms', 'uncached_p50_ms', 'saved_ms'])
+
+    if args.save:
+        save_results(args.save, results['cached'])
+        print(f'Saved baseline to {args.save}')
+    if args.compare:
+        regressions = compare_to_baseline(results['cached'], args.compare, threshold=args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
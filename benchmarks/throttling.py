@@ -0,0 +1,171 @@
+"""
+Benchmark: one misbehaving API client against well-behaved ones.
+
+Seeds a temporary SQLite database with seed_petrescue and signs in the
+--clients + 1 users who reported the most pets. Gunicorn then serves
+gunicorn.conf.py's default deployment with the locmem cache (so throttle
+buckets are kept) once per scenario:
+
+    unthrottled  THROTTLE_RATE_DASHBOARD empty: no limit on the dashboard group
+    throttled    THROTTLE_RATE_DASHBOARD=--rate
+
+In each scenario, --clients well-behaved users request their own
+/api/dashboard/requests/ one at a time with --think seconds between requests,
+first alone and then while one more user hammers the same endpoint from
+--abuser-threads threads without pause:
+
+    python -m benchmarks.throttling
+    python -m benchmarks.throttling --abuser-threads 64 --rate 60/min --duration 20
+
+The report lists, per scenario and phase, the latency percentiles and errors of
+the well-behaved users and how many of the abuser's requests were served (2xx)
+or refused (429).
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+from benchmarks.common import percentile, print_table, run_server, save_results, timed_get
+from benchmarks.endpoints import setup_django
+
+SCENARIOS = {
+    'unthrottled': {'THROTTLE_RATE_DASHBOARD': ''},
+    'throttled': {},  # THROTTLE_RATE_DASHBOARD is set from --rate
+}
+
+
+def prepare_sessions(count):
+    """Sign in the `count` users with the most reports and return their session cookies."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from django.test import Client
+
+    users = get_user_model().objects.annotate(pet_count=Count('pet')).order_by('-pet_count', 'id')[:count]
+    if len(users) < count:
+        raise RuntimeError(f'The database needs at least {count} users; raise --users')
+    sessions = []
+    for user in users:
+        client = Client()
+        client.force_login(user)
+        sessions.append(client.cookies['sessionid'].value)
+    return sessions
+
+
+def run_clients(url, polite_sessions, abuser_session, abuser_threads, think, duration):
+    """Run the well-behaved users (and the abuser, if given) for `duration` seconds."""
+    polite_samples, polite_errors = [], []
+    abuser_statuses = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def polite(session):
+        samples, errors = [], 0
+        headers = {'Cookie': f'sessionid={session}'}
+        while time.perf_counter() < deadline:
+            try:
+                status, elapsed = timed_get(url, headers)
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+            samples.append(elapsed)
+            time.sleep(think)
+        with lock:
+            polite_samples.extend(samples)
+            polite_errors.append(errors)
+
+    def abuser():
+        statuses = []
+        headers = {'Cookie': f'sessionid={abuser_session}'}
+        while time.perf_counter() < deadline:
+            try:
+                status, _ = timed_get(url, headers)
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                status = None
+            statuses.append(status)
+        with lock:
+            abuser_statuses.extend(statuses)
+
+    threads = [threading.Thread(target=polite, args=(session,)) for session in polite_sessions]
+    if abuser_session is not None:
+        threads += [threading.Thread(target=abuser) for _ in range(abuser_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        'polite_requests': len(polite_samples),
+        'polite_p50_ms': percentile(polite_samples, 50) * 1000,
+        'polite_p95_ms': percentile(polite_samples, 95) * 1000,
+        'polite_p99_ms': percentile(polite_samples, 99) * 1000,
+        'polite_errors': sum(polite_errors),
+        'abuser_served': sum(1 for status in abuser_statuses if status is not None and status < 300),
+        'abuser_429': abuser_statuses.count(429),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--clients', type=int, default=8, help='Well-behaved users')
+    parser.add_argument('--think', type=float, default=0.25, help='Seconds between a well-behaved user\'s requests')
+    parser.add_argument('--abuser-threads', type=int, default=32, help='Threads of the misbehaving user')
+    parser.add_argument('--rate', default='120/min', help='Dashboard rate in the throttled scenario')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds per phase')
+    parser.add_argument('--pets', type=int, default=5000, help='Pets to seed (see seed_petrescue)')
+    parser.add_argument('--users', type=int, default=100, help='Users to seed')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the data')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # The sessions are created here and read by the server, so both need the same key
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(str(Path(tmp_dir) / 'benchmark.sqlite3'))
+        from django.core.management import call_command
+        from django.urls import reverse
+
+        call_command('migrate', verbosity=0)
+        call_command('seed_petrescue', users=args.users, pets=args.pets, seed=args.seed, stdout=io.StringIO())
+        abuser_session, *polite_sessions = prepare_sessions(args.clients + 1)
+        path = reverse('api_user_requests')
+
+        for scenario in args.scenarios:
+            env = {
+                'STATIC_MANIFEST': 'False',
+                'SQLITE_TUNING': 'True',
+                'CACHE_BACKEND': 'locmem',
+                # One worker, so all requests share the locmem buckets
+                'GUNICORN_WORKERS': '1',
+                'THROTTLE_RATE_DASHBOARD': args.rate,
+                **SCENARIOS[scenario],
+            }
+            with run_server(env=env, workers=None, threads=None, worker_class=None, app=None) as base_url:
+                for phase, abuser in (('alone', None), ('with abuser', abuser_session)):
+                    results[f'{scenario}/{phase}'] = {
+                        'scenario': scenario,
+                        'phase': phase,
+                        **run_clients(f'{base_url}{path}', polite_sessions, abuser,
+                                      args.abuser_threads, args.think, args.duration),
+                    }
+
+    print_table(
+        list(results.values()),
+        ['scenario', 'phase', 'polite_requests', 'polite_p50_ms', 'polite_p95_ms', 'polite_p99_ms',
+         'polite_errors', 'abuser_served', 'abuser_429'],
+    )
+    if args.save:
+        save_results(args.save, results)
+        print(f'Saved results to {args.save}')
+
+
+if __name__ == '__main__':
+    main()
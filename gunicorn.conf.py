@@ -0,0 +1,113 @@
+"""
+Gunicorn configuration for the PetRescue application.
+
+Gunicorn reads this file automatically when started from the project root:
+
+    gunicorn
+    GUNICORN_WORKER_CLASS=sync GUNICORN_WORKERS=4 gunicorn
+
+Every setting comes from an environment variable (see docs/performance.md for
+the table and the benchmark matrix behind the defaults). Options given on the
+command line override this file.
+
+GUNICORN_WORKER_CLASS selects how a worker handles concurrent requests:
+
+    sync     one request at a time per worker process
+    gthread  GUNICORN_THREADS requests at a time per worker, one thread each (default)
+    uvicorn  serves petrescue/asgi.py with uvicorn's worker; needs the optional
+             uvicorn package (pip install "uvicorn[standard]")
+"""
+
+import importlib.util
+import multiprocessing
+import os
+
+
+def _env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+CPU_COUNT = multiprocessing.cpu_count()
+
+# Worker class: sync, gthread or uvicorn
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+_worker_mode = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread').strip().lower()
+if _worker_mode not in WORKER_CLASSES:
+    raise RuntimeError(
+        f'Unknown GUNICORN_WORKER_CLASS "{_worker_mode}"; expected one of {", ".join(WORKER_CLASSES)}.'
+    )
+if _worker_mode == 'uvicorn' and importlib.util.find_spec('uvicorn') is None:
+    raise RuntimeError('GUNICORN_WORKER_CLASS=uvicorn needs the uvicorn package (pip install "uvicorn[standard]").')
+worker_class = WORKER_CLASSES[_worker_mode]
+wsgi_app = 'petrescue.asgi:application' if _worker_mode == 'uvicorn' else 'petrescue.wsgi:application'
+
+# Address to listen on; PORT is honoured for platforms that set it
+bind = os.environ.get('GUNICORN_BIND', f'0.0.0.0:{os.environ.get("PORT", "8000")}')
+
+# Worker processes and threads per worker. A sync worker serves one request at a
+# time, so it needs more processes to keep the CPUs busy while requests wait on
+# the database; gthread and uvicorn workers overlap that wait inside each process.
+_default_workers = CPU_COUNT * 2 + 1 if _worker_mode == 'sync' else CPU_COUNT + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', _default_workers))
+# (GUNICORN_THREADS only applies to gthread: Gunicorn turns a sync worker with threads into gthread)
+threads = int(os.environ.get('GUNICORN_THREADS', '4')) if _worker_mode == 'gthread' else 1
+
+# The page cache, its invalidation and the throttle buckets only work if every worker
+# sees the same cache. A locmem cache is private to one process, so a save would only
+# invalidate the pages cached by the worker that handled it. Several workers therefore
+# default to the file cache, and an explicit CACHE_BACKEND=locmem is refused.
+_cache_backend = os.environ.get('CACHE_BACKEND', '').strip().lower()
+if workers > 1:
+    if _cache_backend == 'locmem':
+        raise RuntimeError(
+            f'CACHE_BACKEND=locmem would give each of the {workers} workers its own cache; '
+            'use CACHE_BACKEND=file or redis, or GUNICORN_WORKERS=1.'
+        )
+    if not _cache_backend:
+        os.environ['CACHE_BACKEND'] = 'file'
+
+# Import the application once in the master before forking, so workers share its
+# memory and a broken deploy fails at startup instead of in every worker. Code
+# changes then need a full restart; a HUP only re-forks the preloaded code.
+preload_app = _env_bool('GUNICORN_PRELOAD', default=True)
+
+# Restart each worker after a number of requests (spread by the jitter so the
+# workers do not all restart at once), bounding slow memory growth. Off by default
+# for gthread: a restarting gthread worker resets the connections it has accepted
+# but not yet served (seen with Gunicorn 22 under benchmarks/server_modes.py).
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0' if _worker_mode == 'gthread' else '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Seconds to keep an idle client connection open; keep it above the idle timeout
+# of a load balancer in front so it never sends on a connection Gunicorn closed
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+# Seconds a request may run before its worker is killed and restarted
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+
+
+def when_ready(server):
+    # Django imports the URLconf, and with it every view module and Django REST
+    # framework, on the first request. Load it in the master once the preloaded
+    # application is ready, so each forked worker starts with it already imported.
+    if preload_app:
+        from django.urls import get_resolver
+        get_resolver().url_patterns
+
+
+def post_fork(server, worker):
+    # Database connections opened while preloading must not be shared between workers
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
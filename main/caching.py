@@ -0,0 +1,209 @@
+"""
+Page caching helpers for the PetRescue application.
+
+Public page shells are cached per URL under a shared "version" number. Saving or
+deleting a Pet, Request or PetImage bumps the version (see signals.py), which
+marks every previously cached page and result set as stale at once without
+having to know which keys were written.
+
+Stale entries are kept around for PAGE_CACHE_STALE_TIMEOUT seconds past their
+freshness window. While one worker holds the refresh lock and recomputes an
+entry, every other worker keeps serving the stale copy, so an expiry during a
+traffic spike never sends all workers to the database at the same time.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from petrescue.db.replica import is_pinned_to_primary
+
+logger = logging.getLogger(__name__)
+
+# Cache key holding the current public page version
+PAGE_CACHE_VERSION_KEY = 'petrescue:pages:version'
+
+# How often a worker waiting on another worker's refresh checks the cache
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_page_cache_version():
+    """
+    Return the current public page cache version.
+    The version is seeded from the clock so an evicted key never resurrects old pages.
+    """
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(PAGE_CACHE_VERSION_KEY, int(time.time()), None)
+        version = cache.get(PAGE_CACHE_VERSION_KEY, int(time.time()))
+    return version
+
+
+async def aget_page_cache_version():
+    """Async version of get_page_cache_version()."""
+    version = await cache.aget(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        await cache.aadd(PAGE_CACHE_VERSION_KEY, int(time.time()), None)
+        version = await cache.aget(PAGE_CACHE_VERSION_KEY, int(time.time()))
+    return version
+
+
+def bump_page_cache_version():
+    """
+    Invalidate all cached public pages and fragments by moving to a new version.
+    """
+    try:
+        return cache.incr(PAGE_CACHE_VERSION_KEY)
+    except ValueError:
+        # The version key was never set or has been evicted
+        version = int(time.time())
+        cache.set(PAGE_CACHE_VERSION_KEY, version, None)
+        return version
+
+
+def page_cache_key(request):
+    """
+    Build the cache key for a request's full path (including query string).
+    The page version is stored inside the entry so outdated copies can still be served stale.
+    """
+    path_hash = hashlib.md5(request.get_full_path().encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'petrescue:page:{path_hash}'
+
+
+def _store_entry(key, value, version, timeout):
+    """Store a value together with its freshness deadline and page version."""
+    entry = {
+        'value': value,
+        'version': version,
+        'fresh_until': time.time() + timeout,
+    }
+    cache.set(key, entry, timeout + settings.PAGE_CACHE_STALE_TIMEOUT)
+
+
+def _refresh_entry(key, lock_key, compute, version, timeout, should_cache):
+    """Recompute an entry while holding its refresh lock, then release the lock."""
+    try:
+        value = compute()
+        if should_cache(value):
+            _store_entry(key, value, version, timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def _refresh_in_background(key, lock_key, compute, version, timeout, should_cache):
+    """Recompute an entry on a daemon thread so the current request can return the stale copy."""
+    def _run():
+        try:
+            _refresh_entry(key, lock_key, compute, version, timeout, should_cache)
+        except Exception:
+            logger.exception('Background refresh of cache key %s failed', key)
+        finally:
+            # The thread opened its own database connections
+            connections.close_all()
+
+    threading.Thread(target=_run, name=f'cache-refresh-{key}', daemon=True).start()
+
+
+def get_or_refresh(key, compute, timeout=None, should_cache=None):
+    """
+    Return the cached value for ``key``, computing it with single-flight protection.
+
+    - Fresh entries are returned straight from the cache.
+    - Stale entries (expired or from an older page version) are returned while the
+      single worker that wins the refresh lock recomputes them, in the background
+      when PAGE_CACHE_BACKGROUND_REFRESH is enabled.
+    - On a cold miss, the lock winner computes the value and other workers wait
+      up to PAGE_CACHE_LOCK_WAIT seconds for it before computing it themselves.
+    """
+    if timeout is None:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+    if should_cache is None:
+        should_cache = lambda value: True  # noqa: E731
+
+    version = get_page_cache_version()
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+
+    if entry is not None:
+        if entry['version'] == version and entry['fresh_until'] > time.time():
+            return entry['value']
+
+        # Stale entry: only the lock winner refreshes, everyone else serves stale
+        if not cache.add(lock_key, 1, settings.PAGE_CACHE_LOCK_TIMEOUT):
+            return entry['value']
+        if settings.PAGE_CACHE_BACKGROUND_REFRESH:
+            _refresh_in_background(key, lock_key, compute, version, timeout, should_cache)
+            return entry['value']
+        return _refresh_entry(key, lock_key, compute, version, timeout, should_cache)
+
+    # Cold miss: wait briefly for another worker that is already computing
+    if not cache.add(lock_key, 1, settings.PAGE_CACHE_LOCK_TIMEOUT):
+        deadline = time.time() + settings.PAGE_CACHE_LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+        value = compute()
+        if should_cache(value):
+            _store_entry(key, value, version, timeout)
+        return value
+
+    return _refresh_entry(key, lock_key, compute, version, timeout, should_cache)
+
+
+def is_cacheable_request(request):
+    """
+    Public page shells are identical for every visitor, so any GET/HEAD request can use the cache.
+    Browsers pinned to the primary database after a write bypass it to see their own changes,
+    and profiled requests (see profiling.py) bypass it to measure the view.
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and not is_pinned_to_primary(request)
+        and not getattr(request, 'profiling', False)
+    )
+
+
+def cache_public_page(view_func):
+    """
+    Decorator that caches a public page shell for all visitors.
+    The view must render with render_public_shell() so the page holds no per-user content.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        def _should_cache(response):
+            # Never cache errors, streamed output or pages that issued a CSRF token
+            return (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+                and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            )
+
+        return get_or_refresh(
+            page_cache_key(request),
+            lambda: view_func(request, *args, **kwargs),
+            should_cache=_should_cache,
+        )
+
+    return _wrapped_view
+
+
+def email_taken_cache_key(email):
+    """
+    Build the cache key holding whether an email address is registered (see validate_email).
+    The address is hashed so it is never stored in the cache in clear text.
+    """
+    email_hash = hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()
+    return f'petrescue:email-taken:{email_hash}'
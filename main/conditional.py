@@ -0,0 +1,173 @@
+"""
+HTTP conditional request support for the PetRescue application.
+
+Each decorated view gets a "last modified" function built from model
+timestamps (Pet.updated_at, Notification.updated_at, ContactSubmission.updated_at
+and the newest ActivityLog entry). The ETag also folds in the public page cache
+version, which deletions bump, and the user for per-user endpoints. When the
+client's copy is current a 304 is returned before the view runs, so no
+template is rendered and nothing is serialized.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from .caching import aget_page_cache_version, get_page_cache_version
+from .models import ContactSubmission, Notification, Pet
+
+
+def _latest(*timestamps):
+    """Return the most recent of the given timestamps, ignoring missing ones."""
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+# Last-modified functions
+# Each receives the view arguments and returns a datetime, or None to skip conditional handling;
+# async views use the coroutine versions (named with an "a" prefix)
+
+def pet_detail_last_modified(request, pet_id):
+    """A pet page changes with the pet, its activity log and its images."""
+    pet = Pet.objects.filter(id=pet_id).annotate(
+        latest_activity=Max('activitylog__timestamp'),
+        latest_image=Max('images__uploaded_at'),
+    ).values('updated_at', 'latest_activity', 'latest_image').first()
+    if pet is None:
+        return None
+    return _latest(pet['updated_at'], pet['latest_activity'], pet['latest_image'])
+
+
+def all_pets_last_modified(request):
+    """
+    The listing changes when any pet is edited or any request status changes, which
+    touches its pet; MAX(updated_at) is read from the pet_updated_idx index.
+    """
+    return Pet.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def user_requests_last_modified(request):
+    """A user's dashboard changes with their pets and those pets' activity."""
+    if not request.user.is_authenticated:
+        return None
+    latest = Pet.objects.filter(owner=request.user).aggregate(
+        latest_pet=Max('updated_at'),
+        latest_activity=Max('activitylog__timestamp'),
+    )
+    return _latest(latest['latest_pet'], latest['latest_activity'])
+
+
+async def arequest_history_last_modified(request, pet_id):
+    """A report timeline changes when a new activity is logged for the pet."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None
+    pet = await Pet.objects.filter(id=pet_id, owner=user).annotate(
+        latest_activity=Max('activitylog__timestamp'),
+    ).values('updated_at', 'latest_activity').afirst()
+    if pet is None:
+        return None
+    return _latest(pet['updated_at'], pet['latest_activity'])
+
+
+def admin_notifications_last_modified(request):
+    """Admin notifications change when one is created, read or its contact submission is updated."""
+    if not request.user.is_superuser:
+        return None
+    latest_notification = Notification.objects.aggregate(latest=Max('updated_at'))['latest']
+    latest_submission = ContactSubmission.objects.aggregate(latest=Max('updated_at'))['latest']
+    return _latest(latest_notification, latest_submission)
+
+
+async def aadmin_notifications_last_modified(request):
+    """Async version of admin_notifications_last_modified() for the async view."""
+    user = await request.auser()
+    if not user.is_superuser:
+        return None
+    latest_notification = (await Notification.objects.aaggregate(latest=Max('updated_at')))['latest']
+    latest_submission = (await ContactSubmission.objects.aaggregate(latest=Max('updated_at')))['latest']
+    return _latest(latest_notification, latest_submission)
+
+
+def conditional_response(last_modified_func, private=False):
+    """
+    Decorator adding ETag/Last-Modified validation and Cache-Control to a GET view.
+
+    Public pages are marked cacheable by shared caches for PUBLIC_PAGE_MAX_AGE
+    seconds; private (per-user) endpoints must be revalidated on every use.
+    An async view is wrapped natively and needs an async last_modified_func.
+    """
+    if private:
+        cache_directives = {'private': True, 'no_cache': True}
+    else:
+        cache_directives = {'public': True, 'max_age': settings.PUBLIC_PAGE_MAX_AGE}
+
+    def etag_for(request, last_modified, version, user):
+        validator = f'{version}:{last_modified.isoformat()}:{request.get_full_path()}'
+        if private:
+            validator = f'{validator}:{user.pk}'
+        return quote_etag(hashlib.md5(validator.encode('utf-8'), usedforsecurity=False).hexdigest())
+
+    def finish(response, etag, last_modified_timestamp):
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            response.headers.setdefault('Last-Modified', http_date(last_modified_timestamp))
+        patch_cache_control(response, **cache_directives)
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_async_view(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                # An async view takes an async last-modified function
+                last_modified = await last_modified_func(request, *args, **kwargs)
+                if last_modified is None:
+                    response = await view_func(request, *args, **kwargs)
+                    patch_cache_control(response, **cache_directives)
+                    return response
+
+                user = await request.auser() if private else None
+                etag = etag_for(request, last_modified, await aget_page_cache_version(), user)
+                last_modified_timestamp = int(last_modified.timestamp())
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified_timestamp
+                )
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return finish(response, etag, last_modified_timestamp)
+
+            return _wrapped_async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            last_modified = last_modified_func(request, *args, **kwargs)
+            if last_modified is None:
+                response = view_func(request, *args, **kwargs)
+                patch_cache_control(response, **cache_directives)
+                return response
+
+            etag = etag_for(request, last_modified, get_page_cache_version(), request.user)
+            last_modified_timestamp = int(last_modified.timestamp())
+
+            # Answer with 304 before the view renders or serializes anything
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified_timestamp
+            )
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return finish(response, etag, last_modified_timestamp)
+
+        return _wrapped_view
+
+    return decorator
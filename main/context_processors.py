@@ -0,0 +1,18 @@
+"""
+Template context processors for the PetRescue application.
+"""
+
+from django.conf import settings
+
+from .caching import get_page_cache_version
+
+
+def page_cache(request):
+    """
+    Expose the public page cache version and fragment timeout to templates.
+    Used as vary-on arguments for {% cache %} blocks around the pet card grids.
+    """
+    return {
+        'page_cache_version': get_page_cache_version(),
+        'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
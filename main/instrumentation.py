@@ -0,0 +1,465 @@
+"""
+Request instrumentation for the PetRescue application.
+
+RequestMetricsMiddleware records, for every request, the number of SQL queries,
+the time spent in the database, the time spent rendering templates, the view
+time (measured by ViewTimingMiddleware, the innermost middleware) and the total
+time. Staff users receive the numbers in a Server-Timing header, which browser
+developer tools show in the network panel.
+
+Each request is also added to a per-URL-name histogram kept in process memory.
+admin_metrics (see views.py) exposes the histograms in the Prometheus text
+format. Every Gunicorn worker keeps its own histograms, and they are cumulative
+since the worker started as Prometheus expects; use rate() over a range for a
+rolling view.
+
+With MEMORY_METRICS on, RequestMetricsMiddleware also traces Python allocations
+with tracemalloc and records the peak memory each request allocated. Tracing
+slows every request down and the peak is process-wide, so concurrent requests
+in a threaded worker inflate each other's numbers: enable it on a single
+sync worker while investigating, not permanently.
+
+SlowQueryLogMiddleware is opt-in (SLOW_QUERY_MS). It logs every SQL statement
+slower than the threshold with its parameters, the URL name of the view and the
+application frame that ran it. On SQLite and MySQL it also logs the statement's
+EXPLAIN plan.
+"""
+
+import logging
+import os
+import threading
+import time
+import traceback
+import tracemalloc
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.template.exceptions import TemplateDoesNotExist
+from django.utils.functional import LazyObject
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metrics of the request being handled on this thread or task
+_request_metrics = ContextVar('petrescue_request_metrics', default=None)
+
+# Request being handled, for naming the view in the slow query log
+_slow_query_request = ContextVar('petrescue_slow_query_request', default=None)
+
+# EXPLAIN prefix per database vendor; other vendors are logged without a plan
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+def current_metrics():
+    """Return the metrics dict of the current request, or None outside a request."""
+    return _request_metrics.get()
+
+
+@contextmanager
+def _timed(key):
+    """Add the time spent in the block to the current request's metrics."""
+    metrics = _request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics[key] += time.perf_counter() - start
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their duration."""
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics['db_time'] += time.perf_counter() - start
+        metrics['queries'] += 1
+
+
+# Template timing
+# A DjangoTemplates backend whose templates report their render time
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = _request_metrics.get()
+        if metrics is None or metrics['template_depth']:
+            # Nested renders are already inside the outer render's timing
+            return super().render(context, request)
+        metrics['template_depth'] += 1
+        try:
+            with _timed('template_time'):
+                return super().render(context, request)
+        finally:
+            metrics['template_depth'] -= 1
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# Histograms
+# Process-local request duration histograms and totals per URL name
+
+class MetricsRegistry:
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, metrics):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = {
+                    'buckets': [0] * len(self.buckets),
+                    'count': 0,
+                    'sum': 0.0,
+                    'queries': 0,
+                    'db_time': 0.0,
+                    'template_time': 0.0,
+                }
+            for index, upper_bound in enumerate(self.buckets):
+                if metrics['total_time'] <= upper_bound:
+                    stats['buckets'][index] += 1
+            stats['count'] += 1
+            stats['sum'] += metrics['total_time']
+            stats['queries'] += metrics['queries']
+            stats['db_time'] += metrics['db_time']
+            stats['template_time'] += metrics['template_time']
+            if metrics.get('memory_peak') is not None:
+                stats['memory_count'] = stats.get('memory_count', 0) + 1
+                stats['memory_peak_sum'] = stats.get('memory_peak_sum', 0) + metrics['memory_peak']
+                stats['memory_peak_max'] = max(stats.get('memory_peak_max', 0), metrics['memory_peak'])
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def render_prometheus(self):
+        """Return all histograms in the Prometheus text exposition format."""
+        with self._lock:
+            views = {view: dict(stats, buckets=list(stats['buckets'])) for view, stats in self._views.items()}
+
+        lines = [
+            '# HELP petrescue_request_duration_seconds Request duration by URL name.',
+            '# TYPE petrescue_request_duration_seconds histogram',
+        ]
+        for view, stats in sorted(views.items()):
+            for upper_bound, count in zip(self.buckets, stats['buckets']):
+                lines.append(f'petrescue_request_duration_seconds_bucket{{view="{view}",le="{upper_bound}"}} {count}')
+            lines.append(f'petrescue_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'petrescue_request_duration_seconds_sum{{view="{view}"}} {stats["sum"]:.6f}')
+            lines.append(f'petrescue_request_duration_seconds_count{{view="{view}"}} {stats["count"]}')
+
+        totals = [
+            ('petrescue_request_db_queries_total', 'SQL queries run by requests, by URL name.', 'queries', 'd'),
+            ('petrescue_request_db_seconds_total', 'Time spent in the database, by URL name.', 'db_time', '.6f'),
+            ('petrescue_request_template_seconds_total', 'Time spent rendering templates, by URL name.', 'template_time', '.6f'),
+        ]
+        for name, help_text, key, value_format in totals:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for view, stats in sorted(views.items()):
+                lines.append(f'{name}{{view="{view}"}} {stats[key]:{value_format}}')
+
+        memory_views = [(view, stats) for view, stats in sorted(views.items()) if 'memory_count' in stats]
+        if memory_views:
+            lines.append('# HELP petrescue_request_memory_peak_bytes Peak memory allocated by requests (MEMORY_METRICS), by URL name.')
+            lines.append('# TYPE petrescue_request_memory_peak_bytes summary')
+            for view, stats in memory_views:
+                lines.append(f'petrescue_request_memory_peak_bytes_sum{{view="{view}"}} {stats["memory_peak_sum"]}')
+                lines.append(f'petrescue_request_memory_peak_bytes_count{{view="{view}"}} {stats["memory_count"]}')
+            lines.append('# HELP petrescue_request_memory_peak_bytes_max Largest peak memory of a single request, by URL name.')
+            lines.append('# TYPE petrescue_request_memory_peak_bytes_max gauge')
+            for view, stats in memory_views:
+                lines.append(f'petrescue_request_memory_peak_bytes_max{{view="{view}"}} {stats["memory_peak_max"]}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _server_timing(metrics):
+    entries = [
+        f'db;dur={metrics["db_time"] * 1000:.1f};desc="{metrics["queries"]} queries"',
+        f'tpl;dur={metrics["template_time"] * 1000:.1f};desc="Templates"',
+        f'view;dur={metrics["view_time"] * 1000:.1f};desc="View"',
+        f'total;dur={metrics["total_time"] * 1000:.1f};desc="Total"',
+    ]
+    if metrics['memory_peak'] is not None:
+        entries.append(f'mem;desc="{metrics["memory_peak"] / 1048576:.1f} MB peak"')
+    return ', '.join(entries)
+
+
+# Memory
+
+def start_memory_trace():
+    """
+    Start tracing allocations (if needed) and reset the peak.
+    Returns the memory traced so far, to subtract from the peak read by memory_peak().
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def memory_peak(baseline):
+    """Return the peak bytes allocated since start_memory_trace() returned baseline."""
+    return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+
+# Slow query log
+
+def _application_frame():
+    """Return "path:line in function" for the innermost frame in project code."""
+    base_dir = str(settings.BASE_DIR) + os.sep
+    for frame in reversed(traceback.extract_stack()):
+        if (frame.filename.startswith(base_dir) and frame.filename != __file__
+                and f'{os.sep}site-packages{os.sep}' not in frame.filename):
+            return f'{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}'
+    return 'unknown'
+
+
+def explain(connection, sql, params):
+    """
+    Return the EXPLAIN output of a SELECT statement as text, or None when the
+    database vendor or statement is not supported.
+    The plan is read through a new, unwrapped cursor so the statement's own
+    result set is left untouched and the EXPLAIN itself is not logged or counted.
+    """
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    lines = ['\t'.join(columns)]
+    lines.extend('\t'.join(str(value) for value in row) for row in rows)
+    return '\n'.join(lines)
+
+
+def _slow_query_wrapper(execute, sql, params, many, context):
+    """Database execute wrapper logging statements slower than SLOW_QUERY_MS."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS:
+            _log_slow_query(sql, params, many, context['connection'], duration_ms)
+
+
+def _log_slow_query(sql, params, many, connection, duration_ms):
+    request = _slow_query_request.get()
+    match = getattr(request, 'resolver_match', None)
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not many:
+        try:
+            plan = explain(connection, sql, params)
+        except Exception as exc:
+            plan = f'EXPLAIN failed: {exc}'
+    logger.warning(
+        'Slow query (%.1f ms) in view %s [%s %s] at %s\n%s\nParams: %r%s',
+        duration_ms,
+        match.url_name if match and match.url_name else 'unmatched',
+        request.method if request else '-',
+        request.path if request else '-',
+        _application_frame(),
+        sql,
+        params,
+        f'\nPlan:\n{plan}' if plan else '',
+    )
+
+
+# Middleware
+# Each middleware runs synchronously under WSGI and natively under ASGI, so async
+# views are not pushed into a thread. Django runs the ORM calls of an async
+# request (and sync views) on the request's sync thread, and a connection's
+# execute wrappers only apply on the thread that installed them.
+
+def _wrap_connections(stack, wrapper):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(wrapper))
+
+
+@asynccontextmanager
+async def _awrapped_connections(wrapper):
+    """Install an execute wrapper on the connections of the request's sync thread."""
+    stack = ExitStack()
+    await sync_to_async(_wrap_connections)(stack, wrapper)
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+def _loaded_user(request):
+    """
+    Return the request's user if the view or another middleware already loaded it, else None.
+    Deciding on Server-Timing must not read the session itself: a cached public page
+    served to a signed-in browser would otherwise pay for the session and user queries.
+    """
+    user = request.__dict__.get('user')
+    if user is not None and not isinstance(user, LazyObject):
+        return user  # set directly, e.g. by login() or an async view
+    # Filled by AuthenticationMiddleware's lazy request.user and request.auser()
+    return request.__dict__.get('_cached_user') or request.__dict__.get('_acached_user')
+
+
+class RequestMetricsMiddleware:
+    """
+    Outermost middleware collecting query, database, template, view and total time for each request,
+    and the peak memory allocated when MEMORY_METRICS is on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+
+        metrics, memory_baseline, token = self._start()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, _query_wrapper)
+                response = self.get_response(request)
+        finally:
+            self._stop(metrics, memory_baseline, token, start)
+        return self._finish(request, response, metrics, _loaded_user(request))
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS:
+            return await self.get_response(request)
+
+        metrics, memory_baseline, token = self._start()
+        start = time.perf_counter()
+        try:
+            async with _awrapped_connections(_query_wrapper):
+                response = await self.get_response(request)
+        finally:
+            self._stop(metrics, memory_baseline, token, start)
+        return self._finish(request, response, metrics, _loaded_user(request))
+
+    def _start(self):
+        metrics = {
+            'queries': 0,
+            'db_time': 0.0,
+            'template_time': 0.0,
+            'template_depth': 0,
+            'view_time': 0.0,
+            'total_time': 0.0,
+            'memory_peak': None,
+        }
+        memory_baseline = start_memory_trace() if settings.MEMORY_METRICS else None
+        return metrics, memory_baseline, _request_metrics.set(metrics)
+
+    def _stop(self, metrics, memory_baseline, token, start):
+        metrics['total_time'] = time.perf_counter() - start
+        if memory_baseline is not None:
+            metrics['memory_peak'] = memory_peak(memory_baseline)
+        _request_metrics.reset(token)
+
+    def _finish(self, request, response, metrics, user):
+        match = getattr(request, 'resolver_match', None)
+        registry.observe(match.url_name if match and match.url_name else 'unmatched', metrics)
+
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = _server_timing(metrics)
+        return response
+
+
+class ViewTimingMiddleware:
+    """
+    Innermost middleware measuring the view itself for RequestMetricsMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with _timed('view_time'):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with _timed('view_time'):
+            return await self.get_response(request)
+
+
+class SlowQueryLogMiddleware:
+    """
+    Logs SQL statements slower than SLOW_QUERY_MS (with their EXPLAIN plans when
+    SLOW_QUERY_EXPLAIN is on). Does nothing while SLOW_QUERY_MS is 0.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.SLOW_QUERY_MS:
+            return self.get_response(request)
+
+        token = _slow_query_request.set(request)
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, _slow_query_wrapper)
+                return self.get_response(request)
+        finally:
+            _slow_query_request.reset(token)
+
+    async def __acall__(self, request):
+        if not settings.SLOW_QUERY_MS:
+            return await self.get_response(request)
+
+        token = _slow_query_request.set(request)
+        try:
+            async with _awrapped_connections(_slow_query_wrapper):
+                return await self.get_response(request)
+        finally:
+            _slow_query_request.reset(token)
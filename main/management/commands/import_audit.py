@@ -0,0 +1,159 @@
+"""
+Import-time audit of a worker's startup.
+
+Starts a fresh Python process with -X importtime that does what a Gunicorn
+worker does before it can serve its first request: load the WSGI application
+(settings, apps, models and middleware) and then the URLconf (every view module
+and what they import). The command reports how long each phase took, the
+import time per top-level package, and the slowest modules with the module that
+first imported them, which is where an import can be deferred.
+
+    python manage.py import_audit
+    python manage.py import_audit --runs 5 --top 40
+    python manage.py import_audit --json > startup.json
+    python manage.py import_audit --max-ms 600
+
+The audit runs with the current environment, so DB_ENGINE and the other
+settings variables change what is imported the same way they do for a worker.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Modules a worker should not import before its first request; each is loaded by
+# the code path that needs it instead
+DEFERRED_MODULES = {
+    'PIL': 'only validating an uploaded image needs Pillow',
+    'pymysql': 'only loaded when DB_ENGINE is a MySQL backend',
+    'pstats': 'only needed when a profile is saved',
+}
+
+# Run in the child process: time both startup phases and print them as JSON on stdout
+BOOT_SCRIPT = '''
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petrescue.settings')
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+application_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urlconf_done = time.perf_counter()
+print(json.dumps({
+    'application_ms': (application_done - start) * 1000,
+    'urlconf_ms': (urlconf_done - application_done) * 1000,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(output):
+    """
+    Parse -X importtime output into a list of dicts with the module name, its own
+    and cumulative import time in milliseconds, and the module that imported it.
+    """
+    entries, pending = [], []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entry = {
+            'module': name.strip(),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'imported_by': None,
+        }
+        # A module is printed after everything it imported, one level deeper
+        while pending and pending[-1][0] > depth:
+            pending.pop()[1]['imported_by'] = entry['module']
+        pending.append((depth, entry))
+        entries.append(entry)
+    return entries
+
+
+class Command(BaseCommand):
+    help = 'Report the import time of a worker startup (-X importtime) by package and module'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Startups to time; the run with the median total is reported (default: 3)')
+        parser.add_argument('--top', type=int, default=25, help='Slowest modules to list (default: 25)')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+        parser.add_argument('--max-ms', type=float, default=None,
+                            help='Fail when the startup takes longer than this many milliseconds')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        runs = sorted((self.run_startup() for _ in range(options['runs'])), key=lambda run: run['total_ms'])
+        report = runs[len(runs) // 2]
+        report['total_ms_runs'] = [round(run['total_ms'], 1) for run in runs]
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report, options['top'])
+
+        if options['max_ms'] is not None and report['total_ms'] > options['max_ms']:
+            raise CommandError(f"Startup took {report['total_ms']:.0f} ms, over the {options['max_ms']:.0f} ms budget")
+
+    def run_startup(self):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'petrescue.settings')},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        entries = parse_importtime(result.stderr)
+
+        packages = {}
+        for entry in entries:
+            package = entry['module'].split('.')[0]
+            packages[package] = packages.get(package, 0) + entry['self_ms']
+        loaded = {module.split('.')[0] for module in timings['modules']}
+        deferred = set(DEFERRED_MODULES)
+        if any('mysql' in database['ENGINE'] for database in settings.DATABASES.values()):
+            deferred.discard('pymysql')
+        return {
+            'total_ms': timings['application_ms'] + timings['urlconf_ms'],
+            'application_ms': timings['application_ms'],
+            'urlconf_ms': timings['urlconf_ms'],
+            'import_ms': sum(entry['self_ms'] for entry in entries),
+            'module_count': len(entries),
+            'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+            'modules': sorted(entries, key=lambda entry: entry['cumulative_ms'], reverse=True),
+            'deferred_modules_loaded': sorted(loaded & deferred),
+        }
+
+    def print_report(self, report, top):
+        self.stdout.write(
+            f"Startup: {report['total_ms']:.0f} ms (application {report['application_ms']:.0f} ms, "
+            f"URLconf {report['urlconf_ms']:.0f} ms); runs: {', '.join(map(str, report['total_ms_runs']))} ms"
+        )
+        self.stdout.write(f"Imports: {report['module_count']} modules, {report['import_ms']:.0f} ms in total")
+
+        self.stdout.write('\nImport time by package (own time of its modules):')
+        for package, milliseconds in list(report['packages'].items())[:15]:
+            self.stdout.write(f'  {milliseconds:8.1f} ms  {package}')
+
+        self.stdout.write(f'\nSlowest {top} modules (cumulative time, including what they import):')
+        for entry in report['modules'][:top]:
+            imported_by = f"  <- {entry['imported_by']}" if entry['imported_by'] else ''
+            self.stdout.write(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}{imported_by}")
+
+        if report['deferred_modules_loaded']:
+            self.stdout.write('')
+            for module in report['deferred_modules_loaded']:
+                self.stdout.write(self.style.WARNING(
+                    f'{module} was imported at startup, but {DEFERRED_MODULES[module]}'
+                ))
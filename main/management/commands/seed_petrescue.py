@@ -0,0 +1,371 @@
+"""
+Synthetic data generator for load testing.
+
+Generates users (with profiles), pets of every type, a request per pet in every
+status, activity logs, pet images, admin notifications and contact submissions.
+The same --seed and options always produce the same rows.
+
+Rows are built as plain tuples one batch of pets at a time and written with
+cursor.executemany, one transaction per batch. Building model instances and
+compiling an INSERT per row through bulk_create costs several times more than the
+database work itself at this volume. Primary keys are assigned up front so related
+rows can point at them on every database backend. No model signals run, so the
+command creates profiles itself and bumps the public page cache version at the end.
+
+    python manage.py seed_petrescue --users 10000 --pets 1000000 --seed 7
+    python manage.py seed_petrescue --pet-types dog=6,cat=3,other=1 --request-statuses pending=1,accepted=1
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from main.caching import bump_page_cache_version
+
+# Password shared by every generated user (hashed once, since hashing is slow by design)
+SEED_PASSWORD = 'petrescue-seed'
+
+BREEDS = {
+    'dog': ['Labrador', 'German Shepherd', 'Golden Retriever', 'French Bulldog', 'Beagle',
+            'Poodle', 'Siberian Husky', 'Dachshund', 'Boxer', 'Mixed Breed'],
+    'cat': ['Domestic Shorthair', 'Siamese', 'Maine Coon', 'Persian', 'Bengal', 'Ragdoll'],
+    'bird': ['Budgerigar', 'Cockatiel', 'African Grey', 'Canary', 'Lovebird'],
+    'rabbit': ['Holland Lop', 'Netherland Dwarf', 'Lionhead', 'Flemish Giant'],
+    'other': ['Guinea Pig', 'Hamster', 'Ferret', 'Tortoise'],
+}
+COLORS = ['Black', 'White', 'Brown', 'Golden', 'Grey', 'Orange', 'Cream', 'Black and White', 'Tabby', 'Spotted']
+STREETS = ['Park Avenue', 'Main Street', 'Oak Road', 'Maple Drive', 'River Lane', 'Station Road', 'Hill Street']
+AREAS = ['Downtown', 'Riverside', 'Westfield', 'Northgate', 'Lakeside', 'Old Town', 'Greenwood', 'Harbor']
+DESCRIPTIONS = [
+    'Friendly and wearing a blue collar.',
+    'Very shy, please approach slowly.',
+    'Has a small scar above the left eye.',
+    'Microchipped, answers to their name.',
+    'Seen near the playground in the evening.',
+    '',
+]
+SUBJECTS = {
+    'general': ['Volunteering', 'Question about adoption', 'Partnership enquiry'],
+    'issue_report': ['Incorrect pet details', 'Possible sighting', 'Duplicate report'],
+    'support': ['Cannot log in', 'Cannot upload photo', 'Delete my account'],
+}
+
+REQUEST_TYPE_FOR_STATUS = {'lost': 'lost', 'found': 'found', 'adoptable': 'adoption'}
+NOTIFICATION_TYPE_FOR_REQUEST = {'lost': 'lost_report', 'found': 'found_report'}
+NOTIFICATION_TYPE_FOR_SUBMISSION = {'issue_report': 'issue_report'}
+
+
+def parse_distribution(value, choices=None):
+    """
+    Parse "key=weight,key=weight" into a {key: weight} dict.
+    Keys are checked against choices, and integer keys (counts) are converted to int.
+    """
+    distribution = {}
+    for part in value.split(','):
+        key, separator, weight = part.strip().partition('=')
+        try:
+            weight = float(weight)
+        except ValueError:
+            weight = -1
+        if not separator or weight < 0:
+            raise CommandError(f'Invalid distribution entry "{part}", expected key=weight')
+        if choices is None:
+            if not key.isdigit():
+                raise CommandError(f'Invalid count "{key}" in distribution "{value}"')
+            key = int(key)
+        elif key not in choices:
+            raise CommandError(f'Unknown value "{key}", expected one of: {", ".join(choices)}')
+        distribution[key] = weight
+    if not sum(distribution.values()):
+        raise CommandError(f'Distribution "{value}" has no positive weight')
+    return distribution
+
+
+class Sampler:
+    """Weighted random choice from a distribution, drawing from a shared Random."""
+
+    def __init__(self, rng, distribution):
+        self.rng = rng
+        self.values = list(distribution)
+        weights = list(distribution.values())
+        self.cum_weights = [sum(weights[:index + 1]) for index in range(len(weights))]
+
+    def __call__(self):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+class IdAllocator:
+    """Hands out primary keys above the current maximum of each model."""
+
+    def __init__(self):
+        self.next_ids = {}
+
+    def __call__(self, model_class, count=1):
+        if model_class not in self.next_ids:
+            current = model_class.objects.aggregate(latest=Max('pk'))['latest'] or 0
+            self.next_ids[model_class] = current + 1
+        first = self.next_ids[model_class]
+        self.next_ids[model_class] += count
+        return first
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic dataset for load testing'
+
+    # Notification columns shared by report and contact submission notifications
+    NOTIFICATION_FIELDS = [
+        'request', 'contact_submission', 'message', 'created_at', 'is_read', 'notification_type', 'updated_at',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+        parser.add_argument('--users', type=int, default=1000, help='Number of users (default: 1000)')
+        parser.add_argument('--pets', type=int, default=10000, help='Number of pets (default: 10000)')
+        parser.add_argument('--submissions', type=int, default=None,
+                            help='Number of contact submissions (default: pets / 10)')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Spread creation times over this many past days (default: 365)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Pets generated and inserted per transaction (default: 5000)')
+        parser.add_argument('--prefix', default='seed',
+                            help='Prefix for generated usernames and emails (default: seed)')
+        parser.add_argument('--pet-types', default='dog=50,cat=30,bird=8,rabbit=7,other=5',
+                            help='Pet type weights')
+        parser.add_argument('--pet-statuses', default='lost=45,found=45,adoptable=10',
+                            help='Pet status weights')
+        parser.add_argument('--request-statuses', default='pending=30,accepted=60,rejected=10',
+                            help='Request status weights')
+        parser.add_argument('--images-per-pet', default='0=40,1=30,2=20,3=10',
+                            help='Weights of the number of PetImage rows per pet')
+        parser.add_argument('--activities-per-pet', default='1=50,2=30,3=15,5=5',
+                            help='Weights of the number of ActivityLog rows per pet')
+        parser.add_argument('--submission-types', default='general=50,issue_report=35,support=15',
+                            help='Contact submission type weights')
+        parser.add_argument('--submission-statuses', default='pending=40,reviewed=40,closed=20',
+                            help='Contact submission status weights')
+        parser.add_argument('--read-notifications', type=float, default=0.8,
+                            help='Share of notifications already marked read (default: 0.8)')
+
+    def handle(self, *args, **options):
+        self.User = apps.get_model('main', 'User')
+        self.Profile = apps.get_model('main', 'Profile')
+        self.Pet = apps.get_model('main', 'Pet')
+        self.Request = apps.get_model('main', 'Request')
+        self.ActivityLog = apps.get_model('main', 'ActivityLog')
+        self.PetImage = apps.get_model('main', 'PetImage')
+        self.Notification = apps.get_model('main', 'Notification')
+        self.ContactSubmission = apps.get_model('main', 'ContactSubmission')
+
+        if options['users'] < 1 or options['pets'] < 0 or options['batch_size'] < 1 or options['days'] < 1:
+            raise CommandError('--users, --batch-size and --days must be positive and --pets must not be negative')
+        if not 0 <= options['read_notifications'] <= 1:
+            raise CommandError('--read-notifications must be between 0 and 1')
+        if self.User.objects.filter(username__startswith=f"{options['prefix']}_user_").exists():
+            raise CommandError(
+                f"Users named {options['prefix']}_user_* already exist; choose another --prefix"
+            )
+
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.allocate_ids = IdAllocator()
+        self.samplers = {
+            'pet_type': Sampler(self.rng, parse_distribution(options['pet_types'], dict(self.Pet.PET_TYPES))),
+            'pet_status': Sampler(self.rng, parse_distribution(options['pet_statuses'], dict(self.Pet.PET_STATUS_CHOICES))),
+            'request_status': Sampler(self.rng, parse_distribution(options['request_statuses'], dict(self.Request.STATUS_CHOICES))),
+            'images': Sampler(self.rng, parse_distribution(options['images_per_pet'])),
+            'activities': Sampler(self.rng, parse_distribution(options['activities_per_pet'])),
+            'submission_type': Sampler(self.rng, parse_distribution(options['submission_types'], dict(self.ContactSubmission.SUBMISSION_TYPES))),
+            'submission_status': Sampler(self.rng, parse_distribution(options['submission_statuses'], dict(self.ContactSubmission.STATUS_CHOICES))),
+        }
+        submissions = options['submissions']
+        if submissions is None:
+            submissions = options['pets'] // 10
+
+        started = time.perf_counter()
+        self.counts = dict.fromkeys(
+            ['users', 'profiles', 'pets', 'requests', 'activity logs', 'pet images',
+             'notifications', 'contact submissions'], 0
+        )
+        self.users = self.create_users(options['users'])
+        self.pet_ids = []
+        for offset in range(0, options['pets'], options['batch_size']):
+            self.create_pets(min(options['batch_size'], options['pets'] - offset))
+            self.report_progress('pets', options['pets'], started)
+        for offset in range(0, submissions, options['batch_size']):
+            self.create_submissions(min(options['batch_size'], submissions - offset))
+
+        self.reset_sequences()
+        bump_page_cache_version()
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {total} rows in {elapsed:.1f}s ({total / max(elapsed, 0.001):.0f} rows/s)'
+        ))
+        for name, count in self.counts.items():
+            self.stdout.write(f'  {name}: {count}')
+        self.stdout.write(f"Generated users log in with password \"{SEED_PASSWORD}\"")
+
+    def report_progress(self, name, total, started):
+        if self.options['verbosity'] >= 2:
+            self.stdout.write(f'  {self.counts[name]}/{total} {name} ({time.perf_counter() - started:.1f}s)')
+
+    def random_time(self, after=None):
+        """Return a random time in the seeded window, later than `after` when given."""
+        start = after or self.now - timedelta(days=self.options['days'])
+        span = max((self.now - start).total_seconds(), 0)
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def insert(self, model_class, field_names, rows, count_name):
+        """INSERT rows (tuples of database-ready values for field_names) with executemany."""
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(model_class._meta.get_field(name).column) for name in field_names)
+        placeholders = ', '.join(['%s'] * len(field_names))
+        sql = f'INSERT INTO {quote_name(model_class._meta.db_table)} ({columns}) VALUES ({placeholders})'
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        self.counts[count_name] += len(rows)
+
+    def create_users(self, count):
+        adapt_time = connection.ops.adapt_datetimefield_value
+        password = make_password(SEED_PASSWORD)
+        prefix = self.options['prefix']
+        first_id = self.allocate_ids(self.User, count)
+        first_profile_id = self.allocate_ids(self.Profile, count)
+        users, user_rows, profile_rows = [], [], []
+        for index in range(count):
+            user_id = first_id + index
+            username = f'{prefix}_user_{index}'
+            phone_number = f'9{user_id:011d}' if self.rng.random() < 0.7 else None
+            joined = self.random_time()
+            users.append((user_id, username, phone_number, joined))
+            user_rows.append((
+                user_id, password, adapt_time(self.random_time(after=joined)), False, username,
+                f'Seed{index}', '', f'{username}@example.com', False, True, adapt_time(joined), phone_number,
+            ))
+            profile_rows.append((first_profile_id + index, user_id, '', self.rng.choice(AREAS)))
+
+        with transaction.atomic():
+            self.insert(self.User, [
+                'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name',
+                'email', 'is_staff', 'is_active', 'date_joined', 'phone_number',
+            ], user_rows, 'users')
+            self.insert(self.Profile, ['id', 'user', 'bio', 'location'], profile_rows, 'profiles')
+        return users
+
+    def create_pets(self, count):
+        rng = self.rng
+        adapt_time = connection.ops.adapt_datetimefield_value
+        pet_rows, request_rows, activity_rows, image_rows, notification_rows = [], [], [], [], []
+        first_pet_id = self.allocate_ids(self.Pet, count)
+        first_request_id = self.allocate_ids(self.Request, count)
+
+        for index in range(count):
+            pet_id = first_pet_id + index
+            request_id = first_request_id + index
+            owner_id, owner_username, owner_phone, owner_joined = rng.choice(self.users)
+            pet_type = self.samplers['pet_type']()
+            status = self.samplers['pet_status']()
+            location = f'{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(AREAS)}'
+            created_at = self.random_time(after=owner_joined)
+            created_value = adapt_time(created_at)
+            pet_rows.append((
+                pet_id, owner_id, pet_type, rng.choice(BREEDS[pet_type]), rng.choice(COLORS), location,
+                rng.choice(DESCRIPTIONS), '', status, created_value, adapt_time(self.random_time(after=created_at)),
+            ))
+
+            request_type = REQUEST_TYPE_FOR_STATUS[status]
+            request_rows.append((
+                request_id, owner_id, pet_id, request_type, owner_phone or '5550000000',
+                f'{status.title()} {pet_type} near {location}', self.samplers['request_status'](), created_value,
+            ))
+
+            for activity_index in range(self.samplers['activities']()):
+                if activity_index == 0:
+                    activity_type, actor, timestamp = 'created', f'user-{owner_username}', created_value
+                else:
+                    activity_type = rng.choice(['edited', 'status_changed'])
+                    actor = 'admin-seed' if activity_type == 'status_changed' else f'user-{owner_username}'
+                    timestamp = adapt_time(self.random_time(after=created_at))
+                details = f'{activity_type.replace("_", " ").capitalize()} by {actor}'
+                activity_rows.append((pet_id, activity_type, timestamp, actor, details))
+
+            for image_index in range(self.samplers['images']()):
+                image_rows.append((pet_id, f'pet_images/seed/{pet_type}_{image_index}.jpg', created_value))
+
+            notification_type = NOTIFICATION_TYPE_FOR_REQUEST.get(request_type)
+            if notification_type:
+                notification_rows.append((
+                    request_id, None,
+                    f'New {request_type} pet report submitted by {owner_username} for a {pet_type} near {location}',
+                    created_value, rng.random() < self.options['read_notifications'], notification_type,
+                    created_value,
+                ))
+
+        with transaction.atomic():
+            self.insert(self.Pet, [
+                'id', 'owner', 'pet_type', 'breed', 'color', 'location', 'description', 'image', 'status',
+                'created_at', 'updated_at',
+            ], pet_rows, 'pets')
+            self.insert(self.Request, [
+                'id', 'user', 'pet', 'request_type', 'phone_number', 'message', 'status', 'created_at',
+            ], request_rows, 'requests')
+            self.insert(self.ActivityLog, ['pet', 'activity_type', 'timestamp', 'actor', 'details'],
+                        activity_rows, 'activity logs')
+            self.insert(self.PetImage, ['pet', 'image', 'uploaded_at'], image_rows, 'pet images')
+            self.insert(self.Notification, self.NOTIFICATION_FIELDS, notification_rows, 'notifications')
+        self.pet_ids.extend(range(first_pet_id, first_pet_id + count))
+
+    def create_submissions(self, count):
+        rng = self.rng
+        adapt_time = connection.ops.adapt_datetimefield_value
+        type_labels = dict(self.ContactSubmission.SUBMISSION_TYPES)
+        submission_rows, notification_rows = [], []
+        first_id = self.allocate_ids(self.ContactSubmission, count)
+        for index in range(count):
+            submission_id = first_id + index
+            submission_type = self.samplers['submission_type']()
+            user = rng.choice(self.users) if rng.random() < 0.6 else None
+            name = user[1] if user else f'Visitor {index}'
+            related_pet_id = None
+            if submission_type == 'issue_report' and self.pet_ids:
+                related_pet_id = rng.choice(self.pet_ids)
+            created_at = self.random_time()
+            created_value = adapt_time(created_at)
+            submission_rows.append((
+                submission_id, name, f'{user[1]}@example.com' if user else f'visitor_{index}@example.com',
+                rng.choice(SUBJECTS[submission_type]), rng.choice(DESCRIPTIONS) or 'Please get in touch.',
+                submission_type, related_pet_id, user[0] if user else None,
+                self.samplers['submission_status'](), created_value,
+                adapt_time(self.random_time(after=created_at)),
+            ))
+            notification_rows.append((
+                None, submission_id, f'New {type_labels[submission_type].lower()} from {name}',
+                created_value, rng.random() < self.options['read_notifications'],
+                NOTIFICATION_TYPE_FOR_SUBMISSION.get(submission_type, 'contact_submission'), created_value,
+            ))
+
+        with transaction.atomic():
+            self.insert(self.ContactSubmission, [
+                'id', 'name', 'email', 'subject', 'message', 'submission_type', 'related_pet', 'user',
+                'status', 'created_at', 'updated_at',
+            ], submission_rows, 'contact submissions')
+            self.insert(self.Notification, self.NOTIFICATION_FIELDS, notification_rows, 'notifications')
+
+    def reset_sequences(self):
+        """Move database sequences past the explicitly assigned primary keys (PostgreSQL, Oracle)."""
+        model_classes = [self.User, self.Profile, self.Pet, self.Request, self.ContactSubmission]
+        statements = connection.ops.sequence_reset_sql(no_style(), model_classes)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:40
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing rows have not changed since they were created."""
+    Pet = apps.get_model('main', 'Pet')
+    Notification = apps.get_model('main', 'Notification')
+    Pet.objects.update(updated_at=F('created_at'))
+    Notification.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_petimage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='When this notification was last updated'),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='When this pet record was last updated'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
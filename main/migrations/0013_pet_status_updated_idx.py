@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_pet_updated_at_notification_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['status', 'updated_at'], name='pet_status_updated_idx'),
+        ),
+    ]
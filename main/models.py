@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.conf import settings
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -16,6 +17,12 @@ class User(AbstractUser):
     """
     phone_number = models.CharField(max_length=15, unique=True, null=True, blank=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves case-insensitive email lookups (validate_email) on LOWER(email)
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -74,9 +81,26 @@ class Pet(models.Model):
                              help_text="Current status of the pet")
     created_at = models.DateTimeField(auto_now_add=True, 
                                      help_text="When this pet record was created")
+    updated_at = models.DateTimeField(auto_now=True,
+                                     help_text="When this pet record was last updated")
+
+    class Meta:
+        indexes = [
+            # Serves the "Most recently updated" sort and incremental sync queries
+            models.Index(fields=['status', 'updated_at'], name='pet_status_updated_idx'),
+            # Lets the all pets listing read MAX(updated_at) for Last-Modified from the index
+            models.Index(fields=['updated_at'], name='pet_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.pet_type} - {self.breed} ({self.status})"
+
+    def touch(self):
+        """
+        Mark the pet as updated without rewriting its other fields.
+        Used when a related record (such as its request status) changes.
+        """
+        self.save(update_fields=['updated_at'])
     
     def calculate_distance(self, other_location):
         """
@@ -191,6 +215,8 @@ class Notification(models.Model):
                                  help_text="Whether this notification has been read")
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES,
                                        help_text="Type of notification")
+    updated_at = models.DateTimeField(auto_now=True,
+                                    help_text="When this notification was last updated")
     
     class Meta:
         ordering = ['-created_at']  # Latest first
@@ -205,7 +231,9 @@ class Notification(models.Model):
 
 
 # Signal Handlers
-# Automatically create and save user profiles when users are created/updated
+# Automatically create a profile for each new user. The profile is not saved again
+# when the user is: it is edited and saved through its own form, and every login
+# saves the user to update last_login.
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -213,18 +241,7 @@ def create_user_profile(sender, instance, created, **kwargs):
     Automatically creates a profile for new users.
     """
     if created:
-        from django.apps import apps
-        ProfileModel = apps.get_model('main', 'Profile')
-        ProfileModel.objects.create(user=instance)
-
-
-@receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def save_user_profile(sender, instance, **kwargs):
-    """
-    Automatically saves the user's profile when the user is saved.
-    """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+        Profile.objects.create(user=instance)
 
 
 # Contact Submission Model
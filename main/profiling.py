@@ -0,0 +1,181 @@
+"""
+On-demand request profiling for the PetRescue application.
+
+A superuser adds ?profile=1 to any URL (or sends an "X-Profile: 1" header) and
+ProfilingMiddleware runs that single request under cProfile. The profile is
+saved to REQUEST_PROFILE_DIR as a .prof file, next to a .json file holding the
+request details and the slowest functions. The response carries the capture
+name in an X-Profile-Id header.
+
+admin_profiles (see views.py) lists the recent captures for download. A .prof
+file opens with `python -m pstats`, snakeviz, or flameprof (for a flame graph).
+Only the newest REQUEST_PROFILE_KEEP captures are kept.
+
+Other requests pay for one query parameter and one header lookup. With
+REQUEST_PROFILING=False the middleware removes itself at startup.
+"""
+
+import cProfile
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Query parameter and header that request a profile
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_HEADER = 'X-Profile'
+
+# Functions listed in a capture's summary
+SUMMARY_FUNCTIONS = 15
+
+# Capture file names: <UTC timestamp>-<url name>.prof
+PROFILE_NAME_PATTERN = re.compile(r'^\d{8}-\d{6}-\d{6}-[\w-]+\.prof$')
+
+
+def profile_requested(request):
+    return request.GET.get(PROFILE_QUERY_PARAM) == '1' or request.headers.get(PROFILE_HEADER) == '1'
+
+
+def profile_path(name):
+    """Return the path of a capture, or None when the name is not a valid capture name."""
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    return os.path.join(settings.REQUEST_PROFILE_DIR, name)
+
+
+def _summarize(profiler):
+    """Return the functions with the highest cumulative time as a list of dicts."""
+    # Imported here so workers only load pstats once a profile is saved
+    import pstats
+
+    stats = pstats.Stats(profiler).stats
+    top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:SUMMARY_FUNCTIONS]
+    return [
+        {
+            'function': pstats.func_std_string(function),
+            'calls': total_calls,
+            'own_ms': round(own_time * 1000, 3),
+            'cumulative_ms': round(cumulative_time * 1000, 3),
+        }
+        for function, (_, total_calls, own_time, cumulative_time, _) in top
+    ]
+
+
+def save_profile(profiler, request, response, duration):
+    """Write the .prof file and its .json details, prune old captures, and return the capture name."""
+    os.makedirs(settings.REQUEST_PROFILE_DIR, exist_ok=True)
+    now = datetime.now(dt_timezone.utc)
+    match = getattr(request, 'resolver_match', None)
+    view = re.sub(r'[^\w-]', '_', match.url_name) if match and match.url_name else 'unmatched'
+    name = f'{now:%Y%m%d-%H%M%S-%f}-{view}.prof'
+    path = profile_path(name)
+
+    profiler.dump_stats(path)
+    details = {
+        'name': name,
+        'created': now.isoformat(),
+        'view': view,
+        'method': request.method,
+        'path': request.path,
+        'query': request.GET.urlencode(),
+        'user': request.user.get_username(),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 3),
+        'functions': _summarize(profiler),
+    }
+    with open(path[:-len('.prof')] + '.json', 'w') as details_file:
+        json.dump(details, details_file)
+    _prune()
+    return name
+
+
+def list_profiles():
+    """Return the details of the saved captures, newest first."""
+    try:
+        names = os.listdir(settings.REQUEST_PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    captures = []
+    for name in sorted(names, reverse=True):
+        if not PROFILE_NAME_PATTERN.match(name):
+            continue
+        try:
+            with open(profile_path(name)[:-len('.prof')] + '.json') as details_file:
+                captures.append(json.load(details_file))
+        except (OSError, ValueError):
+            captures.append({'name': name})
+    return captures
+
+
+def _prune():
+    names = sorted(
+        (name for name in os.listdir(settings.REQUEST_PROFILE_DIR) if PROFILE_NAME_PATTERN.match(name)),
+        reverse=True,
+    )
+    for name in names[settings.REQUEST_PROFILE_KEEP:]:
+        path = profile_path(name)
+        for stale in (path, path[:-len('.prof')] + '.json'):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests for superusers who ask for it with ?profile=1 or an X-Profile header.
+    Must come after AuthenticationMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not (profile_requested(request) and request.user.is_superuser):
+            return self.get_response(request)
+
+        # Bypass the public page cache so the profile shows the view's real work
+        request.profiling = True
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        response['X-Profile-Id'] = save_profile(profiler, request, response, duration)
+        return response
+
+    async def __acall__(self, request):
+        if not (profile_requested(request) and (await request.auser()).is_superuser):
+            return await self.get_response(request)
+
+        # Under ASGI the profiler sees the event loop thread only: ORM calls show as
+        # awaits, and other requests handled meanwhile are included
+        request.profiling = True
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        response['X-Profile-Id'] = await sync_to_async(save_profile)(profiler, request, response, duration)
+        return response
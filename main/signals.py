@@ -1,9 +1,56 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import Profile
+from .caching import bump_page_cache_version, email_taken_cache_key
+from .models import ContactSubmission, Profile, Pet, Request, PetImage
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+# Public page cache invalidation
+# Any change to a pet, its request or its images can alter the cached listings
+
+@receiver([post_save, post_delete], sender=Pet)
+@receiver([post_save, post_delete], sender=Request)
+@receiver([post_save, post_delete], sender=PetImage)
+def invalidate_public_page_cache(sender, **kwargs):
+    bump_page_cache_version()
+
+
+# Admin notification validators
+# The ETag of the notification APIs is built from the newest updated_at, which a deletion
+# usually leaves unchanged, so deletions move the version folded into it instead.
+# Notifications are only deleted with their request (which bumps it above) or their
+# contact submission; no receiver on Notification keeps its cascade a single DELETE.
+
+@receiver(post_delete, sender=ContactSubmission)
+def invalidate_admin_notification_validators(sender, **kwargs):
+    bump_page_cache_version()
+
+
+# validate_email answer invalidation
+# A newly registered or deleted address must not keep its cached answer until it expires,
+# and neither must the address a user changes away from, which is free again
+
+def _saves_email(update_fields):
+    return update_fields is None or 'email' in update_fields  # not e.g. the last_login update on login
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_previous_email(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is not None and _saves_email(update_fields):
+        instance._previous_email = sender.objects.filter(pk=instance.pk).values_list('email', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_email_taken_cache(sender, instance, update_fields=None, **kwargs):
+    if not _saves_email(update_fields):
+        return
+    previous_email = getattr(instance, '_previous_email', None)
+    for email in {instance.email, previous_email} - {None, ''}:
+        cache.delete(email_taken_cache_key(email))
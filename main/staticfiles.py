@@ -0,0 +1,69 @@
+"""
+Static file serving for the PetRescue application.
+
+WhiteNoiseMiddleware from the whitenoise package only runs synchronously. Under
+ASGI, Django would then call every request through a thread and run async views
+via async_to_sync, so one slow client would again hold one thread. This subclass
+serves static files the same way and passes every other request on natively in
+either mode.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import StreamingHttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+# Bytes read from a static file per thread hop when streaming it asynchronously
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Looks the file up on disk through the staticfiles finders
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await self.aserve(static_file, request)
+        return await self.get_response(request)
+
+    @staticmethod
+    async def aserve(static_file, request):
+        """
+        Async version of serve(). WhiteNoise opens the file in a thread, and the body
+        is an async iterator reading it in threads too, so the event loop never waits on
+        disk and Django's ASGI handler streams the file instead of buffering it whole.
+        """
+        response = await sync_to_async(static_file.get_response, thread_sensitive=False)(
+            request.method, request.META
+        )
+        http_response = StreamingHttpResponse(_read_file(response.file), status=int(response.status))
+        # Remove the default content type; WhiteNoise sends its own headers
+        del http_response['Content-Type']
+        for key, value in response.headers:
+            http_response[key] = value
+        return http_response
+
+
+async def _read_file(file):
+    if file is None:
+        return
+    read = sync_to_async(file.read, thread_sensitive=False)
+    try:
+        while chunk := await read(STREAM_BLOCK_SIZE):
+            yield chunk
+    finally:
+        file.close()
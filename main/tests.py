@@ -1,7 +1,41 @@
-from django.test import TestCase, Client
+import base64
+import json
+import os
+import runpy
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.http import HttpResponse
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.apps import apps
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.templatetags.static import static
+from django.db import connection
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from main.caching import get_or_refresh, page_cache_key
+from main.instrumentation import explain, registry as metrics_registry
+from main.throttling import parse_rate
+from main.views import FIND_PETS_RESULT_LIMIT, PERSONAL_SLOT_TEMPLATES as PERSONAL_SLOTS
+from petrescue.db.replica import (
+    PRIMARY_STICKY_COOKIE,
+    PrimaryReplicaRouter,
+    ReplicaStickinessMiddleware,
+    read_from_replica,
+)
+from petrescue.db.mysql_pool.pool import ConnectionPool
+from petrescue.db.sqlite import tuned_sqlite_options
 
 User = get_user_model()
 
@@ -144,4 +178,1277 @@ class AdminDashboardTestCase(TestCase):
         """Test that login page loads successfully"""
         response = self.client.get(reverse('login'))
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "Login")
\ No newline at end of file
+        self.assertContains(response, "Login")
+
+class PublicPageCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.client = Client()
+
+    def _create_accepted_pet(self, breed):
+        PetModel = apps.get_model('main', 'Pet')
+        RequestModel = apps.get_model('main', 'Request')
+        pet = PetModel.objects.create(
+            owner=self.user,
+            pet_type='cat',
+            breed=breed,
+            color='Black',
+            location='Riverside',
+            status='lost'
+        )
+        RequestModel.objects.create(
+            user=self.user,
+            pet=pet,
+            request_type='lost',
+            phone_number='5551234567',
+            status='accepted'
+        )
+        return pet
+
+    def test_anonymous_home_page_is_served_from_cache(self):
+        """Test that a repeated anonymous home page request runs no queries"""
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_pet_save_invalidates_cached_pages(self):
+        """Test that saving a pet makes cached listings show the change"""
+        self.client.get(reverse('all_pets'))
+        self._create_accepted_pet('Maine Coon')
+        response = self.client.get(reverse('all_pets'))
+        self.assertContains(response, 'Maine Coon')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Maine Coon')
+
+    def test_public_shell_is_shared_and_skips_session(self):
+        """Test that logged-in users get the same cached shell without a session lookup"""
+        anonymous_response = self.client.get(reverse('all_pets'))
+        self.client.login(username='owner', password='ownerpass123')
+        response = self.client.get(reverse('all_pets'))
+        self.assertEqual(response.content, anonymous_response.content)
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_personalization_endpoint_returns_user_fragments(self):
+        """Test that the personalization endpoint renders the user's navigation"""
+        self.client.login(username='owner', password='ownerpass123')
+        response = self.client.get(reverse('api_personalization'), {'slots': 'nav_items,unknown'})
+        data = response.json()
+        self.assertTrue(data['is_authenticated'])
+        self.assertIn('My Profile', data['slots']['nav_items'])
+        self.assertNotIn('unknown', data['slots'])
+
+    def test_personalization_shows_contact_info_to_reporter(self):
+        """Test that pet contact details are only sent to the reporter"""
+        pet = self._create_accepted_pet('Persian')
+        params = {'slots': 'pet_contact_info', 'pet': pet.id}
+        response = self.client.get(reverse('api_personalization'), params)
+        self.assertNotIn('5551234567', response.json()['slots']['pet_contact_info'])
+
+        self.client.login(username='owner', password='ownerpass123')
+        response = self.client.get(reverse('api_personalization'), params)
+        self.assertIn('5551234567', response.json()['slots']['pet_contact_info'])
+
+    def test_stale_page_served_while_another_worker_refreshes(self):
+        """Test that a stale page is served while the refresh lock is held elsewhere"""
+        response = self.client.get(reverse('all_pets'))
+        self._create_accepted_pet('Siamese')
+
+        # Simulate another worker holding the refresh lock
+        lock_key = f"{page_cache_key(response.wsgi_request)}:lock"
+        cache.add(lock_key, 1)
+        response = self.client.get(reverse('all_pets'))
+        self.assertNotContains(response, 'Siamese')
+
+        # Once the lock is released the next request refreshes the page
+        cache.delete(lock_key)
+        response = self.client.get(reverse('all_pets'))
+        self.assertContains(response, 'Siamese')
+
+    @override_settings(PAGE_CACHE_LOCK_WAIT=0)
+    def test_get_or_refresh_computes_value_once(self):
+        """Test that a cached result set is only computed once until invalidated"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return ['result']
+
+        self.assertEqual(get_or_refresh('test:results', compute), ['result'])
+        self.assertEqual(get_or_refresh('test:results', compute), ['result'])
+        self.assertEqual(len(calls), 1)
+
+
+class ConditionalRequestTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        PetModel = apps.get_model('main', 'Pet')
+        self.pet = PetModel.objects.create(
+            owner=self.user,
+            pet_type='dog',
+            breed='Beagle',
+            color='Tan',
+            location='Hill Road',
+            status='adoptable'
+        )
+        self.client = Client()
+
+    def test_all_pets_returns_304_when_unchanged(self):
+        """Test that a matching ETag skips rendering the listing"""
+        response = self.client.get(reverse('all_pets'))
+        self.assertIn('public', response['Cache-Control'])
+        etag = response['ETag']
+        response = self.client.get(reverse('all_pets'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_all_pets_validators_follow_the_database(self):
+        """Test that the listing's Last-Modified is read from the index and tracks edits made elsewhere"""
+        with CaptureQueriesContext(connection) as queries:
+            etag = self.client.get(reverse('all_pets'))['ETag']
+        validator_sql = queries[0]['sql']
+        self.assertIn('MAX("main_pet"."updated_at")', validator_sql)
+        self.assertIn('pet_updated_idx', explain(connection, validator_sql, ()))
+
+        # An edit made by another worker bumps no page cache version in this process
+        Pet = apps.get_model('main', 'Pet')
+        Pet.objects.filter(pk=self.pet.pk).update(
+            color='Tricolor', updated_at=self.pet.updated_at + timedelta(seconds=1),
+        )
+        response = self.client.get(reverse('all_pets'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pet_detail_etag_changes_when_pet_is_edited(self):
+        """Test that editing a pet invalidates its detail page validators"""
+        url = reverse('pet_detail', args=[self.pet.id])
+        etag = self.client.get(url)['ETag']
+        self.pet.color = 'Tricolor'
+        self.pet.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Tricolor')
+
+    def test_api_user_requests_returns_304_without_serializing(self):
+        """Test that the dashboard API answers 304 with a single timestamp query"""
+        self.client.login(username='owner', password='ownerpass123')
+        response = self.client.get(reverse('api_user_requests'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        etag = response['ETag']
+        with self.assertNumQueries(3):
+            # Session, user and the last-modified aggregate only
+            response = self.client.get(reverse('api_user_requests'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_api_request_history_changes_after_activity(self):
+        """Test that a new activity log entry invalidates the history ETag"""
+        ActivityLogModel = apps.get_model('main', 'ActivityLog')
+        self.client.login(username='owner', password='ownerpass123')
+        url = reverse('api_request_history', args=[self.pet.id])
+        etag = self.client.get(url)['ETag']
+        ActivityLogModel.objects.create(pet=self.pet, activity_type='edited', actor='user-owner')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['timeline']), 1)
+
+    def test_admin_notifications_etag_changes_after_deletion(self):
+        """Test that deleting a contact submission (and its notification) invalidates the notifications ETag"""
+        ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
+        NotificationModel = apps.get_model('main', 'Notification')
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        older = ContactSubmissionModel.objects.create(
+            name='Visitor', email='visitor@example.com', subject='Hello', message='First question.'
+        )
+        NotificationModel.objects.create(message='New contact submission', notification_type='contact_submission', contact_submission=older)
+        NotificationModel.objects.create(message='New lost pet report', notification_type='lost_report')
+
+        self.client.login(username='admin', password='adminpass123')
+        url = reverse('api_admin_notifications')
+        etag = self.client.get(url)['ETag']
+        older.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 1)
+
+
+class PetUpdatedAtTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+        self.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        PetModel = apps.get_model('main', 'Pet')
+        RequestModel = apps.get_model('main', 'Request')
+        self.pets = []
+        for breed in ['Poodle', 'Boxer']:
+            pet = PetModel.objects.create(
+                owner=self.user,
+                pet_type='dog',
+                breed=breed,
+                color='White',
+                location='Lake View',
+                status='lost'
+            )
+            RequestModel.objects.create(
+                user=self.user,
+                pet=pet,
+                request_type='lost',
+                phone_number='5550001111',
+                status='pending'
+            )
+            self.pets.append(pet)
+        self.client = Client()
+
+    def test_status_change_updates_pet_and_updated_sort(self):
+        """Test that accepting a request bumps updated_at and the updated sort uses it"""
+        poodle = self.pets[0]
+        old_updated_at = poodle.updated_at
+        self.client.login(username='admin', password='adminpass123')
+        for pet in reversed(self.pets):
+            self.client.post(
+                reverse('update_request_status', args=[pet.request_set.get().id]),
+                {'status': 'Accepted'}
+            )
+        poodle.refresh_from_db()
+        self.assertGreater(poodle.updated_at, old_updated_at)
+
+        response = self.client.get(reverse('all_pets'), {'sort': 'updated'})
+        self.assertEqual([pet.breed for pet in response.context['pets']], ['Poodle', 'Boxer'])
+
+    def test_edit_without_changes_keeps_updated_at(self):
+        """Test that saving an unchanged report does not bump updated_at"""
+        boxer = self.pets[1]
+        old_updated_at = boxer.updated_at
+        self.client.login(username='owner', password='ownerpass123')
+        self.client.post(reverse('edit_user_request', args=[boxer.id]), {'breed': 'Boxer'})
+        boxer.refresh_from_db()
+        self.assertEqual(boxer.updated_at, old_updated_at)
+
+
+class SQLiteTuningTestCase(SimpleTestCase):
+    def test_tuned_options_apply_pragmas_on_connect(self):
+        """Test that the SQLite tuning options switch a database file to WAL with the given pragmas"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            wrapper = SQLiteDatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(tmp_dir, 'tuned.sqlite3'),
+                'OPTIONS': tuned_sqlite_options(busy_timeout=2500, cache_size=-1000),
+            }, alias='tuned')
+            try:
+                with wrapper.cursor() as cursor:
+                    pragmas = {}
+                    for name in ['journal_mode', 'synchronous', 'busy_timeout', 'cache_size']:
+                        cursor.execute(f'PRAGMA {name}')
+                        pragmas[name] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+
+        self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 2500, 'cache_size': -1000})
+        self.assertEqual(wrapper.transaction_mode, 'IMMEDIATE')
+
+    def test_invalid_synchronous_mode_is_rejected(self):
+        """Test that an unknown synchronous mode raises an error"""
+        with self.assertRaises(ValueError):
+            tuned_sqlite_options(synchronous='FAST')
+
+
+class FakeConnectionError(Exception):
+    pass
+
+
+class FakeConnection:
+    """Stands in for a DB-API connection: ping() fails once the server has dropped it."""
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def ping(self):
+        if not self.alive:
+            raise FakeConnectionError('server has gone away')
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(size=2, recycle=60, error=FakeConnectionError)
+
+    def test_empty_pool_has_nothing_to_check_out(self):
+        """Test that checking out of an empty pool returns None so a new connection is opened"""
+        self.assertIsNone(self.pool.checkout())
+
+    def test_most_recently_returned_connection_is_reused_first(self):
+        """Test that connections are checked out last in, first out with their creation time"""
+        first, second = FakeConnection(), FakeConnection()
+        created_at = time.monotonic()
+        self.pool.checkin(first, created_at - 1)
+        self.pool.checkin(second, created_at)
+        self.assertEqual(self.pool.checkout(), (second, created_at))
+        self.assertEqual(self.pool.checkout(), (first, created_at - 1))
+        self.assertIsNone(self.pool.checkout())
+        self.assertFalse(first.closed or second.closed)
+
+    def test_connections_beyond_the_pool_size_are_closed(self):
+        """Test that returning a connection to a full pool closes it"""
+        connections = [FakeConnection() for _ in range(3)]
+        for pooled in connections:
+            self.pool.checkin(pooled, time.monotonic())
+        self.assertEqual([pooled.closed for pooled in connections], [False, False, True])
+
+    def test_dead_and_expired_connections_are_discarded(self):
+        """Test that connections failing the ping or older than the recycle age are closed, not reused"""
+        alive, dead, expired = FakeConnection(), FakeConnection(alive=False), FakeConnection()
+        self.pool.checkin(alive, time.monotonic())
+        self.pool.checkin(dead, time.monotonic())
+        self.assertEqual(self.pool.checkout()[0], alive)
+        self.assertTrue(dead.closed)
+
+        self.pool.checkin(expired, time.monotonic() - 61)
+        self.assertIsNone(self.pool.checkout())
+        self.assertTrue(expired.closed)
+
+
+class GunicornCacheBackendTestCase(SimpleTestCase):
+    """Several Gunicorn workers must share one cache, or saves only invalidate one worker's pages."""
+
+    def _load_config(self, **env):
+        with mock.patch.dict(os.environ, env):
+            if 'CACHE_BACKEND' not in env:
+                os.environ.pop('CACHE_BACKEND', None)
+            config = runpy.run_path(os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+            return config, os.environ.get('CACHE_BACKEND')
+
+    def test_several_workers_default_to_the_file_cache(self):
+        """Test that the cache backend defaults to file when more than one worker runs"""
+        _, backend = self._load_config(GUNICORN_WORKERS='3')
+        self.assertEqual(backend, 'file')
+        _, backend = self._load_config(GUNICORN_WORKERS='1')
+        self.assertIsNone(backend)
+        _, backend = self._load_config(GUNICORN_WORKERS='3', CACHE_BACKEND='redis')
+        self.assertEqual(backend, 'redis')
+
+    def test_locmem_is_refused_with_several_workers(self):
+        """Test that an explicit locmem cache is rejected when more than one worker runs"""
+        with self.assertRaisesMessage(RuntimeError, 'CACHE_BACKEND=locmem'):
+            self._load_config(GUNICORN_WORKERS='3', CACHE_BACKEND='locmem')
+        config, _ = self._load_config(GUNICORN_WORKERS='1', CACHE_BACKEND='locmem')
+        self.assertEqual(config['workers'], 1)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaRoutingTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+        self.Pet = apps.get_model('main', 'Pet')
+
+    def _read_alias_view(self):
+        @read_from_replica
+        def view(request):
+            return HttpResponse(self.router.db_for_read(self.Pet))
+        return ReplicaStickinessMiddleware(view)
+
+    def test_public_reads_use_replica(self):
+        """Test that reads inside a read_from_replica view go to the replica"""
+        response = self._read_alias_view()(self.factory.get('/'))
+        self.assertEqual(response.content, b'replica')
+        self.assertEqual(self.router.db_for_read(self.Pet), 'default')
+
+    def test_pinned_browser_reads_from_primary(self):
+        """Test that a browser with the sticky cookie reads from the primary"""
+        request = self.factory.get('/')
+        request.COOKIES[PRIMARY_STICKY_COOKIE] = '1'
+        response = self._read_alias_view()(request)
+        self.assertEqual(response.content, b'default')
+
+    def test_write_pins_browser_to_primary(self):
+        """Test that a request writing to the primary sets the sticky cookie"""
+        def view(request):
+            self.assertEqual(self.router.db_for_write(self.Pet), 'default')
+            return HttpResponse(self.router.db_for_read(self.Pet))
+
+        response = ReplicaStickinessMiddleware(read_from_replica(view))(self.factory.get('/'))
+        self.assertEqual(response.content, b'default')
+        self.assertIn(PRIMARY_STICKY_COOKIE, response.cookies)
+
+        with override_settings(DATABASE_REPLICA_ALIAS=None):
+            response = ReplicaStickinessMiddleware(view)(self.factory.get('/'))
+        self.assertNotIn(PRIMARY_STICKY_COOKIE, response.cookies)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaStickinessTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.client = Client()
+
+    def test_login_pins_browser_and_bypasses_page_cache(self):
+        """Test that a write sets the sticky cookie and pinned browsers skip the shared page cache"""
+        response = self.client.post(reverse('login'), {'username': 'owner', 'password': 'ownerpass123'})
+        self.assertIn(PRIMARY_STICKY_COOKIE, response.cookies)
+
+        Client().get(reverse('home'))
+        with self.assertNumQueries(0):
+            Client().get(reverse('home'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'))
+        self.assertGreater(len(queries), 0)
+
+
+class StaticFilesTestCase(SimpleTestCase):
+    def test_collected_static_files_are_hashed_compressed_and_immutable(self):
+        """Test that collectstatic output is content-hashed, precompressed and served as immutable"""
+        with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as static_root:
+            os.makedirs(os.path.join(source_dir, 'js'))
+            with open(os.path.join(source_dir, 'js', 'report.js'), 'w') as script:
+                script.write('document.title = "PetRescue";\n' * 100)
+
+            with override_settings(
+                STATICFILES_DIRS=[source_dir],
+                STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+                STATIC_ROOT=static_root,
+                STORAGES={
+                    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+                },
+            ):
+                call_command('collectstatic', interactive=False, verbosity=0)
+                url = static('js/report.js')
+                self.assertRegex(url, r'/static/js/report\.[0-9a-f]{12}\.js$')
+
+                response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+                self.assertIn('immutable', response['Cache-Control'])
+                response.close()
+
+    @override_settings(WHITENOISE_AUTOREFRESH=True, WHITENOISE_USE_FINDERS=True)
+    async def test_static_files_stream_asynchronously_under_asgi(self):
+        """Test that the async middleware path serves whole files and byte ranges"""
+        with open(os.path.join(settings.BASE_DIR, 'static', 'js', 'autocomplete.js'), 'rb') as script:
+            content = script.read()
+        url = static('js/autocomplete.js')
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response]), content)
+        self.assertEqual(response['Content-Type'], 'text/javascript; charset="utf-8"')
+
+        response = await self.async_client.get(url, headers={'Range': 'bytes=0-9'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join([chunk async for chunk in response]), content[:10])
+
+
+class PageScriptsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_pages_load_only_their_feature_bundles(self):
+        """Test that each page includes only the JavaScript bundles it uses"""
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'js/ui.js')
+        for bundle in ['js/auth-forms.js', 'js/pet-search.js', 'js/autocomplete.js', 'src="/static/js/admin-notifications.js']:
+            self.assertNotContains(response, bundle)
+
+        response = self.client.get(reverse('register'))
+        self.assertContains(response, 'js/auth-forms.js')
+        self.assertNotContains(response, 'js/pet-search.js')
+
+        response = self.client.get(reverse('all_pets'))
+        self.assertContains(response, 'js/pet-search.js')
+        self.assertContains(response, 'js/autocomplete.js')
+
+    def test_admin_notifications_bundle_only_for_superusers(self):
+        """Test that the admin notification script is included for superusers only"""
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        User.objects.create_user(username='user', email='user@example.com', password='userpass123')
+
+        self.client.login(username='user', password='userpass123')
+        self.assertNotContains(self.client.get(reverse('user_requests')), 'js/admin-notifications.js')
+
+        self.client.login(username='admin', password='adminpass123')
+        self.assertContains(self.client.get(reverse('admin_dashboard')), 'js/admin-notifications.js')
+
+
+class RequestMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.reset()
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.client = Client()
+
+    def test_server_timing_header_only_for_staff(self):
+        """Test that staff users receive query, template and view timings in Server-Timing"""
+        response = self.client.get(reverse('all_pets'))
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="[1-9]\d* queries", tpl;dur=[\d.]+;desc="Templates", view;dur=')
+
+    def test_cached_page_hit_does_not_load_signed_in_user(self):
+        """Test that the metrics middleware does not read the session or user for a cached public page"""
+        self.client.login(username='admin', password='adminpass123')
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 0, [query['sql'] for query in queries.captured_queries])
+
+    def test_metrics_endpoint_exposes_histograms_to_admins(self):
+        """Test that the Prometheus endpoint requires an admin or the metrics token"""
+        self.client.get(reverse('all_pets'))
+        self.assertEqual(self.client.get(reverse('admin_metrics')).status_code, 403)
+
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'petrescue_request_duration_seconds_count{view="all_pets"} 1')
+        self.assertContains(response, 'petrescue_request_db_queries_total{view="all_pets"}')
+
+        with override_settings(METRICS_TOKEN='scrape-token'):
+            response = Client().get(reverse('admin_metrics'), HTTP_AUTHORIZATION='Bearer scrape-token')
+            self.assertEqual(response.status_code, 200)
+            response = Client().get(reverse('admin_metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(response.status_code, 403)
+
+
+class MemoryMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.reset()
+        self.addCleanup(tracemalloc.stop)
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.client.force_login(self.admin)
+
+    def test_peak_memory_recorded_only_when_enabled(self):
+        """Test that MEMORY_METRICS adds the peak memory to Server-Timing and the Prometheus endpoint"""
+        self.assertNotIn('mem;', self.client.get(reverse('admin_dashboard'))['Server-Timing'])
+
+        with override_settings(MEMORY_METRICS=True):
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertRegex(response['Server-Timing'], r'mem;desc="[\d.]+ MB peak"$')
+        response = self.client.get(reverse('admin_metrics'))
+        self.assertContains(response, 'petrescue_request_memory_peak_bytes_count{view="admin_dashboard"} 1')
+        self.assertContains(response, 'petrescue_request_memory_peak_bytes_max{view="admin_dashboard"}')
+
+
+class BoundedListViewsTestCase(TestCase):
+    """The list views and APIs load one page or a capped number of rows, not whole tables."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_petrescue', users=2, pets=80, seed=5, pet_types='dog=1', pet_statuses='found=1',
+            request_statuses='accepted=1', read_notifications=0.5, stdout=StringIO(),
+        )
+        cls.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_all_pets_paginates_in_the_database(self):
+        """Test that all_pets loads a single page, with and without the radius filter"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('all_pets'), {'page': '2'})
+        self.assertEqual(response.context['paginator'].count, 80)
+        self.assertEqual(len(response.context['pets']), 12)
+        pet_selects = [query['sql'] for query in queries if '"main_pet"."breed"' in query['sql'] and 'COUNT(' not in query['sql']]
+        self.assertTrue(pet_selects)
+        self.assertTrue(all('LIMIT 12 OFFSET 12' in sql for sql in pet_selects))
+
+        PetModel = apps.get_model('main', 'Pet')
+        location = PetModel.objects.values_list('location', flat=True).first()
+        within = [
+            pet for pet in PetModel.objects.filter(location__icontains=location)
+            if pet.calculate_distance(location) <= 8
+        ]
+        response = self.client.get(reverse('all_pets'), {'location': location, 'radius': '8'})
+        self.assertEqual(response.context['paginator'].count, len(within))
+        for pet in response.context['pets']:
+            self.assertLessEqual(pet.distance, 8)
+
+    def test_find_pets_search_caps_results(self):
+        """Test that the find pets search shows at most FIND_PETS_RESULT_LIMIT pets with the full count"""
+        self.client.force_login(User.objects.get(username='seed_user_0'))
+        response = self.client.get(reverse('find_pets'), {'pet_type': 'dog'})
+        self.assertEqual(len(response.context['pets']), FIND_PETS_RESULT_LIMIT)
+        self.assertEqual(response.context['pets_total'], 80)
+        self.assertContains(response, f'Showing the first {FIND_PETS_RESULT_LIMIT} of 80 pets found')
+
+    def test_find_pets_search_lists_each_pet_once(self):
+        """Test that a pet with several accepted found requests is listed and counted once"""
+        RequestModel = apps.get_model('main', 'Request')
+        for pet_request in RequestModel.objects.filter(status='accepted', request_type='found'):
+            pet_request.pk = None
+            pet_request.save()
+        self.client.force_login(User.objects.get(username='seed_user_0'))
+        response = self.client.get(reverse('find_pets'), {'pet_type': 'dog'})
+        pet_ids = [pet.id for pet in response.context['pets']]
+        self.assertEqual(len(pet_ids), len(set(pet_ids)))
+        self.assertEqual(response.context['pets_total'], 80)
+
+    def test_admin_notifications_api_is_limited(self):
+        """Test that the notifications API returns the latest `limit` notifications and the total"""
+        NotificationModel = apps.get_model('main', 'Notification')
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('api_admin_notifications'), {'limit': '5'})
+        self.assertEqual(len(response.json()['notifications']), 5)
+        self.assertEqual(response.json()['total'], NotificationModel.objects.count())
+        self.assertEqual(
+            [notification['id'] for notification in response.json()['notifications']],
+            list(NotificationModel.objects.values_list('id', flat=True)[:5]),
+        )
+
+        response = self.client.get(reverse('api_admin_notifications'), {'unread': '1', 'limit': '1000'})
+        unread_count = NotificationModel.objects.filter(is_read=False).count()
+        self.assertEqual(response.json()['total'], unread_count)
+        self.assertEqual(len(response.json()['notifications']), min(unread_count, 200))
+        self.assertFalse(any(notification['is_read'] for notification in response.json()['notifications']))
+
+
+class SlowQueryLogTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_slow_queries_logged_with_view_frame_and_plan(self):
+        """Test that queries over the threshold are logged with their view, caller, parameters and plan"""
+        with self.assertLogs('main.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('all_pets'), {'breed': 'labrador'})
+        entry = next(output for output in logs.output if 'LIKE' in output)
+        self.assertIn('in view all_pets [GET /all-pets/] at main/views.py:', entry)
+        self.assertIn("'%labrador%'", entry)
+        self.assertIn('Plan:', entry)
+        self.assertIn('main_pet', entry.split('Plan:')[1])
+
+    @override_settings(SLOW_QUERY_MS=0.000001, SLOW_QUERY_EXPLAIN=False)
+    def test_plan_capture_can_be_disabled(self):
+        """Test that SLOW_QUERY_EXPLAIN=False logs slow queries without plans"""
+        with self.assertLogs('main.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('all_pets'))
+        self.assertFalse(any('Plan:' in output for output in logs.output))
+
+    def test_disabled_by_default(self):
+        """Test that nothing is logged while SLOW_QUERY_MS is 0"""
+        with self.assertNoLogs('main.instrumentation', 'WARNING'):
+            self.client.get(reverse('all_pets'))
+
+    def test_explain_only_select_statements(self):
+        """Test that EXPLAIN is only run for SELECT statements"""
+        self.assertIsNone(explain(connection, 'DELETE FROM main_pet WHERE id = %s', (1,)))
+        self.assertIn('main_pet', explain(connection, 'SELECT * FROM main_pet WHERE id = %s', (1,)))
+
+
+class RequestProfilingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        settings_override = override_settings(REQUEST_PROFILE_DIR=self.profile_dir.name, REQUEST_PROFILE_KEEP=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.user = User.objects.create_user(username='visitor', email='visitor@example.com', password='visitorpass123')
+
+    def test_superuser_can_profile_a_request(self):
+        """Test that ?profile=1 saves a downloadable profile listed on the admin page"""
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('all_pets'), {'profile': '1', 'breed': 'lab'})
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile-Id']
+        self.assertRegex(name, r'^\d{8}-\d{6}-\d{6}-all_pets\.prof$')
+
+        response = self.client.get(reverse('admin_profiles'))
+        self.assertContains(response, 'GET /all-pets/?profile=1&amp;breed=lab')
+        self.assertContains(response, reverse('admin_profile_download', args=[name]))
+
+        response = self.client.get(reverse('admin_profile_download', args=[name]))
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{name}"')
+        self.assertTrue(b''.join(response.streaming_content))
+        self.assertEqual(self.client.get(reverse('admin_profile_download', args=['settings.py'])).status_code, 404)
+
+    def test_header_also_requests_a_profile_and_old_profiles_are_pruned(self):
+        """Test the X-Profile header and that only REQUEST_PROFILE_KEEP profiles are kept"""
+        self.client.force_login(self.admin)
+        for _ in range(3):
+            self.assertIn('X-Profile-Id', self.client.get(reverse('home'), HTTP_X_PROFILE='1'))
+        self.assertEqual(len([name for name in os.listdir(self.profile_dir.name) if name.endswith('.prof')]), 2)
+
+    def test_only_superusers_are_profiled(self):
+        """Test that other users asking for a profile get a normal response"""
+        self.client.force_login(self.user)
+        self.assertNotIn('X-Profile-Id', self.client.get(reverse('home'), {'profile': '1'}))
+        self.assertEqual(os.listdir(self.profile_dir.name), [])
+        self.assertEqual(self.client.get(reverse('admin_profiles')).status_code, 302)
+
+    @override_settings(REQUEST_PROFILING=False)
+    def test_disabled_profiling_removes_the_middleware(self):
+        """Test that REQUEST_PROFILING=False ignores the profile flag"""
+        client = Client()
+        client.force_login(self.admin)
+        self.assertNotIn('X-Profile-Id', client.get(reverse('home'), {'profile': '1'}))
+
+
+class TrafficCaptureTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.capture_dir = tempfile.TemporaryDirectory()
+        self.capture_file = os.path.join(self.capture_dir.name, 'traffic.jsonl')
+        self.addCleanup(self.capture_dir.cleanup)
+        self.user = User.objects.create_user(username='visitor', email='visitor@example.com', password='visitorpass123')
+
+    def read_capture(self):
+        with open(self.capture_file) as capture:
+            return [json.loads(line) for line in capture]
+
+    def test_captures_sanitized_request_metadata(self):
+        """Test that requests are recorded with role and timing, and sensitive parameters redacted"""
+        self.client.force_login(self.user)
+        with override_settings(TRAFFIC_CAPTURE=True, TRAFFIC_CAPTURE_FILE=self.capture_file):
+            self.client.get(reverse('all_pets'), {'breed': 'lab', 'email': 'visitor@example.com'})
+            self.client.get(reverse('home'))
+
+        first, second = self.read_capture()
+        self.assertEqual(first['method'], 'GET')
+        self.assertEqual(first['path'], reverse('all_pets'))
+        self.assertEqual(first['view'], 'all_pets')
+        self.assertEqual(first['query'], 'breed=lab&email=redacted')
+        self.assertEqual(first['role'], 'user')
+        self.assertEqual(first['status'], 200)
+        self.assertGreater(first['duration_ms'], 0)
+        self.assertLessEqual(first['ts'], second['ts'])
+        self.assertNotIn('visitor@example.com', json.dumps([first, second]))
+
+    def test_disabled_by_default(self):
+        """Test that nothing is written unless TRAFFIC_CAPTURE is on"""
+        with override_settings(TRAFFIC_CAPTURE_FILE=self.capture_file):
+            self.client.get(reverse('home'))
+        self.assertFalse(os.path.exists(self.capture_file))
+
+
+class SeedCommandTestCase(TestCase):
+    def seed(self, **options):
+        options = dict({'users': 4, 'pets': 60, 'batch_size': 25, 'seed': 3, 'stdout': StringIO()}, **options)
+        call_command('seed_petrescue', **options)
+
+    def test_generates_every_model_in_every_status(self):
+        """Test that the seeded data covers all pet types, statuses and related models"""
+        self.seed(pet_types='dog=1,cat=1,bird=1,rabbit=1,other=1', request_statuses='pending=1,accepted=1,rejected=1')
+        PetModel = apps.get_model('main', 'Pet')
+        RequestModel = apps.get_model('main', 'Request')
+
+        self.assertEqual(User.objects.filter(username__startswith='seed_user_').count(), 4)
+        self.assertEqual(apps.get_model('main', 'Profile').objects.count(), 4)
+        self.assertEqual(PetModel.objects.count(), 60)
+        self.assertEqual(RequestModel.objects.count(), 60)
+        self.assertEqual(apps.get_model('main', 'ContactSubmission').objects.count(), 6)
+        self.assertEqual(
+            set(PetModel.objects.values_list('pet_type', flat=True)), {key for key, _ in PetModel.PET_TYPES}
+        )
+        self.assertEqual(
+            set(RequestModel.objects.values_list('status', flat=True)), {'pending', 'accepted', 'rejected'}
+        )
+        self.assertGreaterEqual(apps.get_model('main', 'ActivityLog').objects.count(), 60)
+        self.assertTrue(apps.get_model('main', 'PetImage').objects.exists())
+        self.assertTrue(apps.get_model('main', 'Notification').objects.filter(contact_submission__isnull=False).exists())
+        self.assertTrue(self.client.login(username='seed_user_0', password='petrescue-seed'))
+        self.assertEqual(self.client.get(reverse('user_requests')).status_code, 200)
+
+    def test_same_seed_gives_same_data(self):
+        """Test that a seed reproduces the same pets regardless of batch size"""
+        PetModel = apps.get_model('main', 'Pet')
+        columns = ['pet_type', 'breed', 'color', 'location', 'status', 'description']
+
+        self.seed(prefix='first')
+        first = list(PetModel.objects.order_by('id').values_list(*columns))
+        PetModel.objects.all().delete()
+        self.seed(prefix='second', batch_size=7)
+        self.assertEqual(list(PetModel.objects.order_by('id').values_list(*columns)), first)
+
+    def test_rejects_invalid_distributions(self):
+        """Test that unknown values and malformed weights are reported"""
+        with self.assertRaisesMessage(CommandError, 'Unknown value "hamster"'):
+            self.seed(pet_types='dog=1,hamster=1')
+        with self.assertRaisesMessage(CommandError, 'expected key=weight'):
+            self.seed(request_statuses='pending')
+        self.seed()
+        with self.assertRaisesMessage(CommandError, 'already exist'):
+            self.seed()
+
+
+class AsyncViewsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='ownerpass123')
+        self.pet = apps.get_model('main', 'Pet').objects.create(
+            owner=self.owner, pet_type='dog', breed='Beagle', color='Tan', location='Hill Road', status='lost'
+        )
+        apps.get_model('main', 'ActivityLog').objects.create(pet=self.pet, activity_type='created', actor='user-owner')
+        apps.get_model('main', 'Notification').objects.create(message='New lost pet report', notification_type='lost_report')
+
+    async def test_public_endpoints_under_asgi(self):
+        """Test that health_check and validate_email answer through the async middleware stack"""
+        response = await self.async_client.get(reverse('health_check'))
+        self.assertEqual(response.json()['status'], 'healthy')
+        response = await self.async_client.get(reverse('validate_email'), {'email': 'OWNER@example.com'})
+        self.assertEqual(response.json(), {'is_taken': True})
+
+    async def test_admin_unread_count_under_asgi(self):
+        """Test that the unread count needs an admin and carries metrics and validators"""
+        url = reverse('api_admin_unread_count')
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.json(), {'unread_count': 1})
+        # Queries run on the request's sync thread and are still counted
+        self.assertNotIn('"0 queries"', response['Server-Timing'])
+        response = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_request_history_under_asgi(self):
+        """Test that a report timeline is only returned to its owner"""
+        url = reverse('api_request_history', args=[self.pet.id])
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.get(url)
+        self.assertEqual([entry['activity_type'] for entry in response.json()['timeline']], ['created'])
+        self.assertIn('private', response['Cache-Control'])
+
+    async def test_api_views_accept_basic_authentication(self):
+        """Test that API clients can still sign in with HTTP Basic credentials"""
+        url = reverse('api_request_history', args=[self.pet.id])
+        credentials = base64.b64encode(b'owner:ownerpass123').decode()
+        response = await self.async_client.get(url, headers={'Authorization': f'Basic {credentials}'})
+        self.assertEqual([entry['activity_type'] for entry in response.json()['timeline']], ['created'])
+
+        credentials = base64.b64encode(b'owner:wrong').decode()
+        response = await self.async_client.get(url, headers={'Authorization': f'Basic {credentials}'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'detail': 'Invalid username/password.'})
+
+        credentials = base64.b64encode(b'admin:adminpass123').decode()
+        response = await self.async_client.get(
+            reverse('api_admin_unread_count'), headers={'Authorization': f'Basic {credentials}'},
+        )
+        self.assertEqual(response.json(), {'unread_count': 1})
+
+    def test_request_history_rejects_writes(self):
+        """Test that the async API views only accept safe methods"""
+        self.client.login(username='owner', password='ownerpass123')
+        response = self.client.post(reverse('api_request_history', args=[self.pet.id]))
+        self.assertEqual(response.status_code, 405)
+
+    @override_settings(ADMIN_EMAIL='rescue-admin@example.com')
+    def test_contact_email_sent_after_commit(self):
+        """Test that the admin email is sent in the background once the submission is committed"""
+        from main.views import _admin_email_executor
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('contact'), {
+                'name': 'Visitor', 'email': 'visitor@example.com', 'subject': 'Hello', 'message': 'A question about adopting.',
+            })
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(len(mail.outbox), 0)
+        # The executor has a single thread, so this waits for the email before it
+        _admin_email_executor.submit(lambda: None).result()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['rescue-admin@example.com'])
+
+
+class ValidateEmailTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='owner', email='Owner@Example.com', password='ownerpass123')
+        self.url = reverse('validate_email')
+
+    def test_lookup_uses_lower_email_index(self):
+        """Test that the case-insensitive lookup is served by user_email_lower_idx"""
+        queryset = User.objects.annotate(email_lower=Lower('email')).filter(email_lower=Lower(Value('a@b.com')))
+        self.assertIn('user_email_lower_idx', queryset.explain())
+
+    def test_answer_cached_and_invalidated(self):
+        """Test that a repeated check skips the database until a user registers the address"""
+        response = self.client.get(self.url, {'email': 'OWNER@example.com'})
+        self.assertEqual(response.json(), {'is_taken': True})
+        response = self.client.get(self.url, {'email': 'new@example.com'})
+        self.assertEqual(response.json(), {'is_taken': False})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'email': 'New@Example.com'})
+        self.assertEqual(response.json(), {'is_taken': False})
+        self.assertEqual(len(queries), 0)
+
+        User.objects.create_user(username='newcomer', email='new@example.com', password='newpass123')
+        response = self.client.get(self.url, {'email': 'new@example.com'})
+        self.assertEqual(response.json(), {'is_taken': True})
+
+    def test_changed_email_frees_the_previous_address(self):
+        """Test that changing an email invalidates the cached answers for both addresses"""
+        for email in ['owner@example.com', 'renamed@example.com']:
+            self.client.get(self.url, {'email': email})
+
+        owner = User.objects.get(username='owner')
+        owner.email = 'renamed@example.com'
+        owner.save()
+        response = self.client.get(self.url, {'email': 'owner@example.com'})
+        self.assertEqual(response.json(), {'is_taken': False})
+        response = self.client.get(self.url, {'email': 'renamed@example.com'})
+        self.assertEqual(response.json(), {'is_taken': True})
+
+    @override_settings(THROTTLE_RATES={'validate_email': '3/min'})
+    def test_throttled_per_client_address(self):
+        """Test that a client over its burst gets 429 with Retry-After while others are served"""
+        for _ in range(3):
+            response = self.client.get(self.url, {'email': 'owner@example.com'})
+            self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, {'email': 'owner@example.com'})
+        self.assertEqual(response.status_code, 429)
+        # One token comes back every 20 seconds
+        self.assertEqual(response['Retry-After'], '20')
+
+        response = self.client.get(self.url, {'email': 'owner@example.com'}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    def test_parse_rate(self):
+        """Test that rates are parsed into a burst size and a refill per second"""
+        self.assertEqual(parse_rate('30/min'), (30, 0.5))
+        self.assertEqual(parse_rate('10/s'), (10, 10))
+        self.assertIsNone(parse_rate(''))
+        with self.assertRaises(ValueError):
+            parse_rate('30/fortnight')
+
+
+@override_settings(THROTTLE_RATES={'dashboard': '2/min', 'admin_notifications': '2/min'})
+class ApiThrottlingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='ownerpass123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='otherpass123')
+        self.pet = apps.get_model('main', 'Pet').objects.create(
+            owner=self.owner, pet_type='dog', breed='Beagle', color='Tan', location='Hill Road', status='lost'
+        )
+
+    def test_drf_endpoint_throttled_per_account(self):
+        """Test that a DRF endpoint group answers 429 with Retry-After once an account's burst is used"""
+        url = reverse('api_user_requests')
+        self.client.force_login(self.owner)
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertIn('Expected available in 30 seconds', response.json()['detail'])
+
+        # Another account from the same address has its own bucket
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_revalidation_is_throttled(self):
+        """Test that 304 answers take a token, so If-None-Match cannot bypass the limit"""
+        url = reverse('api_user_requests')
+        self.client.force_login(self.owner)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 429)
+
+    def test_groups_have_separate_buckets(self):
+        """Test that the async endpoints are throttled by group and one group does not limit another"""
+        self.client.force_login(self.owner)
+        history_url = reverse('api_request_history', args=[self.pet.id])
+        for _ in range(2):
+            self.assertEqual(self.client.get(history_url).status_code, 200)
+        response = self.client.get(history_url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(history_url).status_code, 404)
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('api_admin_unread_count')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('api_admin_notifications')).status_code, 429)
+
+
+class WriteCountTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='ownerpass123')
+
+    def _writes(self, method, url, data=None):
+        """Send a request and return its INSERT and UPDATE statements as (statement, table) pairs."""
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data)
+        writes = []
+        for query in queries.captured_queries:
+            statement = query['sql'].split(' ', 1)[0].upper()
+            if statement in ('INSERT', 'UPDATE'):
+                writes.append((statement, query['sql'].split('"')[1]))
+        return response, writes
+
+    def test_login_does_not_rewrite_profile(self):
+        """Test that logging in only updates last_login and stores the session"""
+        response, writes = self._writes('post', reverse('login'), {'username': 'owner', 'password': 'ownerpass123'})
+        self.assertEqual(response.status_code, 302)
+        # login() creates the new session row, then the session middleware saves the user's id into it
+        self.assertCountEqual(writes, [
+            ('UPDATE', 'main_user'), ('INSERT', 'django_session'), ('UPDATE', 'django_session'),
+        ])
+
+    def test_register_with_phone_inserts_user_once(self):
+        """Test that registering with a phone number writes the user and profile once each"""
+        response, writes = self._writes('post', reverse('register'), {
+            'username': 'newcomer', 'email': 'newcomer@example.com', 'full_name': 'New Comer',
+            'phone': '5550002222', 'password1': 'Rescue-pass-2026', 'password2': 'Rescue-pass-2026',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(writes, [('INSERT', 'main_user'), ('INSERT', 'main_profile')])
+        self.assertEqual(User.objects.get(username='newcomer').phone_number, '5550002222')
+
+    def test_profile_writes_only_on_change(self):
+        """Test that the profile page writes nothing on GET or an unchanged POST, and only the changed form otherwise"""
+        self.client.force_login(self.user)
+        url = reverse('profile')
+        form_data = {'username': 'owner', 'email': 'owner@example.com', 'bio': '', 'location': '', 'birth_date': ''}
+
+        response, writes = self._writes('get', url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(writes, [])
+        response, writes = self._writes('post', url, form_data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(writes, [])
+        response, writes = self._writes('post', url, {**form_data, 'bio': 'Fostering cats since 2019.'})
+        self.assertEqual(writes, [('UPDATE', 'main_profile')])
+
+        # An account without a profile gets one only when the form is saved
+        apps.get_model('main', 'Profile').objects.filter(user=self.user).delete()
+        response, writes = self._writes('get', url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(writes, [])
+        response, writes = self._writes('post', url, {**form_data, 'location': 'Riverside'})
+        self.assertEqual(writes, [('INSERT', 'main_profile')])
+
+
+class ImportAuditTestCase(SimpleTestCase):
+    def test_reports_startup_without_deferred_modules(self):
+        """Test that a worker startup imports the views but none of the deferred modules"""
+        out = StringIO()
+        call_command('import_audit', runs=1, json=True, stdout=out)
+        report = json.loads(out.getvalue())
+
+        modules = {entry['module'] for entry in report['modules']}
+        self.assertIn('main.views', modules)
+        self.assertIn('rest_framework.views', modules)
+        self.assertEqual(report['deferred_modules_loaded'], [])
+        self.assertGreater(report['urlconf_ms'], 0)
+
+    def test_budget_exceeded(self):
+        """Test that --max-ms fails when the startup is slower than the budget"""
+        with self.assertRaises(CommandError):
+            call_command('import_audit', runs=1, max_ms=1, stdout=StringIO())
+
+
+# Query budgets
+# Maximum number of SQL queries each URL in main/urls.py may run against the seeded
+# data below. Budgets do not depend on how many rows exist, so a lazy relation access
+# in a loop (an N+1 query) pushes a view over its budget.
+# Each entry: url name -> (method, user, url kwargs, request data, budget)
+
+QUERY_BUDGETS = {
+    'home': ('get', None, {}, None, 4),
+    'health_check': ('get', None, {}, None, 0),
+    'find_pets': ('get', 'reporter', {}, None, 3),
+    'donate': ('get', None, {}, None, 0),
+    'register': ('get', None, {}, None, 0),
+    'login': ('get', None, {}, None, 0),
+    'logout': ('get', 'reporter', {}, None, 4),
+    'profile': ('get', 'reporter', {}, None, 5),
+    'user_requests': ('get', 'reporter', {}, None, 4),
+    'edit_user_request': ('get', 'reporter', {'pet_id': 'pending_pet'}, None, 4),
+    'delete_user_request': ('post', 'reporter', {'pet_id': 'deletable_pet'}, {}, 13),
+    'api_user_requests': ('get', 'reporter', {}, None, 6),
+    'api_edit_request': ('put', 'reporter', {'pet_id': 'pending_pet'}, {'color': 'Golden'}, 6),
+    'api_delete_request': ('delete', 'reporter', {'pet_id': 'api_deletable_pet'}, None, 13),
+    'api_request_history': ('get', 'reporter', {'pet_id': 'pending_pet'}, None, 5),
+    'api_personalization': ('get', 'reporter', {}, {'slots': ','.join(PERSONAL_SLOTS), 'pet': 'pending_pet'}, 4),
+    'validate_email': ('get', None, {}, {'email': 'reporter@example.com'}, 1),
+    'report_found_pet': ('get', 'reporter', {}, None, 2),
+    'report_lost_pet': ('get', 'reporter', {}, None, 2),
+    'report_success': ('get', 'reporter', {}, None, 2),
+    'report_lost_success': ('get', 'reporter', {}, None, 2),
+    'report_found_success': ('get', 'reporter', {}, None, 2),
+    'admin_dashboard': ('get', 'admin', {}, None, 6),
+    'admin_pending_requests': ('get', 'admin', {}, None, 4),
+    'admin_accepted_requests': ('get', 'admin', {}, None, 4),
+    'admin_rejected_requests': ('get', 'admin', {}, None, 4),
+    'update_request_status': ('post', 'admin', {'request_id': 'pending_request'}, {'status': 'Accepted'}, 7),
+    'admin_notifications': ('get', 'admin', {}, None, 2),
+    'admin_metrics': ('get', 'admin', {}, None, 2),
+    'admin_profiles': ('get', 'admin', {}, None, 2),
+    'admin_profile_download': ('get', 'admin', {'name': 'missing.prof'}, None, 2),
+    'api_admin_notifications': ('get', 'admin', {}, None, 6),
+    'api_admin_unread_count': ('get', 'admin', {}, None, 5),
+    'api_admin_mark_read': ('post', 'admin', {'notification_id': 'notification'}, None, 4),
+    'api_admin_mark_all_read': ('post', 'admin', {}, None, 3),
+    'contact': ('get', None, {}, None, 0),
+    'report_issue': ('get', 'reporter', {'pet_id': 'accepted_pet'}, None, 3),
+    'pet_detail': ('get', None, {'pet_id': 'accepted_pet'}, None, 6),
+    'all_pets': ('get', None, {}, None, 4),
+    'admin_contact_submissions': ('get', 'admin', {}, None, 4),
+    'admin_contact_submission_detail': ('get', 'admin', {'submission_id': 'submission'}, None, 6),
+    'admin_update_submission_status': ('post', 'admin', {'submission_id': 'submission'}, {'status': 'reviewed'}, 4),
+}
+
+
+class QueryBudgetTestCase(TestCase):
+    # Seeded data volume: enough rows that a per-row query would exceed any budget
+    PETS_PER_USER = 30
+    IMAGES_PER_PET = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        PetModel = apps.get_model('main', 'Pet')
+        RequestModel = apps.get_model('main', 'Request')
+        ActivityLogModel = apps.get_model('main', 'ActivityLog')
+        PetImageModel = apps.get_model('main', 'PetImage')
+        NotificationModel = apps.get_model('main', 'Notification')
+        ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
+
+        cls.users = {
+            'admin': User.objects.create_superuser(
+                username='admin', email='admin@example.com', password='adminpass123'
+            ),
+            'reporter': User.objects.create_user(
+                username='reporter', email='reporter@example.com', password='reporterpass123',
+                phone_number='5550001111'
+            ),
+        }
+        other_user = User.objects.create_user(
+            username='neighbour', email='neighbour@example.com', password='neighbourpass123'
+        )
+
+        pets = {'pending': [], 'accepted': [], 'rejected': []}
+        statuses = ['pending', 'accepted', 'rejected']
+        for owner in [cls.users['reporter'], other_user]:
+            for index in range(cls.PETS_PER_USER):
+                request_status = statuses[index % len(statuses)]
+                pet = PetModel.objects.create(
+                    owner=owner,
+                    pet_type='dog',
+                    breed='Labrador',
+                    color='Black',
+                    location=f'{index} Park Avenue',
+                    description='Friendly and wearing a blue collar.',
+                    status='lost' if index % 2 else 'found'
+                )
+                pet_request = RequestModel.objects.create(
+                    user=owner,
+                    pet=pet,
+                    request_type=pet.status,
+                    phone_number='5550001111',
+                    status=request_status
+                )
+                for activity_type in ['created', 'edited', 'status_changed']:
+                    ActivityLogModel.objects.create(pet=pet, activity_type=activity_type, actor=f'user-{owner.username}')
+                for _ in range(cls.IMAGES_PER_PET):
+                    PetImageModel.objects.create(pet=pet, image='pet_images/sample.jpg')
+                NotificationModel.objects.create(
+                    request=pet_request,
+                    message=f'New {pet.status} pet report',
+                    notification_type=f'{pet.status}_report'
+                )
+                submission = ContactSubmissionModel.objects.create(
+                    name=owner.username,
+                    email=owner.email,
+                    subject='Sighting',
+                    message='I think I saw this pet.',
+                    submission_type='issue_report',
+                    related_pet=pet,
+                    user=owner
+                )
+                NotificationModel.objects.create(
+                    contact_submission=submission,
+                    message='New issue report',
+                    notification_type='issue_report'
+                )
+                if owner == cls.users['reporter']:
+                    pets[request_status].append(pet)
+
+        cls.objects = {
+            'pending_pet': pets['pending'][0].id,
+            'deletable_pet': pets['pending'][1].id,
+            'api_deletable_pet': pets['pending'][2].id,
+            'accepted_pet': pets['accepted'][0].id,
+            'pending_request': pets['pending'][3].request_set.get().id,
+            'notification': NotificationModel.objects.first().id,
+            'submission': ContactSubmissionModel.objects.first().id,
+        }
+
+    def _resolve(self, values):
+        return {key: self.objects.get(value, value) for key, value in values.items()}
+
+    def test_every_url_has_a_query_budget(self):
+        """Test that each named URL in main/urls.py is covered by QUERY_BUDGETS"""
+        from main import urls
+        url_names = {pattern.name for pattern in urls.urlpatterns}
+        self.assertEqual(url_names, set(QUERY_BUDGETS))
+
+    def test_views_stay_within_query_budgets(self):
+        """Test that no view runs more queries than its budget against the seeded data"""
+        for url_name, (method, username, kwargs, data, budget) in QUERY_BUDGETS.items():
+            with self.subTest(url_name=url_name):
+                cache.clear()
+                client = Client()
+                if username:
+                    client.force_login(self.users[username])
+                url = reverse(url_name, kwargs=self._resolve(kwargs))
+                request_data = self._resolve(data) if data else data
+                if method in ('put', 'delete'):
+                    request = lambda: getattr(client, method)(url, request_data, content_type='application/json')
+                else:
+                    request = lambda: getattr(client, method)(url, request_data)
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = request()
+                self.assertLess(response.status_code, 500)
+                self.assertLessEqual(
+                    len(queries), budget,
+                    f'{url_name} ran {len(queries)} queries (budget {budget}):\n'
+                    + '\n'.join(query['sql'] for query in queries.captured_queries)
+                )
@@ -0,0 +1,184 @@
+"""
+Rate limiting for the PetRescue application.
+
+Each client gets a token bucket per scope (an endpoint group), kept in the
+default cache so every Gunicorn worker shares it (with the default locmem
+backend each worker has its own buckets, and the effective limit is multiplied
+by the worker count). A rate of "N/period" from THROTTLE_RATES lets a client
+send a burst of N requests and refills N tokens per period; a request that finds
+the bucket empty gets 429 Too Many Requests with a Retry-After header saying
+when a token will be back.
+
+Reading and writing a bucket are two cache operations, so two requests racing
+for the last token can both get it. The limit keeps a client from flooding an
+endpoint; it is not an exact quota. With the dummy cache backend nothing is
+remembered and every request is allowed.
+
+Plain Django views use the throttle() decorator; Django REST framework views use
+a ScopedThrottle subclass in throttle_classes, which answers the same way
+through DRF's Throttled exception. Signed-in users of the API groups are limited
+per account, so clients behind one address do not share a bucket.
+"""
+
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'sec': 1, 'min': 60, 'm': 60, 'hour': 3600, 'h': 3600, 'day': 86400, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse a rate like "30/min" into (burst size, tokens refilled per second).
+    Return None for an empty rate, which means no limit.
+    """
+    if not rate:
+        return None
+    count, _, period = rate.partition('/')
+    try:
+        count, seconds = int(count), PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f'Invalid throttle rate "{rate}"; expected "<count>/<s|min|hour|day>"')
+    if count < 1:
+        raise ValueError(f'Invalid throttle rate "{rate}"; the count must be at least 1')
+    return count, count / seconds
+
+
+def client_ip(request):
+    """
+    Return the address used to tell clients apart.
+    Behind THROTTLE_NUM_PROXIES proxies, this is the address the outermost proxy saw.
+    """
+    num_proxies = settings.THROTTLE_NUM_PROXIES
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if num_proxies and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(',')]
+        return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def throttle_ident(request, user=None):
+    """Return the bucket owner: the account of a signed-in user, otherwise the client address."""
+    if user is not None and user.is_authenticated:
+        return f'user-{user.pk}'
+    return client_ip(request)
+
+
+def throttle_cache_key(scope, ident):
+    return f'petrescue:throttle:{scope}:{ident}'
+
+
+def _take(bucket, rate, now):
+    """
+    Refill a bucket (tokens, updated at) for the time elapsed and take a token from it.
+    Return the new bucket and 0 if a token was taken, or the seconds until one will be available.
+    """
+    burst, per_second = rate
+    tokens, updated_at = bucket if bucket is not None else (burst, now)
+    tokens = min(burst, tokens + (now - updated_at) * per_second)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / per_second
+
+
+def _bucket_timeout(rate):
+    # An untouched bucket is full again after this long, so it can simply expire
+    burst, per_second = rate
+    return math.ceil(burst / per_second) + 1
+
+
+def take_token(scope, ident, rate):
+    """Take a token from the client's bucket; return 0 if allowed, otherwise the seconds to wait."""
+    key = throttle_cache_key(scope, ident)
+    bucket, wait = _take(cache.get(key), rate, time.time())
+    cache.set(key, bucket, _bucket_timeout(rate))
+    return wait
+
+
+async def atake_token(scope, ident, rate):
+    """Async version of take_token()."""
+    key = throttle_cache_key(scope, ident)
+    bucket, wait = _take(await cache.aget(key), rate, time.time())
+    await cache.aset(key, bucket, _bucket_timeout(rate))
+    return wait
+
+
+def throttled_response(wait):
+    """Build the 429 response for a request that has to wait `wait` seconds."""
+    retry_after = max(1, math.ceil(wait))
+    unit = 'second' if retry_after == 1 else 'seconds'
+    response = JsonResponse(
+        {'detail': f'Request was throttled. Expected available in {retry_after} {unit}.'},
+        status=429,
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def throttle(scope, by_user=False):
+    """
+    Decorator that limits each client to the THROTTLE_RATES[scope] rate.
+    With by_user, signed-in users are limited per account instead of per address.
+    Works on sync and async views; the rate is read on every request.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                rate = parse_rate(settings.THROTTLE_RATES.get(scope))
+                if rate is not None:
+                    user = await request.auser() if by_user else None
+                    wait = await atake_token(scope, throttle_ident(request, user), rate)
+                    if wait:
+                        return throttled_response(wait)
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            def _wrapped_view(request, *args, **kwargs):
+                rate = parse_rate(settings.THROTTLE_RATES.get(scope))
+                if rate is not None:
+                    user = request.user if by_user else None
+                    wait = take_token(scope, throttle_ident(request, user), rate)
+                    if wait:
+                        return throttled_response(wait)
+                return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+# Django REST framework throttle classes, one per endpoint group
+
+class ScopedThrottle(BaseThrottle):
+    """
+    Throttle for DRF views taking tokens from the THROTTLE_RATES[scope] buckets.
+    DRF checks it after the permission classes and answers 429 with Retry-After when it refuses.
+    """
+    scope = None
+
+    def allow_request(self, request, view):
+        rate = parse_rate(settings.THROTTLE_RATES.get(self.scope))
+        if rate is None:
+            return True
+        self.wait_seconds = take_token(self.scope, throttle_ident(request, request.user), rate)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ApiThrottle(ScopedThrottle):
+    scope = 'api'
+
+
+class DashboardThrottle(ScopedThrottle):
+    scope = 'dashboard'
+
+
+class AdminNotificationsThrottle(ScopedThrottle):
+    scope = 'admin_notifications'
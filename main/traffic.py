@@ -0,0 +1,117 @@
+"""
+Traffic capture for the PetRescue application.
+
+With TRAFFIC_CAPTURE on, TrafficCaptureMiddleware appends one JSON line per
+request to TRAFFIC_CAPTURE_FILE: the start time, method, path, URL name, query
+string, the role of the user (anonymous, user, staff or admin), the response
+status and the duration. Request bodies, cookies and headers are never recorded,
+and the values of query parameters listed in TRAFFIC_CAPTURE_REDACT are replaced
+with "redacted". benchmarks/replay.py sends a captured file back to a server.
+
+Each line is written with a single append, so several Gunicorn workers can
+share one file.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# Value written in place of redacted query parameters
+REDACTED = 'redacted'
+
+_write_lock = threading.Lock()
+
+
+def user_role(user):
+    """Return the role recorded for a user: anonymous, user, staff or admin."""
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'admin'
+    if user.is_staff:
+        return 'staff'
+    return 'user'
+
+
+def sanitize_query(query_dict):
+    """Return the query string with the values of sensitive parameters redacted."""
+    redact = {name.lower() for name in settings.TRAFFIC_CAPTURE_REDACT}
+    pairs = [
+        (key, REDACTED if key.lower() in redact else value)
+        for key, values in query_dict.lists()
+        for value in values
+    ]
+    return urlencode(pairs)
+
+
+def write_record(record):
+    line = json.dumps(record, separators=(',', ':')) + '\n'
+    with _write_lock:
+        fd = os.open(settings.TRAFFIC_CAPTURE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+class TrafficCaptureMiddleware:
+    """
+    Records sanitized request metadata as JSON lines for replay by benchmarks/replay.py.
+    Does nothing unless TRAFFIC_CAPTURE is on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not _sampled():
+            return self.get_response(request)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+        write_record(_record(request, response, started_at, duration, getattr(request, 'user', None)))
+        return response
+
+    async def __acall__(self, request):
+        if not _sampled():
+            return await self.get_response(request)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        duration = time.perf_counter() - start
+        user = await request.auser() if hasattr(request, 'auser') else None
+        write_record(_record(request, response, started_at, duration, user))
+        return response
+
+
+def _sampled():
+    return settings.TRAFFIC_CAPTURE and random.random() < settings.TRAFFIC_CAPTURE_SAMPLE_RATE
+
+
+def _record(request, response, started_at, duration, user):
+    match = getattr(request, 'resolver_match', None)
+    return {
+        'ts': round(started_at, 6),
+        'method': request.method,
+        'path': request.path,
+        'view': match.url_name if match else None,
+        'query': sanitize_query(request.GET),
+        'role': user_role(user),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 3),
+    }
@@ -46,6 +46,9 @@ urlpatterns = [
     path('api/requests/<int:pet_id>/delete/', views.api_delete_request, name='api_delete_request'),
     path('api/requests/<int:pet_id>/history/', views.api_request_history, name='api_request_history'),
     
+    # Personalized fragments for cached public page shells
+    path('api/personalization/', views.api_personalization, name='api_personalization'),
+    
     # AJAX endpoint for email validation during registration
     path('validate-email/', views.validate_email, name='validate_email'),
     
@@ -72,6 +75,11 @@ urlpatterns = [
     path('dashboard/admin/update-request-status/<int:request_id>/', views.update_request_status, name='update_request_status'),
     path('dashboard/admin/notifications/', views.admin_notifications, name='admin_notifications'),
     
+    # Admin diagnostics: Prometheus metrics and saved request profiles
+    path('dashboard/admin/metrics/', views.admin_metrics, name='admin_metrics'),
+    path('dashboard/admin/profiles/', views.admin_profiles, name='admin_profiles'),
+    path('dashboard/admin/profiles/<str:name>/', views.admin_profile_download, name='admin_profile_download'),
+    
     # Admin Notification API URLs
     path('api/admin/notifications/', views.api_admin_notifications, name='api_admin_notifications'),
     path('api/admin/notifications/unread-count/', views.api_admin_unread_count, name='api_admin_unread_count'),
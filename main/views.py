@@ -1,54 +1,97 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import aauthenticate, authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth.forms import AuthenticationForm
-from django.http import JsonResponse, HttpResponseForbidden
+from django.contrib.auth.models import AnonymousUser
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, HttpResponseForbidden
+from django.template.loader import render_to_string
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
 from typing import cast
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import base64
+import hashlib
+import hmac
+import os
+from django.core.cache import cache
+from django.core.mail import send_mail
 from django.core.paginator import Paginator
-from django.db.models import Q
-from django.apps import apps
-from rest_framework.decorators import api_view, permission_classes
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q, Value
+from django.db.models.functions import Lower
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from petrescue.db.replica import read_from_replica
+
 from .forms import UserRegisterForm, UserUpdateForm, ProfileUpdateForm, FoundPetForm, LostPetForm, PetSearchForm, ContactForm, ReportIssueForm
-from .models import User, Profile, Pet, Request
+from .models import ActivityLog, ContactSubmission, Notification, Pet, PetImage, Profile, Request, User
+from .caching import cache_public_page, email_taken_cache_key, get_or_refresh
+from .instrumentation import registry as metrics_registry
+from .profiling import list_profiles, profile_path
+from .throttling import AdminNotificationsThrottle, DashboardThrottle, throttle
+from .conditional import (
+    conditional_response,
+    pet_detail_last_modified,
+    all_pets_last_modified,
+    user_requests_last_modified,
+    arequest_history_last_modified,
+    admin_notifications_last_modified,
+    aadmin_notifications_last_modified,
+)
+
+# Public page shells
+# Cached public pages are rendered for an anonymous visitor without touching the
+# session; personalize.js loads the user-specific fragments from api_personalization
+
+def render_public_shell(request, template_name, context):
+    """
+    Render a public page as an anonymous shell that every visitor can share.
+    """
+    context.update({
+        'user': AnonymousUser(),
+        'messages': [],
+        'personalize': True,
+    })
+    return render(request, template_name, context)
+
 
 # Home page view
 # Displays the main landing page with featured content and calls to action
 
+@read_from_replica
+@cache_public_page
 def home(request):
     """
     Render the homepage with current datetime for footer copyright.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    UserModel = apps.get_model('main', 'User')
-    
     # Get recently reported pets that have accepted requests
     # We'll get pets that have associated accepted requests, ordered by most recent
-    recent_pets = PetModel.objects.filter(
+    recent_pets = Pet.objects.filter(
         request__status='accepted'
     ).select_related('owner').order_by('-created_at')[:6]  # Limit to 6 most recent
     
     # Calculate statistics
     # Pets reunited = accepted lost pet requests
-    pets_reunited_count = RequestModel.objects.filter(
+    pets_reunited_count = Request.objects.filter(
         request_type='lost',
         status='accepted'
     ).count()
     
     # Reports handled = all accepted requests (both lost and found)
-    reports_handled_count = RequestModel.objects.filter(
+    reports_handled_count = Request.objects.filter(
         status='accepted'
     ).count()
     
     # Active members = all registered users
-    active_members_count = UserModel.objects.count()
+    active_members_count = User.objects.count()
     
     context = {
         'now': timezone.now(),
@@ -57,152 +100,183 @@ def home(request):
         'reports_handled_count': reports_handled_count,
         'active_members_count': active_members_count
     }
-    return render(request, 'home.html', context) 
+    return render_public_shell(request, 'home.html', context) 
+
+
+# Find pets helpers
+# Search results are cached per filter combination with single-flight refresh
+
+# Database ordering for the PetSearchForm sort choices (newest first by default)
+PET_SORT_ORDERING = {
+    'newest': '-created_at',
+    'oldest': 'created_at',
+    'updated': '-updated_at',
+}
+
+# Most search results shown on the find pets page, and pets in its "Recently Reported" preview
+FIND_PETS_RESULT_LIMIT = 60
+AVAILABLE_PETS_PREVIEW = 3
+
+def _find_pets_cache_key(prefix, search_data):
+    """
+    Build a cache key for a find-pets result set from the cleaned search filters.
+    """
+    filters = repr(sorted((key, str(value)) for key, value in search_data.items() if value))
+    filters_hash = hashlib.md5(filters.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'petrescue:find_pets:{prefix}:{filters_hash}'
+
+
+def _search_found_pets(search_data):
+    """
+    Return accepted found pets matching the search filters, sorted as requested.
+    """
+    pet_type = search_data.get('pet_type')
+    breed = search_data.get('breed')
+    color = search_data.get('color')
+    location = search_data.get('location')
+    start_date = search_data.get('start_date')
+    end_date = search_data.get('end_date')
+    status = search_data.get('status')
+    sort = search_data.get('sort')
+
+    # Start with all found pets that have been accepted (for search results)
+    pets = Pet.objects.filter(status='found').select_related('owner')
+    
+    # Filter by accepted requests with a correlated EXISTS: it looks each pet up through the
+    # request's pet index (SQLite re-scans an IN subquery for every pet), and unlike a join
+    # it never repeats a pet that has several accepted requests
+    pets = pets.filter(Exists(Request.objects.filter(
+        pet=OuterRef('pk'), status='accepted', request_type='found',
+    )))
+    
+    # Apply pet type filter
+    if pet_type:
+        pets = pets.filter(pet_type=pet_type)
+    
+    # Apply breed filter with case-insensitive partial matching
+    if breed:
+        pets = pets.filter(breed__icontains=breed)
+    
+    # Apply color filter with case-insensitive partial matching and synonyms
+    if color:
+        # Define color synonyms
+        color_synonyms = {
+            'brown': ['brown', 'tan', 'chocolate'],
+            'black': ['black', 'dark'],
+            'white': ['white', 'light'],
+            'gray': ['gray', 'grey', 'silver'],
+            'golden': ['golden', 'yellow', 'blonde'],
+            'red': ['red', 'orange', 'rust'],
+        }
+        
+        # Check if the color has synonyms
+        if color.lower() in color_synonyms:
+            color_filters = Q()
+            for synonym in color_synonyms[color.lower()]:
+                q_object = Q(color__icontains=synonym)
+                color_filters.add(q_object, Q.OR)
+            pets = pets.filter(color_filters)
+        else:
+            pets = pets.filter(color__icontains=color)
+    
+    # Apply location filter with case-insensitive partial matching
+    if location:
+        pets = pets.filter(location__icontains=location)
+    
+    # Apply date range filters
+    if start_date:
+        pets = pets.filter(created_at__date__gte=start_date)
+    if end_date:
+        pets = pets.filter(created_at__date__lte=end_date)
+        
+    # Apply status filter
+    if status:
+        pets = pets.filter(status=status)
+    
+    # Apply sorting in the database
+    pets = pets.order_by(PET_SORT_ORDERING.get(sort, '-created_at'))
+    
+    # Load only the first FIND_PETS_RESULT_LIMIT matches; the total is shown alongside them
+    pet_list = list(pets[:FIND_PETS_RESULT_LIMIT])
+    total = len(pet_list) if len(pet_list) < FIND_PETS_RESULT_LIMIT else pets.count()
+    
+    # Add distance calculation if location is provided
+    if location:
+        for pet in pet_list:
+            pet.distance = pet.calculate_distance(location)
+    
+    return pet_list, total
+
+
+def _available_pets():
+    """
+    Return the most recent pets available for adoption (the "Recently Reported Pets" preview).
+    Includes explicitly adoptable pets and found pets with accepted requests.
+    """
+    # First get explicitly adoptable pets
+    adoptable_pets = Pet.objects.filter(status='adoptable').select_related('owner')
+    
+    # Then get found pets with accepted requests
+    accepted_found_pets = Pet.objects.filter(
+        status='found',
+        request__status='accepted',
+        request__request_type='found'
+    ).select_related('owner')
+    
+    # Combine both querysets, most recent first
+    return list(adoptable_pets.union(accepted_found_pets).order_by('-created_at')[:AVAILABLE_PETS_PREVIEW])
 
 
 # Adopt page view
 # Shows available pets for adoption (requires user authentication)
 
+@read_from_replica
 @login_required
 def adopt(request):
     """
     Display pets available for adoption.
     Requires user to be logged in.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    
     # Initialize the search form
     search_form = PetSearchForm(request.GET or None)
     
-    # Initialize pets as empty queryset
-    pets = PetModel.objects.none()
+    # Initialize pets as empty list
+    pets = []
+    pets_total = 0
+    location = None
     
     # Apply filters only if form is submitted and at least one filter is provided
     if request.GET and search_form and search_form.is_valid():
-        # Check if any search criteria were provided
-        pet_type = search_form.cleaned_data.get('pet_type')
-        breed = search_form.cleaned_data.get('breed')
-        color = search_form.cleaned_data.get('color')
-        location = search_form.cleaned_data.get('location')
-        radius = search_form.cleaned_data.get('radius')
-        start_date = search_form.cleaned_data.get('start_date')
-        end_date = search_form.cleaned_data.get('end_date')
-        status = search_form.cleaned_data.get('status')
-        sort = search_form.cleaned_data.get('sort')
+        search_data = search_form.cleaned_data
+        location = search_data.get('location')
         
         # Only perform search if at least one filter is provided
-        if pet_type or breed or color or location or start_date or end_date or status:
-            # Start with all found pets that have been accepted (for search results)
-            pets = PetModel.objects.filter(status='found').select_related('owner')
-            
-            # Filter by accepted requests
-            accepted_requests = RequestModel.objects.filter(status='accepted', request_type='found')
-            pets = pets.filter(request__in=accepted_requests)
-            
-            # Apply pet type filter
-            if pet_type:
-                pets = pets.filter(pet_type=pet_type)
-            
-            # Apply breed filter with case-insensitive partial matching
-            if breed:
-                pets = pets.filter(breed__icontains=breed)
-            
-            # Apply color filter with case-insensitive partial matching and synonyms
-            if color:
-                # Define color synonyms
-                color_synonyms = {
-                    'brown': ['brown', 'tan', 'chocolate'],
-                    'black': ['black', 'dark'],
-                    'white': ['white', 'light'],
-                    'gray': ['gray', 'grey', 'silver'],
-                    'golden': ['golden', 'yellow', 'blonde'],
-                    'red': ['red', 'orange', 'rust'],
-                }
-                
-                # Check if the color has synonyms
-                if color.lower() in color_synonyms:
-                    color_filters = Q()
-                    for synonym in color_synonyms[color.lower()]:
-                        q_object = Q(color__icontains=synonym)
-                        color_filters.add(q_object, Q.OR)
-                    pets = pets.filter(color_filters)
-                else:
-                    pets = pets.filter(color__icontains=color)
-            
-            # Apply location filter with case-insensitive partial matching
-            if location:
-                pets = pets.filter(location__icontains=location)
-            
-            # Apply date range filters
-            if start_date:
-                pets = pets.filter(created_at__date__gte=start_date)
-            if end_date:
-                pets = pets.filter(created_at__date__lte=end_date)
-                
-            # Apply status filter
-            if status:
-                pets = pets.filter(status=status)
-            
-            # Convert to list to add distance attribute
-            pet_list = list(pets)
-            
-            # Add distance calculation if location is provided
-            if location:
-                for pet in pet_list:
-                    pet.distance = pet.calculate_distance(location)
-            
-            # Apply sorting
-            if sort == 'oldest':
-                pet_list.sort(key=lambda x: x.created_at)
-            elif sort == 'updated':
-                # Assuming there's an updated_at field, if not we can use created_at
-                pet_list.sort(key=lambda x: x.created_at)
-            else:  # newest (default)
-                pet_list.sort(key=lambda x: x.created_at, reverse=True)
-            
-            pets = pet_list
-        else:
-            pets = list(pets)
+        search_fields = ['pet_type', 'breed', 'color', 'location', 'start_date', 'end_date', 'status']
+        if any(search_data.get(field) for field in search_fields):
+            pets, pets_total = get_or_refresh(
+                _find_pets_cache_key('search', search_data),
+                lambda: _search_found_pets(search_data),
+            )
     
     # Sort by most recent entries first (only if there are pets)
-    if isinstance(pets, list) and len(pets) > 0:
+    if len(pets) > 0:
         if not request.GET.get('sort'):  # Only sort by default if no sort specified
             pets.sort(key=lambda x: x.created_at, reverse=True)
     
     # Get all available pets (explicitly adoptable pets and found pets with accepted requests)
-    # First get explicitly adoptable pets
-    adoptable_pets = PetModel.objects.filter(status='adoptable').select_related('owner')
-    
-    # Then get found pets with accepted requests
-    accepted_found_pets = PetModel.objects.filter(
-        status='found',
-        request__status='accepted',
-        request__request_type='found'
-    ).select_related('owner')
-    
-    # Combine both querysets
-    all_pets = adoptable_pets.union(accepted_found_pets)
-    
-    # Convert to list to add distance attribute
-    all_pets_list = list(all_pets)
+    all_pets_list = get_or_refresh(_find_pets_cache_key('available', {}), _available_pets)
     
     # Add distance calculation if location is provided in the search form
-    if request.GET and search_form and search_form.is_valid():
-        location = search_form.cleaned_data.get('location')
-        if location:
-            for pet in all_pets_list:
-                pet.distance = pet.calculate_distance(location)
-    
-    # Sort by most recent
-    all_pets_list.sort(key=lambda x: x.created_at, reverse=True)
+    if location:
+        for pet in all_pets_list:
+            pet.distance = pet.calculate_distance(location)
     
     context = {
         'now': timezone.now(),
         'search_form': search_form,
         'pets': pets,  # Found pets matching search criteria (empty if no search)
-        'all_pets': all_pets_list  # All available pets
+        'pets_total': pets_total,  # Number of matches, which can exceed the pets shown
+        'all_pets': all_pets_list  # Most recent available pets
     }
     return render(request, 'find_pets.html', context)
 
@@ -210,6 +284,7 @@ def adopt(request):
 # Donate page view
 # Information about supporting the pet rescue mission through donations
 
+@cache_public_page
 def donate(request):
     """
     Display donation information to support the pet rescue mission.
@@ -217,22 +292,20 @@ def donate(request):
     context = {
         'now': timezone.now()
     }
-    return render(request, 'donate.html', context)
+    return render_public_shell(request, 'donate.html', context)
 
 
 # All Pets page view
 # Shows all accepted pets (both lost and found) in a gallery format
 
+@read_from_replica
+@conditional_response(all_pets_last_modified)
+@cache_public_page
 def all_pets(request):
     """
     Display all accepted pets (both lost and found) in a gallery format.
     Only pets with accepted requests are shown.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    
     # Get search parameters
     pet_type = request.GET.get('pet_type', '').strip()
     breed = request.GET.get('breed', '').strip()
@@ -245,21 +318,21 @@ def all_pets(request):
     
     # Build queries for each pet type to allow filtering before union
     # For lost pets with accepted requests
-    accepted_lost_pets = PetModel.objects.filter(
+    accepted_lost_pets = Pet.objects.filter(
         status='lost',
         request__status='accepted',
         request__request_type='lost'
     ).select_related('owner')
     
     # For found pets with accepted requests
-    accepted_found_pets = PetModel.objects.filter(
+    accepted_found_pets = Pet.objects.filter(
         status='found',
         request__status='accepted',
         request__request_type='found'
     ).select_related('owner')
     
     # For adoptable pets (no request required)
-    adoptable_pets = PetModel.objects.filter(status='adoptable').select_related('owner')
+    adoptable_pets = Pet.objects.filter(status='adoptable').select_related('owner')
     
     # Apply filters to each queryset individually before union
     if pet_type:
@@ -292,53 +365,48 @@ def all_pets(request):
         accepted_found_pets = accepted_found_pets.filter(created_at__date__lte=end_date)
         adoptable_pets = adoptable_pets.filter(created_at__date__lte=end_date)
     
-    # Now we can union the filtered querysets
-    all_pets = accepted_lost_pets.union(accepted_found_pets).union(adoptable_pets)
-    
-    # Convert to list to add distance attribute
-    pet_list = list(all_pets)
+    # Now we can union the filtered querysets and sort them in the database
+    ordering = PET_SORT_ORDERING.get(sort, '-created_at')
+    all_pets = accepted_lost_pets.union(accepted_found_pets).union(adoptable_pets).order_by(ordering)
     
-    # Filter by radius if location and radius are provided
-    if location and radius:
-        try:
-            radius_value = float(radius)
-            filtered_pets = []
-            for pet in pet_list:
-                pet.distance = pet.calculate_distance(location)
-                # Include pet if distance is within radius or distance calculation failed
-                if pet.distance is None or pet.distance <= radius_value:
-                    filtered_pets.append(pet)
-            pet_list = filtered_pets
-        except ValueError:
-            # If radius is not a valid number, calculate distances but don't filter
-            for pet in pet_list:
-                pet.distance = pet.calculate_distance(location)
-    elif location:
-        # If only location is provided, calculate distances for display
-        for pet in pet_list:
+    try:
+        radius_value = float(radius) if location and radius else None
+    except ValueError:
+        # If radius is not a valid number, calculate distances but don't filter
+        radius_value = None
+    
+    if radius_value is None:
+        # Paginate in the database so only one page of pets is loaded
+        paginator = Paginator(all_pets, 12)  # Show 12 pets per page
+        page_obj = paginator.get_page(request.GET.get('page'))
+    else:
+        # The radius filter runs in Python: stream (id, location) pairs and keep matching ids,
+        # then load only the pets on the requested page. A union can only be ordered by a
+        # selected column, so the sort field is selected too.
+        matching_ids = []
+        rows = all_pets.values_list('id', 'location', ordering.lstrip('-')).iterator(chunk_size=2000)
+        for pet_id, pet_location, _ in rows:
+            distance = Pet(location=pet_location).calculate_distance(location)
+            # Include pet if distance is within radius or distance calculation failed
+            if distance is None or distance <= radius_value:
+                matching_ids.append(pet_id)
+        paginator = Paginator(matching_ids, 12)  # Show 12 pets per page
+        page_obj = paginator.get_page(request.GET.get('page'))
+        pets_by_id = Pet.objects.select_related('owner').in_bulk(page_obj.object_list)
+        page_obj.object_list = [pets_by_id[pet_id] for pet_id in page_obj.object_list if pet_id in pets_by_id]
+    
+    # Add distance for display if location is provided
+    if location:
+        for pet in page_obj:
             pet.distance = pet.calculate_distance(location)
     
-    # Apply sorting
-    if sort == 'oldest':
-        pet_list.sort(key=lambda x: x.created_at)
-    elif sort == 'updated':
-        # Assuming there's an updated_at field, if not we can use created_at
-        pet_list.sort(key=lambda x: x.created_at)
-    else:  # newest (default)
-        pet_list.sort(key=lambda x: x.created_at, reverse=True)
-    
-    # Apply pagination
-    paginator = Paginator(pet_list, 12)  # Show 12 pets per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
     context = {
         'now': timezone.now(),
         'pets': page_obj,
         'paginator': paginator,
         'page_obj': page_obj
     }
-    return render(request, 'all_pets.html', context)
+    return render_public_shell(request, 'all_pets.html', context)
 
 
 # User registration view
@@ -352,16 +420,15 @@ def register(request):
     if request.method == 'POST':
         form = UserRegisterForm(request.POST)
         if form.is_valid():
-            user = form.save()  # Save the user
-            
             # Handle additional fields (full name and phone)
             full_name = request.POST.get('full_name', '')
             phone = request.POST.get('phone', '')
             
-            # Update user's phone number if provided
+            # Set the phone number before the user is saved, so it is written with a single INSERT
+            user = form.save(commit=False)
             if phone:
                 user.phone_number = phone
-                user.save()
+            user.save()
             
             # Process full name if provided
             if full_name:
@@ -440,21 +507,21 @@ def profile(request):
     Display and update user profile information.
     Requires user to be logged in.
     """
-    # Ensure the user has a profile
-    from django.apps import apps
     from django.utils import timezone
-    ProfileModel = apps.get_model('main', 'Profile')
-    profile_obj, created = ProfileModel.objects.get_or_create(user=request.user)
+    # Read the profile without writing; one missing for an older account is
+    # created when the form is first saved. Reading it through request.user
+    # also caches it for the template's user.profile.
+    try:
+        profile_obj = request.user.profile
+    except Profile.DoesNotExist:
+        profile_obj = Profile(user=request.user)
     
     # Calculate impact metrics
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    
     # Pets Reported - total number of pets the user has reported (both lost and found)
-    pets_reported_count = PetModel.objects.filter(owner=request.user).count()
+    pets_reported_count = Pet.objects.filter(owner=request.user).count()
     
     # Pets Helped - total number of pets the user helped (reports accepted and closed as reunited)
-    pets_helped_count = RequestModel.objects.filter(
+    pets_helped_count = Request.objects.filter(
         pet__owner=request.user,
         status='accepted'
     ).count()
@@ -468,8 +535,11 @@ def profile(request):
         u_form = UserUpdateForm(request.POST, instance=request.user)
         p_form = ProfileUpdateForm(request.POST, request.FILES, instance=profile_obj)
         if u_form.is_valid() and p_form.is_valid():
-            u_form.save()
-            p_form.save()
+            # Only write what changed
+            if u_form.has_changed():
+                u_form.save()
+            if p_form.has_changed():
+                p_form.save()
             messages.success(request, 'Your profile information has been saved.')
             return redirect('profile')
         else:
@@ -491,16 +561,27 @@ def profile(request):
 # Email validation view
 # Provides AJAX endpoint for real-time email availability checking
 
-def validate_email(request):
+@throttle('validate_email')
+async def validate_email(request):
     """
     AJAX endpoint to check if an email address is already taken.
     Used for real-time form validation during registration.
+    Answers are cached for VALIDATE_EMAIL_CACHE_TIMEOUT seconds, and each client
+    address is throttled, so the endpoint cannot be used to test addresses in bulk.
     """
-    email = request.GET.get('email', None)
-    data = {
-        'is_taken': User.objects.filter(email__iexact=email).exists()
-    }
-    return JsonResponse(data)
+    email = request.GET.get('email', '').strip()
+    if not email:
+        return JsonResponse({'is_taken': False})
+
+    key = email_taken_cache_key(email)
+    is_taken = await cache.aget(key)
+    if is_taken is None:
+        # Compared on LOWER(email) so the lookup uses user_email_lower_idx
+        is_taken = await User.objects.annotate(
+            email_lower=Lower('email'),
+        ).filter(email_lower=Lower(Value(email))).aexists()
+        await cache.aset(key, is_taken, settings.VALIDATE_EMAIL_CACHE_TIMEOUT)
+    return JsonResponse({'is_taken': is_taken})
 
 
 # Report found pet view
@@ -531,11 +612,7 @@ def report_found_pet(request):
             pet.save()
             
             # Create a request record linking the pet to the user
-            # Using apps.get_model to avoid potential naming conflicts
-            from django.apps import apps
-            RequestModel = apps.get_model('main', 'Request')
-            ActivityLogModel = apps.get_model('main', 'ActivityLog')
-            request_obj = RequestModel.objects.create(
+            request_obj = Request.objects.create(
                 user=request.user,
                 pet=pet,
                 request_type='found',  # Found pet report
@@ -544,7 +621,7 @@ def report_found_pet(request):
             )
             
             # Log the creation activity
-            ActivityLogModel.objects.create(
+            ActivityLog.objects.create(
                 pet=pet,
                 activity_type='created',
                 actor=f"user-{request.user.username}",
@@ -552,8 +629,7 @@ def report_found_pet(request):
             )
             
             # Create admin notification
-            NotificationModel = apps.get_model('main', 'Notification')
-            NotificationModel.objects.create(
+            Notification.objects.create(
                 request=request_obj,
                 message=f"New found pet report submitted by {request.user.username} for a {pet.pet_type} near {pet.location}",
                 notification_type='found_report'
@@ -584,10 +660,7 @@ def report_lost_pet(request):
         form = LostPetForm(request.POST, request.FILES)
         if form.is_valid():
             # Create a pet object with the form data
-            from django.apps import apps
-            PetModel = apps.get_model('main', 'Pet')
-            ActivityLogModel = apps.get_model('main', 'ActivityLog')
-            pet = PetModel(
+            pet = Pet(
                 owner=request.user,
                 pet_type=form.cleaned_data['pet_type'],
                 breed=form.cleaned_data['breed'],
@@ -603,8 +676,7 @@ def report_lost_pet(request):
             pet.save()
             
             # Create a request record linking the pet to the user
-            RequestModel = apps.get_model('main', 'Request')
-            request_obj = RequestModel.objects.create(
+            request_obj = Request.objects.create(
                 user=request.user,
                 pet=pet,
                 request_type='lost',  # Lost pet report
@@ -613,7 +685,7 @@ def report_lost_pet(request):
             )
             
             # Log the creation activity
-            ActivityLogModel.objects.create(
+            ActivityLog.objects.create(
                 pet=pet,
                 activity_type='created',
                 actor=f"user-{request.user.username}",
@@ -621,8 +693,7 @@ def report_lost_pet(request):
             )
             
             # Create admin notification
-            NotificationModel = apps.get_model('main', 'Notification')
-            NotificationModel.objects.create(
+            Notification.objects.create(
                 request=request_obj,
                 message=f"New lost pet report submitted by {request.user.username} for a {pet.pet_type} near {pet.location}",
                 notification_type='lost_report'
@@ -652,10 +723,8 @@ def report_success(request):
     """
     # Get the report type from session
     report_type = request.session.get('report_type', 'found')
-    context = {
-        'report_type': report_type
-    }
-    return render(request, 'success.html', context)
+    template_name = 'success_lost.html' if report_type == 'lost' else 'success_found.html'
+    return render(request, template_name)
 
 
 # Success page view for lost pet reports
@@ -673,38 +742,66 @@ def report_found_success(request):
 
 
 # Pet detail view
+@read_from_replica
+@conditional_response(pet_detail_last_modified)
+@cache_public_page
 def pet_detail(request, pet_id):
     """
     Display detailed information about a specific pet.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    PetImageModel = apps.get_model('main', 'PetImage')
-    
     # Get the pet object
-    pet = get_object_or_404(PetModel, id=pet_id)
+    pet = get_object_or_404(Pet, id=pet_id)
     
     # Get associated request if it exists
     try:
-        pet_request = RequestModel.objects.get(pet=pet)
-    except RequestModel.DoesNotExist:
+        pet_request = Request.objects.get(pet=pet)
+    except Request.DoesNotExist:
         pet_request = None
     
     # Get all images for this pet
-    pet_images = PetImageModel.objects.filter(pet=pet)
+    pet_images = PetImage.objects.filter(pet=pet)
+    
+    # Determine breadcrumb based on referrer
+    referrer = request.GET.get('ref', 'all_pets')  # Default to 'all_pets'
+    
+    # Get similar pets based on breed, type, and location
+    similar_pets = Pet.objects.filter(
+        pet_type=pet.pet_type,
+        breed=pet.breed
+    ).exclude(id=pet.id)[:6]  # Limit to 6 similar pets
     
+    # Add distance to similar pets if location is available
+    for similar_pet in similar_pets:
+        similar_pet.distance = similar_pet.calculate_distance(pet.location)
+    
+    context = {
+        'pet': pet,
+        'pet_request': pet_request,
+        'pet_images': pet_images,
+        'show_contact_info': False,
+        'contact_info': None,
+        'now': timezone.now(),
+        'referrer': referrer,
+        'similar_pets': similar_pets
+    }
+    return render_public_shell(request, 'pet_detail.html', context)
+
+
+def _pet_contact_context(user, pet, pet_request):
+    """
+    Decide whether a user may see a pet reporter's contact details.
+    Returns the show_contact_info flag and contact_info dict used by the pet detail templates.
+    """
     # Check if user has permission to view contact information
     show_contact_info = False
     contact_info = None
     
-    if request.user.is_authenticated:
+    if user.is_authenticated:
         # User is the reporter
-        if pet.owner == request.user:
+        if pet.owner_id == user.id:
             show_contact_info = True
         # User is admin
-        elif request.user.is_superuser:
+        elif user.is_superuser:
             show_contact_info = True
         # User has permission (for future implementation)
         # This could be extended with specific permissions
@@ -717,30 +814,63 @@ def pet_detail(request, pet_id):
             'reporter_phone': pet_request.phone_number or pet.owner.phone_number
         }
     
-    # Determine breadcrumb based on referrer
-    referrer = request.GET.get('ref', 'all_pets')  # Default to 'all_pets'
-    
-    # Get similar pets based on breed, type, and location
-    similar_pets = PetModel.objects.filter(
-        pet_type=pet.pet_type,
-        breed=pet.breed
-    ).exclude(id=pet.id)[:6]  # Limit to 6 similar pets
-    
-    # Add distance to similar pets if location is available
-    for similar_pet in similar_pets:
-        similar_pet.distance = similar_pet.calculate_distance(pet.location)
-    
-    context = {
-        'pet': pet,
-        'pet_request': pet_request,
-        'pet_images': pet_images,
+    return {
         'show_contact_info': show_contact_info,
         'contact_info': contact_info,
-        'now': timezone.now(),
-        'referrer': referrer,
-        'similar_pets': similar_pets
     }
-    return render(request, 'pet_detail.html', context)
+
+
+# Page personalization endpoint
+# Supplies the user-specific fragments of cached public page shells
+
+PERSONAL_SLOT_TEMPLATES = {
+    'nav_items': 'partials/nav_items.html',
+    'mobile_nav_items': 'partials/mobile_nav_items.html',
+    'notification_bell_mobile': 'partials/notification_bell_mobile.html',
+    'messages': 'partials/messages.html',
+    'home_hero_actions': 'partials/home_hero_actions.html',
+    'home_cta': 'partials/home_cta.html',
+    'pet_contact_info': 'partials/pet_contact_info.html',
+    'pet_contact_actions': 'partials/pet_contact_actions.html',
+}
+
+# Slots that depend on the pet being viewed
+PET_PERSONAL_SLOTS = {'pet_contact_info', 'pet_contact_actions'}
+
+
+@never_cache
+def api_personalization(request):
+    """
+    Return the rendered user-specific fragments for a public page shell as JSON.
+    The page lists the slots it contains; pet pages also pass the pet id.
+    """
+    requested_slots = [
+        name for name in request.GET.get('slots', '').split(',')
+        if name in PERSONAL_SLOT_TEMPLATES
+    ]
+    
+    context = {'user': request.user}
+    
+    # Pet contact slots need the pet and the permission check
+    pet_id = request.GET.get('pet', '')
+    if pet_id.isdigit() and PET_PERSONAL_SLOTS.intersection(requested_slots):
+        pet = Pet.objects.select_related('owner').filter(id=pet_id).first()
+        if pet is not None:
+            pet_request = Request.objects.filter(pet=pet).first()
+            context['pet'] = pet
+            context.update(_pet_contact_context(request.user, pet, pet_request))
+    
+    slots = {}
+    for name in requested_slots:
+        if name in PET_PERSONAL_SLOTS and 'pet' not in context:
+            continue
+        slots[name] = render_to_string(PERSONAL_SLOT_TEMPLATES[name], context, request=request)
+    
+    return JsonResponse({
+        'is_authenticated': request.user.is_authenticated,
+        'is_superuser': request.user.is_superuser,
+        'slots': slots,
+    })
 
 
 # Admin Dashboard Views
@@ -758,15 +888,12 @@ def admin_dashboard(request):
     Redirects non-admin users or shows access denied message.
     """
     # Get counts for each status
-    from django.apps import apps
-    RequestModel = apps.get_model('main', 'Request')
-    
-    pending_count = RequestModel.objects.filter(status='pending').count()
-    accepted_count = RequestModel.objects.filter(status='accepted').count()
-    rejected_count = RequestModel.objects.filter(status='rejected').count()
+    pending_count = Request.objects.filter(status='pending').count()
+    accepted_count = Request.objects.filter(status='accepted').count()
+    rejected_count = Request.objects.filter(status='rejected').count()
     
     # Get recent pending requests (limit to 5 for dashboard preview)
-    recent_pending = RequestModel.objects.select_related('user', 'pet').filter(status='pending')[:5]
+    recent_pending = Request.objects.select_related('user', 'pet').filter(status='pending')[:5]
     
     context = {
         'pending_count': pending_count,
@@ -782,9 +909,7 @@ def admin_dashboard(request):
 def admin_pending_requests(request):
     """Display pending requests with filtering, sorting, and pagination."""
     # Get all pending requests
-    from django.apps import apps
-    RequestModel = apps.get_model('main', 'Request')
-    requests = RequestModel.objects.select_related('user', 'pet').filter(status='pending')
+    requests = Request.objects.select_related('user', 'pet').filter(status='pending')
     
     # Apply filters
     pet_type = request.GET.get('pet_type')
@@ -819,13 +944,10 @@ def admin_pending_requests(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get Pet and Request models for choices
-    PetModel = apps.get_model('main', 'Pet')
-    
     context = {
         'requests': page_obj,
-        'pet_types': PetModel.PET_TYPES,
-        'request_types': RequestModel.REQUEST_TYPES,
+        'pet_types': Pet.PET_TYPES,
+        'request_types': Request.REQUEST_TYPES,
         'current_filters': {
             'pet_type': pet_type,
             'request_type': request_type,
@@ -841,9 +963,7 @@ def admin_pending_requests(request):
 def admin_accepted_requests(request):
     """Display accepted requests with filtering, sorting, and pagination."""
     # Get all accepted requests
-    from django.apps import apps
-    RequestModel = apps.get_model('main', 'Request')
-    requests = RequestModel.objects.select_related('user', 'pet').filter(status='accepted')
+    requests = Request.objects.select_related('user', 'pet').filter(status='accepted')
     
     # Apply filters
     pet_type = request.GET.get('pet_type')
@@ -878,13 +998,10 @@ def admin_accepted_requests(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get Pet and Request models for choices
-    PetModel = apps.get_model('main', 'Pet')
-    
     context = {
         'requests': page_obj,
-        'pet_types': PetModel.PET_TYPES,
-        'request_types': RequestModel.REQUEST_TYPES,
+        'pet_types': Pet.PET_TYPES,
+        'request_types': Request.REQUEST_TYPES,
         'current_filters': {
             'pet_type': pet_type,
             'request_type': request_type,
@@ -900,9 +1017,7 @@ def admin_accepted_requests(request):
 def admin_rejected_requests(request):
     """Display rejected requests with filtering, sorting, and pagination."""
     # Get all rejected requests
-    from django.apps import apps
-    RequestModel = apps.get_model('main', 'Request')
-    requests = RequestModel.objects.select_related('user', 'pet').filter(status='rejected')
+    requests = Request.objects.select_related('user', 'pet').filter(status='rejected')
     
     # Apply filters
     pet_type = request.GET.get('pet_type')
@@ -937,13 +1052,10 @@ def admin_rejected_requests(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get Pet and Request models for choices
-    PetModel = apps.get_model('main', 'Pet')
-    
     context = {
         'requests': page_obj,
-        'pet_types': PetModel.PET_TYPES,
-        'request_types': RequestModel.REQUEST_TYPES,
+        'pet_types': Pet.PET_TYPES,
+        'request_types': Request.REQUEST_TYPES,
         'current_filters': {
             'pet_type': pet_type,
             'request_type': request_type,
@@ -963,25 +1075,74 @@ def admin_notifications(request):
     return render(request, 'admin/notifications.html')
 
 
+# Admin metrics endpoint
+# Request duration histograms in Prometheus text format, for superusers or a scraper with METRICS_TOKEN
+
+@never_cache
+def admin_metrics(request):
+    """
+    Expose the per-URL request histograms collected by RequestMetricsMiddleware.
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    has_token = bool(token) and hmac.compare_digest(authorization, f'Bearer {token}')
+    if not has_token and not request.user.is_superuser:
+        return HttpResponseForbidden(b"Admin access required")
+
+    return HttpResponse(
+        metrics_registry.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+# Admin request profiles
+# Lists the cProfile captures taken with ?profile=1 (see profiling.py) and serves them for download
+
+@never_cache
+@user_passes_test(admin_check, login_url='login')
+def admin_profiles(request):
+    """
+    Display the saved request profiles, newest first, with their slowest functions.
+    """
+    context = {
+        'profiles': list_profiles(),
+        'profile_keep': settings.REQUEST_PROFILE_KEEP,
+        'profiling_enabled': settings.REQUEST_PROFILING,
+    }
+    return render(request, 'admin/profiles.html', context)
+
+
+@never_cache
+@user_passes_test(admin_check, login_url='login')
+def admin_profile_download(request, name):
+    """
+    Download a saved .prof file.
+    """
+    path = profile_path(name)
+    if path is None or not os.path.exists(path):
+        raise Http404("Profile not found")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name, content_type='application/octet-stream')
+
+
 @user_passes_test(admin_check, login_url='login')
 def update_request_status(request, request_id):
     """Update request status (Pending → Accepted/Rejected)."""
     if request.method == 'POST':
         new_status = request.POST.get('status')
         # Update the request status
-        from django.apps import apps
-        RequestModel = apps.get_model('main', 'Request')
-        ActivityLogModel = apps.get_model('main', 'ActivityLog')
         try:
-            req = RequestModel.objects.get(id=request_id)
+            req = Request.objects.get(id=request_id)
             # Store the old status for logging
             old_status = req.status
             # Convert status to lowercase to match model choices
             req.status = new_status.lower()
             req.save()
             
+            # A status change is an update to the pet's report
+            req.pet.touch()
+            
             # Log the status change activity
-            ActivityLogModel.objects.create(
+            ActivityLog.objects.create(
                 pet=req.pet,
                 activity_type='status_changed',
                 actor=f"admin-{request.user.username}",
@@ -989,7 +1150,7 @@ def update_request_status(request, request_id):
             )
             
             messages.success(request, f'Request status has been updated to {new_status}.')
-        except RequestModel.DoesNotExist:
+        except Request.DoesNotExist:
             messages.error(request, 'The requested item could not be found.')
         return redirect('admin_pending_requests')
     
@@ -1002,19 +1163,15 @@ def user_requests(request):
     Display all pet reports (lost and found) submitted by the logged-in user.
     Shows pet details, request status, and allows editing/deleting pending reports.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    
     # Get all pets reported by the current user
-    user_pets = PetModel.objects.filter(owner=request.user).order_by('-created_at')
+    user_pets = Pet.objects.filter(owner=request.user).order_by('-created_at')
     
     # Get requests associated with these pets
-    pet_requests = RequestModel.objects.filter(pet__in=user_pets)
+    pet_requests = Request.objects.filter(pet__in=user_pets)
     
     # Create a dictionary to map pet IDs to their requests
-    pet_request_map = {req.pet.id: req for req in pet_requests}
+    # pet_id avoids loading each request's pet again
+    pet_request_map = {req.pet_id: req for req in pet_requests}
     
     # Add status messages based on request status
     for pet in user_pets:
@@ -1045,23 +1202,17 @@ def edit_user_request(request, pet_id):
     """
     Allow users to edit their pet reports if the status is pending.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    ActivityLogModel = apps.get_model('main', 'ActivityLog')
-    
     # Get the pet object
-    pet = get_object_or_404(PetModel, id=pet_id, owner=request.user)
+    pet = get_object_or_404(Pet, id=pet_id, owner=request.user)
     
     # Check if there's a request associated with this pet
     try:
-        pet_request = RequestModel.objects.get(pet=pet)
+        pet_request = Request.objects.get(pet=pet)
         # Only allow editing if status is pending
         if pet_request.status != 'pending':
             messages.error(request, "Only reports that are pending review can be edited.")
             return redirect('user_requests')
-    except RequestModel.DoesNotExist:
+    except Request.DoesNotExist:
         messages.error(request, "No request record was found for this pet.")
         return redirect('user_requests')
     
@@ -1086,11 +1237,10 @@ def edit_user_request(request, pet_id):
             pet.image = request.FILES['image']
             changes.append("image: updated")
         
-        pet.save()
-        
-        # Log the edit activity
+        # Save and log only when something changed so updated_at stays meaningful
         if changes:
-            ActivityLogModel.objects.create(
+            pet.save()
+            ActivityLog.objects.create(
                 pet=pet,
                 activity_type='edited',
                 actor=f"user-{request.user.username}",
@@ -1113,28 +1263,22 @@ def delete_user_request(request, pet_id):
     Allow users to delete their pet reports if the status is pending.
     """
     if request.method == 'POST':
-        # Get model classes using apps.get_model to avoid linter issues
-        from django.apps import apps
-        PetModel = apps.get_model('main', 'Pet')
-        RequestModel = apps.get_model('main', 'Request')
-        ActivityLogModel = apps.get_model('main', 'ActivityLog')
-        
         # Get the pet object
-        pet = get_object_or_404(PetModel, id=pet_id, owner=request.user)
+        pet = get_object_or_404(Pet, id=pet_id, owner=request.user)
         
         # Check if there's a request associated with this pet
         try:
-            pet_request = RequestModel.objects.get(pet=pet)
+            pet_request = Request.objects.get(pet=pet)
             # Only allow deleting if status is pending
             if pet_request.status != 'pending':
                 messages.error(request, "Only reports that are pending review can be deleted.")
                 return redirect('user_requests')
-        except RequestModel.DoesNotExist:
+        except Request.DoesNotExist:
             # If no request exists, we can still delete the pet
             pass
         
         # Log the deletion activity
-        ActivityLogModel.objects.create(
+        ActivityLog.objects.create(
             pet=pet,
             activity_type='deleted',
             actor=f"user-{request.user.username}",
@@ -1151,38 +1295,52 @@ def delete_user_request(request, pet_id):
 
 
 # API Views for Dashboard
+# Each endpoint group has its own throttle class (see main/throttling.py). On GET
+# views conditional_response sits inside api_view, so DRF checks the throttle
+# before a revalidating client can be answered with 304.
 
+@read_from_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([DashboardThrottle])
+@conditional_response(user_requests_last_modified, private=True)
 def api_user_requests(request):
     """
     API endpoint to return all reports of the logged-in user (found + lost).
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    ActivityLogModel = apps.get_model('main', 'ActivityLog')
+    # Get all pets reported by the current user, with their requests and latest 5
+    # activity log entries fetched in two extra queries instead of two per pet
+    user_pets = Pet.objects.filter(owner=request.user).order_by('-created_at').prefetch_related(
+        Prefetch('request_set', queryset=Request.objects.order_by('id'), to_attr='prefetched_requests'),
+        Prefetch('activitylog_set', queryset=ActivityLog.objects.all()[:5], to_attr='latest_activity'),
+    )
     
-    # Get all pets reported by the current user
-    user_pets = PetModel.objects.filter(owner=request.user).order_by('-created_at')
+    # Incremental sync: only return reports updated after the given timestamp
+    updated_since = request.query_params.get('updated_since')
+    if updated_since:
+        updated_since_value = parse_datetime(updated_since)
+        if updated_since_value is None:
+            return Response({'error': 'updated_since must be an ISO 8601 timestamp.'},
+                           status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(updated_since_value):
+            updated_since_value = timezone.make_aware(updated_since_value)
+        user_pets = user_pets.filter(updated_at__gt=updated_since_value)
     
     # Prepare response data
     reports_data = []
     for pet in user_pets:
         # Get associated request
-        try:
-            pet_request = RequestModel.objects.get(pet=pet)
+        if pet.prefetched_requests:
+            pet_request = pet.prefetched_requests[0]
             request_status = pet_request.status
             request_type = pet_request.request_type
-        except RequestModel.DoesNotExist:
+        else:
             request_status = 'unknown'
             request_type = 'unknown'
         
-        # Get activity log entries for this pet (latest 5)
-        activity_logs = ActivityLogModel.objects.filter(pet=pet)[:5]
+        # Activity log entries for this pet (latest 5)
         timeline = []
-        for log in activity_logs:
+        for log in pet.latest_activity:
             timeline.append({
                 'activity_type': log.activity_type,
                 'timestamp': log.timestamp.isoformat(),
@@ -1213,7 +1371,7 @@ def api_user_requests(request):
             'request_type': request_type,
             'status_message': status_message,
             'created_at': pet.created_at.isoformat(),
-            'updated_at': pet.created_at.isoformat(),  # For now, using created_at
+            'updated_at': pet.updated_at.isoformat(),
             'timeline': timeline
         })
     
@@ -1222,31 +1380,26 @@ def api_user_requests(request):
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([DashboardThrottle])
 def api_edit_request(request, pet_id):
     """
     API endpoint to edit a report (only if Pending and owned by user).
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    ActivityLogModel = apps.get_model('main', 'ActivityLog')
-    
     # Get the pet object
     try:
-        pet = PetModel.objects.get(id=pet_id, owner=request.user)
-    except PetModel.DoesNotExist:
+        pet = Pet.objects.get(id=pet_id, owner=request.user)
+    except Pet.DoesNotExist:
         return Response({'error': 'Report not found or you do not have permission to edit it.'}, 
                        status=status.HTTP_404_NOT_FOUND)
     
     # Check if there's a request associated with this pet
     try:
-        pet_request = RequestModel.objects.get(pet=pet)
+        pet_request = Request.objects.get(pet=pet)
         # Only allow editing if status is pending
         if pet_request.status != 'pending':
             return Response({'error': 'Only pending reports can be edited or deleted.'}, 
                            status=status.HTTP_403_FORBIDDEN)
-    except RequestModel.DoesNotExist:
+    except Request.DoesNotExist:
         return Response({'error': 'No request found for this pet.'}, 
                        status=status.HTTP_404_NOT_FOUND)
     
@@ -1268,11 +1421,10 @@ def api_edit_request(request, pet_id):
         pet.image = request.FILES['image']
         changes.append("image: updated")
     
-    pet.save()
-    
-    # Log the edit activity
+    # Save and log only when something changed so updated_at stays meaningful
     if changes:
-        ActivityLogModel.objects.create(
+        pet.save()
+        ActivityLog.objects.create(
             pet=pet,
             activity_type='edited',
             actor=f"user-{request.user.username}",
@@ -1284,36 +1436,31 @@ def api_edit_request(request, pet_id):
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([DashboardThrottle])
 def api_delete_request(request, pet_id):
     """
     API endpoint to delete a report (only if Pending and owned by user).
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    RequestModel = apps.get_model('main', 'Request')
-    ActivityLogModel = apps.get_model('main', 'ActivityLog')
-    
     # Get the pet object
     try:
-        pet = PetModel.objects.get(id=pet_id, owner=request.user)
-    except PetModel.DoesNotExist:
+        pet = Pet.objects.get(id=pet_id, owner=request.user)
+    except Pet.DoesNotExist:
         return Response({'error': 'Report not found or you do not have permission to delete it.'}, 
                        status=status.HTTP_404_NOT_FOUND)
     
     # Check if there's a request associated with this pet
     try:
-        pet_request = RequestModel.objects.get(pet=pet)
+        pet_request = Request.objects.get(pet=pet)
         # Only allow deleting if status is pending
         if pet_request.status != 'pending':
             return Response({'error': 'Only pending reports can be edited or deleted.'}, 
                            status=status.HTTP_403_FORBIDDEN)
-    except RequestModel.DoesNotExist:
+    except Request.DoesNotExist:
         # If no request exists, we can still delete the pet
         pass
     
     # Log the deletion activity
-    ActivityLogModel.objects.create(
+    ActivityLog.objects.create(
         pet=pet,
         activity_type='deleted',
         actor=f"user-{request.user.username}",
@@ -1327,48 +1474,107 @@ def api_delete_request(request, pet_id):
     return Response({'message': f'Report for {pet_name} has been deleted successfully.'})
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def api_request_history(request, pet_id):
+# Async JSON endpoints
+# Served without a thread per request under ASGI (see petrescue/asgi.py). DRF's
+# api_view is synchronous, so these authenticate like its default session and Basic
+# authentication themselves and answer like IsAuthenticated does, and are throttled
+# with throttle() instead of a DRF throttle class (before the conditional check, so
+# 304s also take a token).
+
+async def _request_user(request):
+    """
+    Return the request's user. It is also stored as request.user, so middleware
+    reading request.user under WSGI does not load it a second time.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+def _not_authenticated():
+    return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+
+
+def basic_authentication(view_func):
+    """
+    Sign in API clients that send HTTP Basic credentials, as DRF's BasicAuthentication
+    did for these views. Applied outermost, so the throttle and the conditional check
+    see the same user as the view.
+    """
+    @wraps(view_func)
+    async def _wrapped_view(request, *args, **kwargs):
+        auth = request.headers.get('Authorization', '').split()
+        if not auth or auth[0].lower() != 'basic':
+            return await view_func(request, *args, **kwargs)
+
+        try:
+            if len(auth) != 2:
+                raise ValueError
+            username, password = base64.b64decode(auth[1], validate=True).decode('utf-8').split(':', 1)
+        except ValueError:
+            return JsonResponse({'detail': 'Invalid basic header.'}, status=403)
+        user = await aauthenticate(request, username=username, password=password)
+        if user is None:
+            return JsonResponse({'detail': 'Invalid username/password.'}, status=403)
+
+        async def auser():
+            return user
+
+        request.user = user
+        request.auser = auser
+        return await view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
+@basic_authentication
+@throttle('dashboard', by_user=True)
+@conditional_response(arequest_history_last_modified, private=True)
+@require_safe
+async def api_request_history(request, pet_id):
     """
     API endpoint to return timeline/activity for a report.
     """
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    ActivityLogModel = apps.get_model('main', 'ActivityLog')
-    
+    user = await _request_user(request)
+    if not user.is_authenticated:
+        return _not_authenticated()
+
     # Get the pet object
-    try:
-        pet = PetModel.objects.get(id=pet_id, owner=request.user)
-    except PetModel.DoesNotExist:
-        return Response({'error': 'Report not found or you do not have permission to view it.'}, 
-                       status=status.HTTP_404_NOT_FOUND)
+    pet = await Pet.objects.filter(id=pet_id, owner=user).afirst()
+    if pet is None:
+        return JsonResponse({'error': 'Report not found or you do not have permission to view it.'},
+                            status=404)
     
     # Get activity log entries for this pet (all, ordered by timestamp)
-    activity_logs = ActivityLogModel.objects.filter(pet=pet).order_by('timestamp')
-    
-    timeline = []
-    for log in activity_logs:
-        timeline.append({
+    timeline = [
+        {
             'id': log.id,
             'activity_type': log.activity_type,
             'timestamp': log.timestamp.isoformat(),
             'actor': log.actor,
             'details': log.details
-        })
+        }
+        async for log in ActivityLog.objects.filter(pet=pet).order_by('timestamp')
+    ]
     
-    return Response({'timeline': timeline})
+    return JsonResponse({'timeline': timeline})
 
 
 # Admin Notification API Views
 # API endpoints for managing admin notifications
 
+# Notifications returned by api_admin_notifications by default, and the most a client can ask for
+NOTIFICATIONS_PAGE_SIZE = 50
+NOTIFICATIONS_MAX_PAGE_SIZE = 200
+
+@read_from_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AdminNotificationsThrottle])
+@conditional_response(admin_notifications_last_modified, private=True)
 def api_admin_notifications(request):
     """
-    API endpoint to return all admin notifications (unread + read).
+    API endpoint to return the latest admin notifications, newest first, and their total count.
+    ?limit= sets how many are returned (default 50, at most 200) and ?unread=1 returns only unread ones.
     Only accessible by admin users.
     """
     # Check if user is admin
@@ -1376,16 +1582,23 @@ def api_admin_notifications(request):
         return Response({'error': 'Access denied. Admin privileges required.'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    NotificationModel = apps.get_model('main', 'Notification')
+    # Get notifications ordered by creation time
+    notifications = Notification.objects.select_related('request__pet', 'request__user', 'contact_submission__related_pet', 'contact_submission__user').all()
+    if request.GET.get('unread') == '1':
+        notifications = notifications.filter(is_read=False)
     
-    # Get all notifications ordered by creation time
-    notifications = NotificationModel.objects.select_related('request__pet', 'request__user', 'contact_submission__related_pet', 'contact_submission__user').all()
+    # Only the latest `limit` notifications are loaded and serialized
+    try:
+        limit = int(request.GET.get('limit', NOTIFICATIONS_PAGE_SIZE))
+    except ValueError:
+        limit = NOTIFICATIONS_PAGE_SIZE
+    limit = max(1, min(limit, NOTIFICATIONS_MAX_PAGE_SIZE))
+    notification_list = list(notifications[:limit])
+    total = len(notification_list) if len(notification_list) < limit else notifications.count()
     
     # Prepare response data
     notifications_data = []
-    for notification in notifications:
+    for notification in notification_list:
         notification_data = {
             'id': notification.id,
             'message': notification.message,
@@ -1433,33 +1646,35 @@ def api_admin_notifications(request):
         
         notifications_data.append(notification_data)
     
-    return Response({'notifications': notifications_data})
+    return Response({'notifications': notifications_data, 'total': total})
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def api_admin_unread_count(request):
+@basic_authentication
+@throttle('admin_notifications', by_user=True)
+@conditional_response(aadmin_notifications_last_modified, private=True)
+@require_safe
+async def api_admin_unread_count(request):
     """
     API endpoint to return the count of unread admin notifications.
     Only accessible by admin users.
     """
+    user = await _request_user(request)
+    if not user.is_authenticated:
+        return _not_authenticated()
+
     # Check if user is admin
-    if not request.user.is_superuser:
-        return Response({'error': 'Access denied. Admin privileges required.'}, 
-                       status=status.HTTP_403_FORBIDDEN)
-    
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    NotificationModel = apps.get_model('main', 'Notification')
+    if not user.is_superuser:
+        return JsonResponse({'error': 'Access denied. Admin privileges required.'}, status=403)
     
     # Count unread notifications
-    unread_count = NotificationModel.objects.filter(is_read=False).count()
+    unread_count = await Notification.objects.filter(is_read=False).acount()
     
-    return Response({'unread_count': unread_count})
+    return JsonResponse({'unread_count': unread_count})
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AdminNotificationsThrottle])
 def api_admin_mark_read(request, notification_id):
     """
     API endpoint to mark a notification as read.
@@ -1470,14 +1685,10 @@ def api_admin_mark_read(request, notification_id):
         return Response({'error': 'Access denied. Admin privileges required.'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    NotificationModel = apps.get_model('main', 'Notification')
-    
     # Get the notification
     try:
-        notification = NotificationModel.objects.get(id=notification_id)
-    except NotificationModel.DoesNotExist:
+        notification = Notification.objects.get(id=notification_id)
+    except Notification.DoesNotExist:
         return Response({'error': 'Notification not found.'}, 
                        status=status.HTTP_404_NOT_FOUND)
     
@@ -1490,6 +1701,7 @@ def api_admin_mark_read(request, notification_id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AdminNotificationsThrottle])
 def api_admin_mark_all_read(request):
     """
     API endpoint to mark all notifications as read.
@@ -1500,18 +1712,36 @@ def api_admin_mark_all_read(request):
         return Response({'error': 'Access denied. Admin privileges required.'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    # Get model classes using apps.get_model to avoid linter issues
-    from django.apps import apps
-    NotificationModel = apps.get_model('main', 'Notification')
-    
     # Mark all notifications as read
-    NotificationModel.objects.filter(is_read=False).update(is_read=True)
+    Notification.objects.filter(is_read=False).update(is_read=True, updated_at=timezone.now())
     
     return Response({'message': 'All notifications marked as read.'})
 
 
 # Contact & Communication Module Views
 
+# Admin email notifications
+# An SMTP round trip can take seconds, so the email is handed to a background
+# thread once the submission is committed and the response does not wait for it
+
+_admin_email_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='admin-email')
+
+
+def _email_admin(subject, message):
+    """Email ADMIN_EMAIL in the background when an email backend is configured."""
+    admin_email = getattr(settings, 'ADMIN_EMAIL', None)
+    if not admin_email or settings.EMAIL_BACKEND == 'django.core.mail.backends.console.EmailBackend':
+        return
+    transaction.on_commit(lambda: _admin_email_executor.submit(
+        send_mail,
+        subject=subject,
+        message=message,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', None),
+        recipient_list=[admin_email],
+        fail_silently=True,
+    ))
+
+
 # Contact page view
 # Allows users to send messages to admin
 
@@ -1523,12 +1753,8 @@ def contact(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            # Get model classes using apps.get_model
-            from django.apps import apps
-            ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
-            
             # Create contact submission
-            submission = ContactSubmissionModel.objects.create(
+            submission = ContactSubmission.objects.create(
                 name=form.cleaned_data['name'],
                 email=form.cleaned_data['email'],
                 subject=form.cleaned_data['subject'],
@@ -1539,33 +1765,18 @@ def contact(request):
             )
             
             # Create admin notification
-            NotificationModel = apps.get_model('main', 'Notification')
             submitter_name = request.user.username if request.user.is_authenticated else submission.name
-            NotificationModel.objects.create(
+            Notification.objects.create(
                 contact_submission=submission,
                 message=f"New contact submission from {submitter_name}: {submission.subject}",
                 notification_type='contact_submission'
             )
             
             # Send email notification if email is configured
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                # Only send if email backend is configured
-                if hasattr(settings, 'EMAIL_BACKEND') and settings.EMAIL_BACKEND != 'django.core.mail.backends.console.EmailBackend':
-                    admin_email = getattr(settings, 'ADMIN_EMAIL', None)
-                    if admin_email:
-                        send_mail(
-                            subject=f'New Contact Submission: {submission.subject}',
-                            message=f'Name: {submission.name}\nEmail: {submission.email}\n\nMessage:\n{submission.message}',
-                            from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else None,
-                            recipient_list=[admin_email],
-                            fail_silently=True,
-                        )
-            except Exception:
-                # Email sending is optional, fail silently
-                pass
+            _email_admin(
+                subject=f'New Contact Submission: {submission.subject}',
+                message=f'Name: {submission.name}\nEmail: {submission.email}\n\nMessage:\n{submission.message}',
+            )
             
             messages.success(request, 'Thank you for contacting us! We\'ll get back to you soon.')
             return redirect('contact')
@@ -1595,20 +1806,14 @@ def report_issue(request, pet_id):
     """
     Handle issue reports related to specific pets.
     """
-    # Get model classes using apps.get_model
-    from django.apps import apps
-    PetModel = apps.get_model('main', 'Pet')
-    
     # Get the pet object
-    pet = get_object_or_404(PetModel, id=pet_id)
+    pet = get_object_or_404(Pet, id=pet_id)
     
     if request.method == 'POST':
         form = ReportIssueForm(request.POST)
         if form.is_valid():
-            ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
-            
             # Create contact submission linked to pet
-            submission = ContactSubmissionModel.objects.create(
+            submission = ContactSubmission.objects.create(
                 name=form.cleaned_data['name'],
                 email=form.cleaned_data['email'],
                 subject=form.cleaned_data['subject'],
@@ -1620,31 +1825,18 @@ def report_issue(request, pet_id):
             )
             
             # Create admin notification
-            NotificationModel = apps.get_model('main', 'Notification')
             submitter_name = request.user.username if request.user.is_authenticated else submission.name
-            NotificationModel.objects.create(
+            Notification.objects.create(
                 contact_submission=submission,
                 message=f"Issue report from {submitter_name} for pet {pet.breed} ({pet.pet_type})",
                 notification_type='issue_report'
             )
             
             # Send email notification if email is configured
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                if hasattr(settings, 'EMAIL_BACKEND') and settings.EMAIL_BACKEND != 'django.core.mail.backends.console.EmailBackend':
-                    admin_email = getattr(settings, 'ADMIN_EMAIL', None)
-                    if admin_email:
-                        send_mail(
-                            subject=f'Issue Report for Pet: {pet.breed}',
-                            message=f'Name: {submission.name}\nEmail: {submission.email}\nPet: {pet.breed} ({pet.pet_type})\n\nIssue:\n{submission.message}',
-                            from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else None,
-                            recipient_list=[admin_email],
-                            fail_silently=True,
-                        )
-            except Exception:
-                pass
+            _email_admin(
+                subject=f'Issue Report for Pet: {pet.breed}',
+                message=f'Name: {submission.name}\nEmail: {submission.email}\nPet: {pet.breed} ({pet.pet_type})\n\nIssue:\n{submission.message}',
+            )
             
             messages.success(request, 'Thank you for reporting this issue. We\'ll review it and take appropriate action.')
             return redirect('find_pets')
@@ -1677,11 +1869,8 @@ def admin_contact_submissions(request):
     Display all contact submissions with filtering, searching, and status management.
     Admin-only view.
     """
-    from django.apps import apps
-    ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
-    
     # Get all submissions
-    submissions = ContactSubmissionModel.objects.select_related('user', 'related_pet').all()
+    submissions = ContactSubmission.objects.select_related('user', 'related_pet').all()
     
     # Apply filters
     status_filter = request.GET.get('status')
@@ -1718,8 +1907,8 @@ def admin_contact_submissions(request):
     
     context = {
         'submissions': page_obj,
-        'status_choices': ContactSubmissionModel.STATUS_CHOICES,
-        'submission_type_choices': ContactSubmissionModel.SUBMISSION_TYPES,
+        'status_choices': ContactSubmission.STATUS_CHOICES,
+        'submission_type_choices': ContactSubmission.SUBMISSION_TYPES,
         'current_filters': {
             'status': status_filter,
             'submission_type': submission_type_filter,
@@ -1741,15 +1930,12 @@ def admin_contact_submission_detail(request, submission_id):
     Display detailed view of a contact submission.
     Admin-only view.
     """
-    from django.apps import apps
-    ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
-    
-    submission = get_object_or_404(ContactSubmissionModel, id=submission_id)
+    submission = get_object_or_404(ContactSubmission, id=submission_id)
     
     context = {
         'submission': submission,
-        'status_choices': ContactSubmissionModel.STATUS_CHOICES,
-        'submission_type_choices': ContactSubmissionModel.SUBMISSION_TYPES
+        'status_choices': ContactSubmission.STATUS_CHOICES,
+        'submission_type_choices': ContactSubmission.SUBMISSION_TYPES
     }
     
     return render(request, 'admin/contact_submission_detail.html', context)
@@ -1766,15 +1952,13 @@ def admin_update_submission_status(request, submission_id):
     """
     if request.method == 'POST':
         new_status = request.POST.get('status')
-        from django.apps import apps
-        ContactSubmissionModel = apps.get_model('main', 'ContactSubmission')
         
         try:
-            submission = ContactSubmissionModel.objects.get(id=submission_id)
+            submission = ContactSubmission.objects.get(id=submission_id)
             submission.status = new_status
             submission.save()
             messages.success(request, f'Submission status updated to {new_status}.')
-        except ContactSubmissionModel.DoesNotExist:
+        except ContactSubmission.DoesNotExist:
             messages.error(request, 'Submission not found.')
         
         return redirect('admin_contact_submissions')
@@ -1783,7 +1967,7 @@ def admin_update_submission_status(request, submission_id):
 
 
 # Health check endpoint for deployment verification
-def health_check(request):
+async def health_check(request):
     """
     Simple health check endpoint for deployment verification.
     Returns a JSON response indicating the application is running.
@@ -1,2 +1,7 @@
-import pymysql
-pymysql.install_as_MySQLdb()
+import os
+
+# PyMySQL stands in for mysqlclient; it is only imported when the MySQL backend
+# is configured, so SQLite and PostgreSQL workers start without it
+if 'mysql' in os.environ.get('DB_ENGINE', ''):
+    import pymysql
+    pymysql.install_as_MySQLdb()
@@ -0,0 +1,67 @@
+"""
+MySQL database backend with a process-local connection pool.
+
+Django's MySQL backend opens a new TCP connection (and authenticates again)
+whenever a request needs the database and CONN_MAX_AGE has expired. This
+backend keeps closed connections in a small per-process pool instead, so a
+Gunicorn worker reuses its warm connections across requests.
+
+Enable it with DB_POOL=True (see petrescue/settings.py). Options:
+    POOL_SIZE      Maximum idle connections kept per worker process (default 5).
+    POOL_RECYCLE   Seconds after which a pooled connection is discarded (default 3600).
+"""
+
+import time
+
+from django.db.backends.mysql.base import Database, DatabaseWrapper as MySQLDatabaseWrapper
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    """MySQL DatabaseWrapper that borrows connections from a process-local pool."""
+
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        self.pool_size = int(options.get('POOL_SIZE', 5))
+        self.pool_recycle = int(options.get('POOL_RECYCLE', 3600))
+
+        # Strip the pool options before they reach MySQLdb.connect()
+        conn_params = super().get_connection_params()
+        conn_params.pop('POOL_SIZE', None)
+        conn_params.pop('POOL_RECYCLE', None)
+        return conn_params
+
+    def _pool_key(self, conn_params):
+        return tuple(sorted(
+            (key, repr(value)) for key, value in conn_params.items() if key != 'conv'
+        ))
+
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(self._pool_key(conn_params), self.pool_size, self.pool_recycle, Database.Error)
+
+        # Reuse the most recently returned connection that is still alive
+        pooled = self._pool.checkout()
+        if pooled is not None:
+            connection, self._connection_created_at = pooled
+            return connection
+
+        self._connection_created_at = time.monotonic()
+        return super().get_new_connection(conn_params)
+
+    def _close(self):
+        connection = self.connection
+        if connection is None:
+            return None
+
+        # Broken connections, or ones closed mid-transaction, are never reused
+        if self.in_atomic_block or self.errors_occurred or getattr(self, '_pool', None) is None:
+            return super()._close()
+
+        try:
+            # Leave no open transaction behind for the next borrower
+            connection.rollback()
+        except Database.Error:
+            return super()._close()
+        self._pool.checkin(connection, self._connection_created_at)
+        return None
@@ -0,0 +1,71 @@
+"""
+Process-local pool of idle DB-API connections used by the MySQL pool backend.
+
+Kept free of MySQLdb imports so it can be used (and tested) with any driver:
+the backend passes in the driver's error class for the health check.
+"""
+
+import queue
+import threading
+import time
+
+# One pool per distinct set of connection parameters, shared by all threads in the process
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, size, recycle, error=Exception):
+    """Return the process-wide pool for `key`, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(size, recycle, error)
+        return pool
+
+
+class ConnectionPool:
+    """
+    Last-in, first-out pool of idle connections with their creation times.
+
+    size     Maximum idle connections kept; returned connections beyond it are closed.
+    recycle  Seconds after which a connection is closed instead of being handed out.
+    error    Exception class raised by a dead connection's ping().
+    """
+
+    def __init__(self, size, recycle, error=Exception):
+        self.recycle = recycle
+        self.error = error
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def checkout(self):
+        """
+        Return the most recently returned connection that is still alive as a
+        (connection, created_at) pair, or None when the pool has none.
+        """
+        while True:
+            try:
+                connection, created_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - created_at > self.recycle:
+                self._discard(connection)
+                continue
+            try:
+                connection.ping()
+            except self.error:
+                self._discard(connection)
+                continue
+            return connection, created_at
+
+    def checkin(self, connection, created_at):
+        """Keep an idle connection for the next checkout, or close it when the pool is full."""
+        try:
+            self._idle.put_nowait((connection, created_at))
+        except queue.Full:
+            self._discard(connection)
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except self.error:
+            pass
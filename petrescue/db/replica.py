@@ -0,0 +1,147 @@
+"""
+Optional read replica routing with read-your-writes stickiness.
+
+When a replica database is configured (DB_REPLICA_NAME or DB_REPLICA_HOST in
+settings), views decorated with read_from_replica send their reads to the
+"replica" alias. Everything else, all writes, and reads inside a transaction
+stay on the primary.
+
+A request that writes to the primary gets a short-lived cookie. While the
+cookie is present, the browser's requests read from the primary as well (and
+skip the shared page cache), so users see their own reports immediately even
+when the replica is lagging behind.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie that pins a browser to the primary database after one of its writes
+PRIMARY_STICKY_COOKIE = 'petrescue_primary'
+
+# Per-request routing state set by ReplicaStickinessMiddleware
+# A mutable dict so writes recorded by the router are visible to the middleware
+_routing_state = ContextVar('petrescue_db_routing', default=None)
+
+
+def replica_alias():
+    """Return the configured replica alias, or None when no replica is set up."""
+    return getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+
+
+def is_pinned_to_primary(request):
+    """Return True when the request's browser wrote recently and must read from the primary."""
+    return PRIMARY_STICKY_COOKIE in request.COOKIES
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to the replica only inside read_from_replica views; everything else uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        alias = replica_alias()
+        if (
+            alias is None
+            or state is None
+            or not state['use_replica']
+            or state['pinned']
+            or state['wrote']
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication (or a file copy for SQLite)
+        alias = replica_alias()
+        if alias is not None and db == alias:
+            return False
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Track database writes for each request and pin the browser to the primary after one.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self._new_state(request)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self._pin(state, response)
+
+    async def __acall__(self, request):
+        # The ORM runs in a sync thread with a copy of this context; the state dict is shared
+        state = self._new_state(request)
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self._pin(state, response)
+
+    def _new_state(self, request):
+        return {
+            'use_replica': False,
+            'pinned': is_pinned_to_primary(request),
+            'wrote': False,
+        }
+
+    def _pin(self, state, response):
+        if state['wrote'] and replica_alias() is not None:
+            response.set_cookie(
+                PRIMARY_STICKY_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+
+def read_from_replica(view_func):
+    """
+    Decorator letting a read-only view query the replica, unless the browser is pinned to the primary.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        state = _routing_state.get()
+        if state is None or request.method not in ('GET', 'HEAD'):
+            return view_func(request, *args, **kwargs)
+
+        previous = state['use_replica']
+        state['use_replica'] = True
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            state['use_replica'] = previous
+
+    return _wrapped_view
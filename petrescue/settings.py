@@ -14,8 +14,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import warnings
 from django.core.exceptions import ImproperlyConfigured
 
+from petrescue.db.sqlite import tuned_sqlite_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -69,28 +72,85 @@ INSTALLED_APPS = [
 # Middleware components that process requests and responses
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'main.staticfiles.WhiteNoiseMiddleware',
+    'main.instrumentation.RequestMetricsMiddleware',
+    'main.instrumentation.SlowQueryLogMiddleware',
+    'main.traffic.TrafficCaptureMiddleware',
+    'petrescue.db.replica.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'main.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.instrumentation.ViewTimingMiddleware',  # Keep last: times the view itself
 ]
 
+# Request metrics (main/instrumentation.py)
+# Query count, database, template and view time per request: sent to staff in a
+# Server-Timing header and exposed in Prometheus format at /dashboard/admin/metrics/.
+# METRICS_TOKEN lets a Prometheus scraper authenticate with "Authorization: Bearer <token>".
+REQUEST_METRICS = env_bool('REQUEST_METRICS', default=True)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# MEMORY_METRICS adds each request's peak Python allocations (tracemalloc) to the metrics.
+# Tracing slows every request down; enable it while investigating memory use.
+MEMORY_METRICS = env_bool('MEMORY_METRICS', default=False)
+
+# Slow query log (main/instrumentation.py)
+# Logs SQL statements taking at least SLOW_QUERY_MS milliseconds (0 disables the log)
+# with their parameters, view and calling frame, plus the EXPLAIN plan on SQLite and MySQL.
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '0'))
+SLOW_QUERY_EXPLAIN = env_bool('SLOW_QUERY_EXPLAIN', default=True)
+
+# Request profiling (main/profiling.py)
+# Superusers add ?profile=1 (or an "X-Profile: 1" header) to profile one request with cProfile.
+# Captures are listed at /dashboard/admin/profiles/; only the newest REQUEST_PROFILE_KEEP are kept.
+# REQUEST_PROFILING=False removes the middleware entirely.
+REQUEST_PROFILING = env_bool('REQUEST_PROFILING', default=True)
+REQUEST_PROFILE_DIR = os.environ.get('REQUEST_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+REQUEST_PROFILE_KEEP = int(os.environ.get('REQUEST_PROFILE_KEEP', '50'))
+
+# Traffic capture (main/traffic.py)
+# Appends sanitized request metadata (method, path, query string, user role, status and
+# timing) to a JSONL file that benchmarks/replay.py can replay. Bodies, cookies and
+# headers are never recorded; the query parameters in TRAFFIC_CAPTURE_REDACT are masked.
+TRAFFIC_CAPTURE = env_bool('TRAFFIC_CAPTURE', default=False)
+TRAFFIC_CAPTURE_FILE = os.environ.get('TRAFFIC_CAPTURE_FILE', str(BASE_DIR / 'traffic.jsonl'))
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.environ.get('TRAFFIC_CAPTURE_SAMPLE_RATE', '1.0'))
+TRAFFIC_CAPTURE_REDACT = env_list(
+    'TRAFFIC_CAPTURE_REDACT',
+    default='email,password,token,phone,phone_number,name,search,csrfmiddlewaretoken',
+)
+
 # Root URL configuration
 ROOT_URLCONF = 'petrescue.urls'
 
 # Template configuration
+# Templates are compiled once per process by the cached loader; the development
+# server's autoreloader clears the cache when a template changes. Set
+# TEMPLATE_CACHE=False to read and compile templates on every render.
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',  # Template directories
+    'django.template.loaders.app_directories.Loader',  # Templates in app directories
+]
+
+if env_bool('TEMPLATE_CACHE', default=True):
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports render time to the request metrics
+        'BACKEND': 'main.instrumentation.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'main' / 'templates'],  # Template directories
-        'APP_DIRS': True,  # Automatically discover templates in app directories
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'main.context_processors.page_cache',
             ],
         },
     },
@@ -110,13 +170,33 @@ if DB_ENGINE == 'django.db.backends.sqlite3':
 else:
     DB_NAME = DB_NAME or 'petrescue_db'
 
+# DB_CONN_MAX_AGE keeps a connection open across requests for that many seconds
+# (0 closes it after every request, "None" keeps it forever). Health checks make
+# Django ping a reused connection before each request instead of failing on a dead one.
+DB_CONN_MAX_AGE = os.environ.get('DB_CONN_MAX_AGE', '60')
+
 DATABASES = {
     'default': {
         'ENGINE': DB_ENGINE,
         'NAME': DB_NAME,
+        'CONN_MAX_AGE': None if DB_CONN_MAX_AGE.lower() == 'none' else int(DB_CONN_MAX_AGE),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', default=True),
     }
 }
 
+# Opt-in SQLite tuning for running several Gunicorn workers on one database file:
+# WAL journal, synchronous=NORMAL, busy timeout, mmap and page cache size (see petrescue/db/sqlite.py)
+if DB_ENGINE == 'django.db.backends.sqlite3' and env_bool('SQLITE_TUNING', default=False):
+    try:
+        DATABASES['default']['OPTIONS'] = tuned_sqlite_options(
+            busy_timeout=int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')),
+            mmap_size=int(os.environ.get('SQLITE_MMAP_SIZE', '268435456')),
+            cache_size=int(os.environ.get('SQLITE_CACHE_SIZE', '-20000')),
+            synchronous=os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        )
+    except ValueError as exc:
+        raise ImproperlyConfigured(f'Invalid SQLite tuning setting: {exc}') from exc
+
 if DB_ENGINE != 'django.db.backends.sqlite3':
     DATABASES['default'].update({
         'USER': os.environ.get('DB_USER', ''),
@@ -125,6 +205,21 @@ if DB_ENGINE != 'django.db.backends.sqlite3':
         'PORT': os.environ.get('DB_PORT', '3306'),
     })
 
+    # Optional process-local connection pool for MySQL (petrescue/db/mysql_pool)
+    # Connections are returned to the pool on close, so CONN_MAX_AGE is not needed.
+    DB_POOL = env_bool('DB_POOL', default=False)
+    if DB_POOL:
+        if DB_ENGINE != 'django.db.backends.mysql':
+            raise ImproperlyConfigured('DB_POOL is only supported with DB_ENGINE=django.db.backends.mysql.')
+        DATABASES['default'].update({
+            'ENGINE': 'petrescue.db.mysql_pool',
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'POOL_SIZE': int(os.environ.get('DB_POOL_SIZE', '5')),
+                'POOL_RECYCLE': int(os.environ.get('DB_POOL_RECYCLE', '3600')),
+            },
+        })
+
     if not DEBUG:
         required_db_settings = ['DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST']
         missing_db_settings = [
@@ -137,6 +232,110 @@ if DB_ENGINE != 'django.db.backends.sqlite3':
                 f'{missing} must be set when DEBUG=False and using a non-SQLite database.'
             )
 
+# Optional read replica (petrescue/db/replica.py)
+# Public read views query the replica; writes, and a browser's reads for
+# DB_REPLICA_STICKY_SECONDS after it writes, use the primary. For local testing,
+# point DB_REPLICA_NAME at a copy of the SQLite file.
+DB_REPLICA_NAME = os.environ.get('DB_REPLICA_NAME')
+DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST')
+DATABASE_REPLICA_ALIAS = None
+
+if DB_REPLICA_NAME or DB_REPLICA_HOST:
+    DATABASE_REPLICA_ALIAS = 'replica'
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        # Tests treat the replica as the primary so they see their own fixtures
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_REPLICA_NAME:
+        DATABASES[DATABASE_REPLICA_ALIAS]['NAME'] = DB_REPLICA_NAME
+    if DB_REPLICA_HOST:
+        DATABASES[DATABASE_REPLICA_ALIAS]['HOST'] = DB_REPLICA_HOST
+
+DATABASE_ROUTERS = ['petrescue.db.replica.PrimaryReplicaRouter']
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '15'))
+
+
+# Cache configuration
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND selects local memory (default), file-based or a Redis-protocol server.
+# The Redis backend requires the optional `redis` package.
+# Saves invalidate cached pages by bumping a version stored in this cache, so the
+# invalidation only reaches the processes sharing it: a locmem cache is private to one
+# process. gunicorn.conf.py therefore defaults to `file` when it starts several workers.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem').strip().lower()
+
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of: {', '.join(CACHE_BACKENDS)}."
+    )
+
+CACHE_LOCATION_DEFAULTS = {
+    'locmem': 'petrescue',
+    'file': str(BASE_DIR / '.django_cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+    'dummy': '',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_LOCATION_DEFAULTS[CACHE_BACKEND]),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'petrescue'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Lifetime (seconds) of cached anonymous pages and template fragments
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', '300'))
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', '600'))
+
+# Stampede protection for cached pages and find-pets result sets
+# Stale copies are served for PAGE_CACHE_STALE_TIMEOUT seconds while one worker refreshes
+PAGE_CACHE_STALE_TIMEOUT = int(os.environ.get('PAGE_CACHE_STALE_TIMEOUT', '600'))
+PAGE_CACHE_LOCK_TIMEOUT = int(os.environ.get('PAGE_CACHE_LOCK_TIMEOUT', '30'))
+PAGE_CACHE_LOCK_WAIT = float(os.environ.get('PAGE_CACHE_LOCK_WAIT', '2'))
+PAGE_CACHE_BACKGROUND_REFRESH = env_bool('PAGE_CACHE_BACKGROUND_REFRESH', default=False)
+
+# Browser/proxy Cache-Control max-age for public pages (seconds)
+# With the default of 0 clients revalidate every time and get a 304 if nothing changed
+PUBLIC_PAGE_MAX_AGE = int(os.environ.get('PUBLIC_PAGE_MAX_AGE', '0'))
+
+# Seconds a validate_email answer ("is this email taken?") is cached per address
+VALIDATE_EMAIL_CACHE_TIMEOUT = int(os.environ.get('VALIDATE_EMAIL_CACHE_TIMEOUT', '60'))
+
+
+# Rate limiting
+# Per-client token buckets kept in the cache (see main/throttling.py). A rate of
+# "N/period" allows bursts of N requests and refills N tokens per period
+# (s, min, hour or day); an empty rate turns the limit off.
+
+THROTTLE_RATES = {
+    'validate_email': os.environ.get('THROTTLE_RATE_VALIDATE_EMAIL', '30/min'),
+    # API endpoint groups, limited per signed-in account
+    'dashboard': os.environ.get('THROTTLE_RATE_DASHBOARD', '120/min'),
+    'admin_notifications': os.environ.get('THROTTLE_RATE_ADMIN_NOTIFICATIONS', '120/min'),
+    # Any other Django REST framework view
+    'api': os.environ.get('THROTTLE_RATE_API', '300/min'),
+}
+
+# Reverse proxies in front of the application that append to X-Forwarded-For.
+# With the default of 0 clients are told apart by REMOTE_ADDR alone, since the
+# header can be set to anything by the client itself.
+THROTTLE_NUM_PROXIES = int(os.environ.get('THROTTLE_NUM_PROXIES', '0'))
+
+REST_FRAMEWORK = {
+    # API views without their own group's throttle class fall under the "api" rate
+    'DEFAULT_THROTTLE_CLASSES': ['main.throttling.ApiThrottle'],
+    'NUM_PROXIES': THROTTLE_NUM_PROXIES,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -181,6 +380,37 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',  # Directory containing static files
 ]
 
+# Directory collectstatic copies files into for production
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# In production WhiteNoise serves static files from STATIC_ROOT. collectstatic
+# content-hashes every filename and precompresses it with gzip (and brotli when the
+# Brotli package is installed); hashed files are sent with a far-future immutable
+# Cache-Control header. STATIC_MANIFEST defaults to on whenever DEBUG is off.
+STATIC_MANIFEST = env_bool('STATIC_MANIFEST', default=not DEBUG)
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+if DEBUG:
+    # Before collectstatic has run, WhiteNoise serves files through the staticfiles finders.
+    # Matched on the message alone: the warning is attributed to the caller of WhiteNoise's
+    # constructor, which is main/staticfiles.py rather than a whitenoise module.
+    warnings.filterwarnings('ignore', message='No directory at', category=UserWarning)
+
+# Cache-Control max-age for static files whose names are not content-hashed
+WHITENOISE_MAX_AGE = int(os.environ.get('WHITENOISE_MAX_AGE', '0' if DEBUG else '3600'))
+
 # Media files (user-uploaded content)
 # Directory where user-uploaded files will be stored
 MEDIA_URL = '/media/'
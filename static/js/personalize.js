@@ -0,0 +1,67 @@
+/*
+PetRescue Page Personalization
+Public pages are served as one cached anonymous shell for every visitor.
+This script fetches the visitor's navigation, messages and other
+user-specific fragments and swaps them into the [data-personal-slot] elements.
+*/
+
+(function() {
+    'use strict';
+
+    function applyPersonalization(data) {
+        const slots = data.slots || {};
+        Object.keys(slots).forEach(name => {
+            document.querySelectorAll(`[data-personal-slot="${name}"]`).forEach(element => {
+                element.innerHTML = slots[name];
+            });
+        });
+
+        if (data.is_superuser) {
+            // Admin styles and notification polling are only needed for admins
+            const shell = document.body;
+            if (shell.dataset.adminCss && !document.querySelector(`link[href="${shell.dataset.adminCss}"]`)) {
+                const link = document.createElement('link');
+                link.rel = 'stylesheet';
+                link.href = shell.dataset.adminCss;
+                document.head.appendChild(link);
+            }
+            // admin-notifications.js starts polling as soon as it has loaded
+            if (window.PetRescue && window.PetRescue.setupAdminNotifications) {
+                window.PetRescue.setupAdminNotifications();
+            } else if (shell.dataset.adminJs) {
+                const script = document.createElement('script');
+                script.src = shell.dataset.adminJs;
+                document.body.appendChild(script);
+            }
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const endpoint = document.body.dataset.personalizeUrl;
+        if (!endpoint) {
+            return;
+        }
+
+        // Ask only for the slots present on this page
+        const slotNames = new Set();
+        document.querySelectorAll('[data-personal-slot]').forEach(element => {
+            slotNames.add(element.dataset.personalSlot);
+        });
+
+        const params = new URLSearchParams({ slots: Array.from(slotNames).join(',') });
+        if (document.body.dataset.petId) {
+            params.set('pet', document.body.dataset.petId);
+        }
+
+        fetch(`${endpoint}?${params.toString()}`, { credentials: 'same-origin' })
+            .then(response => response.ok ? response.json() : null)
+            .then(data => {
+                if (data) {
+                    applyPersonalization(data);
+                }
+            })
+            .catch(() => {
+                // Keep the anonymous shell if personalization fails
+            });
+    });
+})();
@@ -0,0 +1,156 @@
+/*
+PetRescue UI Enhancements
+Scroll animations, button hover effects, active navigation links, lazy image
+loading and page transitions used on every page
+*/
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Add scroll animation to elements
+    setupScrollAnimations();
+    
+    // Add hover effects to buttons
+    setupButtonHoverEffects();
+    
+    // Set active nav link
+    setActiveNavLink();
+    
+    // Set up scroll animations
+    function setupScrollAnimations() {
+        // Add fade-in animation to elements when they come into view
+        const fadeElements = document.querySelectorAll('.feature-card, .pet-card, .cta-section .card');
+        
+        // Use Intersection Observer for better performance
+        const observer = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    entry.target.classList.add('fade-in');
+                    // Unobserve to prevent re-triggering
+                    observer.unobserve(entry.target);
+                }
+            });
+        }, {
+            threshold: 0.1,
+            rootMargin: '0px 0px -50px 0px' // Trigger slightly before element is in view
+        });
+        
+        fadeElements.forEach(element => {
+            observer.observe(element);
+        });
+    }
+    
+    // Set up button hover effects with better performance
+    function setupButtonHoverEffects() {
+        // Use event delegation for better performance
+        document.addEventListener('mouseover', function(e) {
+            if (e.target.classList.contains('btn')) {
+                e.target.style.transform = 'translateY(-2px)';
+                e.target.style.transition = 'transform 0.2s ease';
+            }
+        });
+        
+        document.addEventListener('mouseout', function(e) {
+            if (e.target.classList.contains('btn')) {
+                e.target.style.transform = 'translateY(0)';
+            }
+        });
+    }
+    
+    // Set active nav link based on current page
+    function setActiveNavLink() {
+        const links = document.querySelectorAll('.nav-link');
+        const currentPage = window.location.pathname;
+        const urlParams = new URLSearchParams(window.location.search);
+        const petType = urlParams.get('type');
+        
+        links.forEach(link => {
+            // Remove active class from all links
+            link.classList.remove('active');
+            
+            // Add active class to current page link
+            const linkHref = link.getAttribute('href');
+            
+            // Special handling for Report Lost Pet and Report Found Pet links
+            if (link.textContent === 'Report Lost Pet' && currentPage === '/find-pets/' && petType === 'lost') {
+                link.classList.add('active');
+            } else if (link.textContent === 'Report Found Pet' && currentPage === '/find-pets/' && petType === 'found') {
+                link.classList.add('active');
+            } else if (linkHref === currentPage) {
+                link.classList.add('active');
+            }
+            
+            // Special case for home page
+            if (currentPage === '/' && linkHref === '/') {
+                link.classList.add('active');
+            }
+        });
+    }
+});
+
+// Add performance optimizations for image loading
+document.addEventListener('DOMContentLoaded', function() {
+    // Lazy load images with better performance
+    const images = document.querySelectorAll('img[loading="lazy"]');
+    if ('IntersectionObserver' in window) {
+        const imageObserver = new IntersectionObserver((entries, observer) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    const img = entry.target;
+                    // Only process if image has a data-src attribute
+                    if (img.dataset.src) {
+                        img.src = img.dataset.src;
+                        img.removeAttribute('data-src');
+                    }
+                    imageObserver.unobserve(img);
+                }
+            });
+        }, {
+            rootMargin: '50px 0px', // Start loading 50px before image enters viewport
+            threshold: 0.01
+        });
+        
+        images.forEach(img => {
+            // Only observe images that have data-src
+            if (img.dataset.src) {
+                imageObserver.observe(img);
+            }
+        });
+    } else {
+        // Fallback for browsers that don't support Intersection Observer
+        images.forEach(img => {
+            if (img.dataset.src) {
+                img.src = img.dataset.src;
+                img.removeAttribute('data-src');
+            }
+        });
+    }
+    
+    // Add smooth transitions for page navigation
+    const links = document.querySelectorAll('a[href]:not([target="_blank"]):not(.no-transition)');
+    links.forEach(link => {
+        link.addEventListener('click', function(e) {
+            // Don't interfere with form submissions or special links
+            if (this.classList.contains('btn') || this.getAttribute('type') === 'submit') {
+                return;
+            }
+            
+            // Add a slight delay to allow for visual feedback
+            const href = this.getAttribute('href');
+            if (href && href.startsWith('/') && !href.startsWith('/#')) {
+                e.preventDefault();
+                
+                // Add transition class to body
+                document.body.classList.add('page-transition');
+                
+                // Navigate after a short delay
+                setTimeout(() => {
+                    window.location.href = href;
+                }, 150);
+            }
+        });
+    });
+    
+    // Remove transition class when page loads
+    window.addEventListener('pageshow', function() {
+        document.body.classList.remove('page-transition');
+    });
+});